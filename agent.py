@@ -0,0 +1,329 @@
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+# Protocol: the client sends one JSON line ({"argv", "cwd", "env"} or {"op"}); the
+# agent answers with JSON lines {"out": text}, {"err": text} and finally {"exit": code}.
+PROTOCOL_VERSION = 1
+
+# Every PAGERTREE_* setting is forwarded; the agent only serves clients whose
+# settings match its own, except these, which only affect the thin client or
+# are applied per request
+CLIENT_ENV = ("PAGERTREE_AGENT", "PAGERTREE_AGENT_SOCKET", "PAGERTREE_CONFIG", "PAGERTREE_OUTPUT")
+
+# Commands that must run in the calling process (interactive, long-running, or reading stdin)
+LOCAL_COMMANDS = ("agent", "shell", "relay", "emit")
+
+# Commands that ask for confirmation on stdin unless --force is given
+PROMPTING_COMMANDS = ("delete",)
+
+def settings(environ) -> dict:
+    """Return the PAGERTREE_* settings in environ that a command's behaviour depends on."""
+    return {name: value for name, value in environ.items() if name.startswith("PAGERTREE_") and name not in CLIENT_ENV}
+
+def default_socket_path() -> str:
+    """Return the agent socket path (PAGERTREE_AGENT_SOCKET or the cache directory)."""
+    # Mirrors cache.default_cache_dir() without importing sqlite3 on the thin-client path
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.getenv("PAGERTREE_AGENT_SOCKET") or os.path.join(base, "pagertree", "agent.sock")
+
+def _connect(path: str, timeout: Optional[float] = None) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def _send(sock: socket.socket, message: dict) -> None:
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+def request(op: str, path: Optional[str] = None, timeout: float = 5) -> dict:
+    """Send a control request ("status" or "stop") to a running agent."""
+    with _connect(path or default_socket_path(), timeout) as sock:
+        _send(sock, {"version": PROTOCOL_VERSION, "op": op})
+        line = sock.makefile("rb").readline()
+    if not line:
+        raise ConnectionError("agent closed the connection")
+    return json.loads(line)
+
+def run_via_agent(argv: List[str]) -> Optional[int]:
+    """Run a CLI invocation through a running agent.
+
+    Returns the exit code, or None when the command should run in this process
+    (no agent, agent disabled, or a command the agent cannot serve).
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    if os.getenv("PAGERTREE_AGENT", "true").lower() in ("false", "0", "f"):
+        return None
+    # stdin is not forwarded, and interactive or agent commands run locally
+    if "-" in argv or any(arg in LOCAL_COMMANDS for arg in argv):
+        return None
+    if any(arg in PROMPTING_COMMANDS for arg in argv) and "--force" not in argv:
+        return None
+    # --verbose changes the level of the logger every request shares
+    if any(arg in ("--verbose", "-v") for arg in argv):
+        return None
+    # An explicit config file may select another account; let the CLI load it
+    if os.getenv("PAGERTREE_CONFIG") or any(arg in ("--config", "-c") or arg.startswith("--config=") for arg in argv):
+        return None
+    path = default_socket_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        sock = _connect(path)
+    except OSError:
+        return None
+
+    # The CLI would load ./.env without overriding the environment; forward what it would see
+    env = settings(os.environ)
+    if os.path.exists(".env"):
+        from dotenv import dotenv_values
+        env = {**settings({name: value for name, value in dotenv_values(".env").items() if value is not None}), **env}
+
+    with sock:
+        _send(sock, {
+            "version": PROTOCOL_VERSION,
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "env": env,
+            "output": os.getenv("PAGERTREE_OUTPUT"),
+        })
+        for line in sock.makefile("rb"):
+            message = json.loads(line)
+            if "out" in message:
+                sys.stdout.write(message["out"])
+                sys.stdout.flush()
+            elif "err" in message:
+                sys.stderr.write(message["err"])
+                sys.stderr.flush()
+            elif "exit" in message:
+                return message["exit"]
+            elif message.get("fallback"):
+                return None
+    # Connection dropped before the command finished
+    sys.stderr.write("Error: PagerTree agent closed the connection\n")
+    return 1
+
+class _ThreadLocalStream:
+    """sys.stdout/sys.stderr stand-in that writes to the stream bound to the current thread."""
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def bind(self, stream):
+        self._local.stream = stream
+
+    def unbind(self):
+        self._local.stream = None
+
+    @property
+    def current(self):
+        return getattr(self._local, "stream", None) or self._default
+
+    def write(self, text):
+        return self.current.write(text)
+
+    def flush(self):
+        return self.current.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.current, name)
+
+class _SocketStream:
+    """Text stream that forwards writes to the client as {key: text} messages."""
+
+    # Attributes click inspects before deciding a stream is usable as text
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, sock, key, lock):
+        self._sock = sock
+        self._key = key
+        self._lock = lock
+
+    def write(self, text):
+        if not isinstance(text, str):
+            raise TypeError("write() argument must be str")  # Tells click this is not a binary stream
+        if text:
+            with self._lock:
+                _send(self._sock, {self._key: text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+class _WorkingDirectory:
+    """Shared lock keyed by working directory.
+
+    Requests from the current directory run concurrently; a request from another
+    directory waits for them to finish before the process changes directory.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._active = 0
+
+    def enter(self, cwd):
+        with self._condition:
+            while self._active and os.getcwd() != cwd:
+                self._condition.wait()
+            if os.getcwd() != cwd:
+                os.chdir(cwd)
+            self._active += 1
+
+    def exit(self):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+class Agent:
+    """Serve CLI invocations over a Unix socket with one warm client."""
+
+    def __init__(self, cli, session, path: Optional[str] = None):
+        self.cli = cli
+        self.session = session
+        self.path = path or default_socket_path()
+        self.started_at = time.time()
+        self.requests = 0
+        self.active = 0
+        self._lock = threading.Lock()
+        self._cwd = _WorkingDirectory()
+        self._stdout = _ThreadLocalStream(sys.stdout)
+        self._stderr = _ThreadLocalStream(sys.stderr)
+        self._server = None
+
+    def serve_forever(self):
+        """Listen on the socket until stop() is called or a "stop" request arrives."""
+        import socketserver
+
+        agent = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                agent.handle(self.connection, self.rfile)
+
+        if os.path.exists(self.path):
+            try:
+                _connect(self.path, timeout=1).close()
+            except OSError:
+                os.unlink(self.path)  # Stale socket left by an agent that did not shut down cleanly
+            else:
+                raise RuntimeError(f"an agent is already listening on {self.path}")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+        old_umask = os.umask(0o177)  # Socket is readable and writable by the owner only
+        try:
+            self._server = Server(self.path, Handler)
+        finally:
+            os.umask(old_umask)
+        sys.stdout, sys.stderr = self._stdout, self._stderr
+        # Log handlers bound to the original stderr write to the requesting client instead
+        handlers = [handler for handler in logging.getLogger().handlers
+                    if isinstance(handler, logging.StreamHandler) and handler.stream is self._stderr._default]
+        for handler in handlers:
+            handler.setStream(self._stderr)
+        try:
+            self._server.serve_forever()
+        finally:
+            for handler in handlers:
+                handler.setStream(self._stderr._default)
+            sys.stdout, sys.stderr = self._stdout._default, self._stderr._default
+            self._server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def stop(self):
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def status(self) -> dict:
+        return {"pid": os.getpid(), "socket": self.path, "uptime": round(time.time() - self.started_at, 1),
+                "requests": self.requests, "active": self.active}
+
+    def handle(self, sock, rfile):
+        line = rfile.readline()
+        if not line:
+            return
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return
+        if message.get("version") != PROTOCOL_VERSION:
+            _send(sock, {"fallback": True})
+            return
+        op = message.get("op")
+        if op == "status":
+            _send(sock, self.status())
+            return
+        if op == "stop":
+            _send(sock, {"stopping": True, **self.status()})
+            self.stop()
+            return
+        # Clients configured differently (another account, server, cache or
+        # duplicate policy, ...) run the command themselves
+        if message.get("env", {}) != settings(os.environ):
+            _send(sock, {"fallback": True})
+            return
+
+        argv = list(message.get("argv", []))
+        if message.get("output"):
+            argv = ["--output", message["output"]] + argv
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+        write_lock = threading.Lock()
+        self._stdout.bind(_SocketStream(sock, "out", write_lock))
+        self._stderr.bind(_SocketStream(sock, "err", write_lock))
+        self._cwd.enter(message.get("cwd") or os.getcwd())
+        try:
+            exit_code = self._run(argv)
+        except (BrokenPipeError, ConnectionResetError):
+            return  # Client went away mid-command
+        finally:
+            self._cwd.exit()
+            self._stdout.unbind()
+            self._stderr.unbind()
+            with self._lock:
+                self.active -= 1
+        try:
+            _send(sock, {"exit": exit_code})
+        except OSError:
+            pass
+
+    def _run(self, argv) -> int:
+        import click
+        try:
+            self.cli.main(argv, prog_name="pagertree", obj=self.session, standalone_mode=False)
+        except click.exceptions.Exit as e:
+            return e.exit_code
+        except click.ClickException as e:
+            e.show()
+            return e.exit_code
+        except click.Abort:
+            sys.stderr.write("Aborted!\n")
+            return 1
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except (BrokenPipeError, ConnectionResetError):
+            raise
+        except Exception:
+            sys.stderr.write(traceback.format_exc())
+            return 1
+        return 0
@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+from cache import default_cache_dir
+
+# Alerts in these states are never served from the index
+TERMINAL_STATUSES = ("resolved", "dropped")
+
+# Status codes that suggest an indexed alias points at an alert that no longer accepts the action
+STALE_ALIAS_STATUS_CODES = (404, 410, 422)
+
+class AliasIndex:
+    """Persistent mapping of alert aliases (thirdparty_id) to live alert IDs.
+
+    When several alerts share an alias the index keeps the newest one (by
+    created_at), matching the remote thirdparty_id lookup it replaces.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = 24 * 60 * 60):
+        self.directory = directory or default_cache_dir()
+        self.ttl = ttl
+        os.makedirs(self.directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(self.directory, "aliases.db"),
+                                    check_same_thread=False, isolation_level=None, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS aliases ("
+            "alias TEXT PRIMARY KEY, alert_id TEXT NOT NULL, status TEXT, updated_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS aliases_alert_id ON aliases (alert_id)")
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(aliases)")]
+        if "created_at" not in columns:
+            # Indexes written before created_at was tracked
+            self.conn.execute("ALTER TABLE aliases ADD COLUMN created_at TEXT")
+
+    @classmethod
+    def from_env(cls) -> Optional["AliasIndex"]:
+        """Build the index from PAGERTREE_CACHE_DIR / PAGERTREE_ALIAS_INDEX_TTL, or None if disabled or unavailable."""
+        if os.getenv("PAGERTREE_ALIAS_INDEX", "true").lower() not in ("true", "1", "t"):
+            return None
+        try:
+            return cls(directory=os.getenv("PAGERTREE_CACHE_DIR") or None,
+                       ttl=float(os.getenv("PAGERTREE_ALIAS_INDEX_TTL", str(24 * 60 * 60))))
+        except (OSError, sqlite3.Error):
+            # A read-only or missing home directory should not break the CLI
+            return None
+
+    def lookup(self, alias: str, status: Optional[str] = None, max_age: Optional[float] = None) -> Optional[str]:
+        """Return the indexed alert ID for alias, optionally requiring a specific status.
+
+        max_age narrows the TTL: entries last seen longer ago than that are ignored.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT alert_id, status, updated_at FROM aliases WHERE alias = ?", (alias,)
+            ).fetchone()
+        if row is None:
+            return None
+        alert_id, alert_status, updated_at = row
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        if time.time() - updated_at > ttl or (status and alert_status != status):
+            return None
+        return alert_id
+
+    def record(self, alerts: Iterable[Dict[str, Any]]) -> None:
+        """Index live alerts by alias and drop alerts that reached a terminal status.
+
+        Only the newest alert seen for each alias counts, and an existing entry is
+        replaced only by an alert created at the same time or later; when that
+        newest alert is resolved or dropped, older entries for the alias go too.
+        """
+        now = time.time()
+        newest: Dict[str, Dict[str, Any]] = {}
+        removals, superseded, upserts = [], [], []
+        for alert in alerts:
+            alert_id = alert.get("id")
+            if not alert_id:
+                continue
+            if alert.get("status") in TERMINAL_STATUSES:
+                removals.append((alert_id,))
+            alias = alert.get("thirdparty_id")
+            if alias and (alias not in newest or (alert.get("created_at") or "") > (newest[alias].get("created_at") or "")):
+                newest[alias] = alert
+        for alias, alert in newest.items():
+            created_at = alert.get("created_at") or ""
+            if alert.get("status") in TERMINAL_STATUSES:
+                superseded.append((alias, created_at))
+            else:
+                upserts.append((alias, alert["id"], alert.get("status"), now, created_at))
+        if not upserts and not removals:
+            return
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany("DELETE FROM aliases WHERE alert_id = ?", removals)
+                self.conn.executemany("DELETE FROM aliases WHERE alias = ? AND COALESCE(created_at, '') <= ?", superseded)
+                self.conn.executemany(
+                    "INSERT INTO aliases (alias, alert_id, status, updated_at, created_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(alias) DO UPDATE SET alert_id = excluded.alert_id, status = excluded.status, "
+                    "updated_at = excluded.updated_at, created_at = excluded.created_at "
+                    "WHERE excluded.created_at >= COALESCE(aliases.created_at, '') OR aliases.alert_id = excluded.alert_id",
+                    upserts
+                )
+                self.conn.execute("COMMIT")
+            except sqlite3.Error:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def forget(self, alert_id: str) -> None:
+        """Remove any alias pointing at alert_id."""
+        with self.lock:
+            self.conn.execute("DELETE FROM aliases WHERE alert_id = ?", (alert_id,))
@@ -1,11 +1,31 @@
 import click
 import requests
 import os
+import math
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
 import configparser
-from typing import Optional, List, Dict, Any
+from requests.adapters import HTTPAdapter
+from concurrency import bounded_map
+import jsoncodec
+from cache import ResponseCache
+from alias_index import AliasIndex, TERMINAL_STATUSES
+from typing import Optional, List, Dict, Any, Callable, Iterator
+
+# Methods that can be repeated without changing the outcome, so transient failures are safe to retry
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+# Server errors worth retrying for idempotent methods (429 is retried for every method)
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+# What create_alert does when an alias was seen on a live alert recently
+DUPLICATE_ACTIONS = ("create", "skip", "comment")
+# Seconds an alias seen on a live alert counts as a duplicate for create_alert
+DEDUPE_WINDOW = 600.0
 
 class PagerTreeClient:
-    def __init__(self):
+    def __init__(self, pool_size: Optional[int] = None, cache: Optional[ResponseCache] = None,
+                 alias_index: Optional[AliasIndex] = None):
         """Initialize PagerTree client with configuration."""
         # Set up base URL and API key
         self.base_url = os.getenv('PAGERTREE_BASE_URL', 'https://api.pagertree.com/api/v4')
@@ -26,6 +46,197 @@ class PagerTreeClient:
         self.session = requests.Session()
         self.session.headers.update(self.default_headers)
 
+        # Size the connection pool so concurrent page fetches can share the session
+        self.pool_size = pool_size or int(os.getenv('PAGERTREE_POOL_SIZE', '10'))
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # In-process memo of account users fetched by resolve_users
+        self._user_memo: Dict[str, Dict[str, Any]] = {}
+        # Why the last resolve_users call could not fetch a user, by user ID
+        self.user_errors: Dict[str, Exception] = {}
+
+        # Retry and rate-limit settings
+        self.max_retries = int(os.getenv('PAGERTREE_MAX_RETRIES', '3'))
+        self.backoff_base = float(os.getenv('PAGERTREE_BACKOFF_BASE', '0.5'))
+        self.backoff_max = 30.0
+        self._rate_limit_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+        # Optional persistent cache for GET responses
+        self.cache = cache
+
+        # Persistent alias -> alert ID index used to skip alias lookups
+        self.alias_index = alias_index
+        # Striped locks so concurrent creates of one alias check the index one at a time
+        self._alias_locks = [threading.Lock() for _ in range(64)]
+
+        # Optional tracing.HttpTracer; set by HttpTracer.attach
+        self.tracer = None
+
+    # REQUESTS
+    # ========
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request, retrying throttled and transient failures with jittered exponential backoff.
+
+        429 responses are retried for every method since the server did not act on
+        them; 5xx responses and dropped connections are retried only for idempotent
+        methods. Rate-limit headers pace later requests before the server throttles.
+        """
+        url = f"{self.base_url}{path}"
+        idempotent = method in IDEMPOTENT_METHODS
+        if "json" in kwargs:
+            # Encode bodies with the JSON codec; the session already sends Content-Type: application/json
+            kwargs["data"] = jsoncodec.dumpb(kwargs.pop("json"))
+        attempt = 0
+        while True:
+            self._wait_for_rate_limit()
+            if self.tracer is not None:
+                self.tracer.begin_attempt(attempt)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if self.tracer is not None:
+                    self.tracer.record_failure(method, url, e)
+                # A connect timeout means the request never reached the server
+                retryable = idempotent or isinstance(e, requests.exceptions.ConnectTimeout)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+            else:
+                self._observe_rate_limit(response)
+                retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUS_CODES)
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                delay = self._retry_after_delay(response)
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+            attempt += 1
+            time.sleep(delay)
+
+    def _decode(self, response: requests.Response) -> Any:
+        """Decode a JSON response body with the JSON codec (orjson when installed)."""
+        return jsoncodec.loads(response.content)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_after_delay(self, response: requests.Response) -> Optional[float]:
+        """Seconds requested by a Retry-After header (delta seconds or HTTP date), if any."""
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.backoff_max * 2)
+
+    def _observe_rate_limit(self, response: requests.Response) -> None:
+        """Spread the remaining request budget over the time left in the rate-limit window."""
+        headers = response.headers
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get("RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining, reset = int(remaining), float(reset)
+        except ValueError:
+            return
+        now = time.time()
+        # Reset is either an epoch timestamp or a number of seconds until the window resets
+        window = reset - now if reset > 1e9 else reset
+        if window <= 0 or remaining > 10:
+            return
+        with self._rate_limit_lock:
+            self._next_request_at = max(self._next_request_at, now + window / max(remaining, 1))
+
+    def _wait_for_rate_limit(self) -> None:
+        """Sleep until the pacing set by _observe_rate_limit allows another request."""
+        delay = self._next_request_at - time.time()
+        if delay > 0:
+            time.sleep(min(delay, self.backoff_max * 2))
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None, revalidate: bool = False) -> Any:
+        """Issue a GET request, serving and revalidating through the response cache when enabled.
+
+        With revalidate, a cached entry is always checked with the server (a
+        conditional request) even if it is still within its TTL.
+        """
+        if self.cache is None:
+            response = self._request("GET", path, params=params)
+            response.raise_for_status()
+            return self._decode(response)
+
+        url = f"{self.base_url}{path}"
+        key = self.cache.make_key(self.api_key, url, params)
+        entry = self.cache.get(key)
+        headers = {}
+        if entry is not None:
+            if entry["fresh"] and not revalidate:
+                return jsoncodec.loads(entry["body"])
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._request("GET", path, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key)
+            return jsoncodec.loads(entry["body"])
+        response.raise_for_status()
+        self.cache.store(key, url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return self._decode(response)
+
+    def _index_alerts(self, alerts: List[Dict[str, Any]]) -> None:
+        """Feed alerts seen in responses into the alias index."""
+        if self.alias_index is not None:
+            self.alias_index.record(alerts)
+
+    def _invalidate(self, *collections: str) -> None:
+        """Drop cached responses for collections changed by a mutating call."""
+        if self.cache is not None:
+            for collection in collections:
+                self.cache.invalidate(collection)
+
+    # PAGINATION
+    # ==========
+
+    def iter_pages(self, list_method: Callable[..., Dict[str, Any]], *args,
+                   page_size: int = 100, offset: int = 0, concurrency: int = 1,
+                   **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield successive pages from a list method until the result set is exhausted.
+
+        With concurrency > 1 the first page's total is used to prefetch the
+        remaining offsets on a bounded thread pool; pages are still yielded in order.
+        """
+        fetch = lambda page_offset: list_method(*args, limit=page_size, offset=page_offset, **kwargs)
+        page = fetch(offset)
+        yield page
+        offset += len(page["data"])
+        if concurrency > 1 and page["data"] and offset < page["total"]:
+            for page in bounded_map(fetch, range(offset, page["total"], page_size), workers=concurrency):
+                yield page
+                if not page["data"]:
+                    return
+                offset = page["offset"] + len(page["data"])
+        # Continue sequentially for anything the prefetch did not cover (e.g. newly created records)
+        while page["data"] and (page["has_more"] or offset < page["total"]):
+            page = fetch(offset)
+            yield page
+            offset += len(page["data"])
+
+    def iter_records(self, list_method: Callable[..., Dict[str, Any]], *args, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield individual records from every page of a list method."""
+        for page in self.iter_pages(list_method, *args, **kwargs):
+            yield from page["data"]
+
     # ALERTS
     # =======
 
@@ -36,8 +247,16 @@ class PagerTreeClient:
                     urgency: str = "medium", tags: Optional[List[str]] = None,
                     alias: Optional[str] = None, incident: bool = False,
                     incident_severity: Optional[str] = None,
-                    incident_message: Optional[str] = None) -> Dict[str, Any]:
-        """Create a new alert in PagerTree."""
+                    incident_message: Optional[str] = None,
+                    on_duplicate: str = "create", dedupe_window: float = DEDUPE_WINDOW) -> Dict[str, Any]:
+        """Create a new alert in PagerTree.
+
+        With an alias and on_duplicate "skip" or "comment", an alias the alias
+        index saw on a live (not resolved or dropped) alert within dedupe_window
+        seconds is not posted again once a GET confirms the alert is still live:
+        "skip" returns that alert's ID and "comment" adds a comment to it. Such
+        results carry "deduplicated" set to the action.
+        """
         payload = {
             "title": title,
             "description": description,
@@ -54,18 +273,58 @@ class PagerTreeClient:
             }
         }
         payload = {k: v for k, v in payload.items() if v is not None}
-        response = self.session.post(f"{self.base_url}/alerts", json=payload)
+        if on_duplicate not in DUPLICATE_ACTIONS:
+            raise ValueError(f"on_duplicate must be one of {', '.join(DUPLICATE_ACTIONS)}")
+        if not alias or on_duplicate == "create" or self.alias_index is None:
+            return self._post_alert(payload)
+
+        with self._alias_locks[hash(alias) % len(self._alias_locks)]:
+            alert_id = self._live_duplicate(alias, dedupe_window)
+            if alert_id is None:
+                return self._post_alert(payload)
+        if on_duplicate == "comment":
+            try:
+                self.create_alert_comment(alert_id, f"Alert fired again: {title}")
+            except requests.exceptions.HTTPError as e:
+                # The indexed alert was deleted; forget it and create a fresh one
+                if e.response is None or e.response.status_code not in (404, 410):
+                    raise
+                self.alias_index.forget(alert_id)
+                return self._post_alert(payload)
+        return {"id": alert_id, "thirdparty_id": alias, "deduplicated": on_duplicate}
+
+    def _live_duplicate(self, alias: str, dedupe_window: float) -> Optional[str]:
+        """ID of the indexed alert for alias if the server still reports it live, else None."""
+        alert_id = self.alias_index.lookup(alias, max_age=dedupe_window)
+        if alert_id is None:
+            return None
+        # The index may be stale: the alert could have been resolved or deleted elsewhere
+        try:
+            alert = self.show_alert(alert_id, revalidate=True)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code not in (404, 410):
+                raise
+            self.alias_index.forget(alert_id)
+            return None
+        return None if alert.get("status") in TERMINAL_STATUSES else alert_id
+
+    def _post_alert(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST an alert payload and index the created alert."""
+        response = self._request("POST", "/alerts", json=payload)
         response.raise_for_status()
-        return response.json()
+        self._invalidate("alerts")
+        result = self._decode(response)
+        self._index_alerts([result])
+        return result
 
     def list_alerts(self, limit: int = 10, offset: int = 0, 
-                   status: Optional[str] = None, search: Optional[str] = None, alias: Optional[str] = None) -> Dict[str, Any]:
+                   status: Optional[str] = None, search: Optional[str] = None, alias: Optional[str] = None,
+                   revalidate: bool = False) -> Dict[str, Any]:
         """List all alerts in PagerTree."""
         params = {k: v for k, v in {"limit": limit, "offset": offset, "status": status, "q": search, "thirdparty_id": alias}.items() 
                  if v is not None}
-        response = self.session.get(f"{self.base_url}/alerts", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get("/alerts", params=params, revalidate=revalidate)
+        self._index_alerts(data.get("data", []))
         return {
             "data": data.get("data", []),
             "total": data.get("total_count", 0),
@@ -74,50 +333,72 @@ class PagerTreeClient:
             "offset": offset
         }
 
-    def show_alert(self, alert_id: str) -> Dict[str, Any]:
+    def find_alert_id(self, alias: str, status: Optional[str] = None, use_index: bool = True) -> Optional[str]:
+        """Resolve an alert alias to an alert ID, consulting the local alias index before the API."""
+        if use_index and self.alias_index is not None:
+            alert_id = self.alias_index.lookup(alias, status=status)
+            if alert_id:
+                return alert_id
+        result = self.list_alerts(alias=alias, limit=1, offset=0, status=status)
+        if result["total"] == 0 or not result["data"]:
+            return None
+        return result["data"][0]["id"]
+
+    def show_alert(self, alert_id: str, revalidate: bool = False) -> Dict[str, Any]:
         """Fetch a single alert by ID from PagerTree."""
-        response = self.session.get(f"{self.base_url}/alerts/{alert_id}")
-        response.raise_for_status()
-        return response.json()
+        alert = self._get(f"/alerts/{alert_id}", revalidate=revalidate)
+        self._index_alerts([alert])
+        return alert
 
     def delete_alert(self, alert_id: str) -> Dict[str, Any]:
         """Delete an alert in PagerTree."""
-        response = self.session.delete(f"{self.base_url}/alerts/{alert_id}")
+        response = self._request("DELETE", f"/alerts/{alert_id}")
         response.raise_for_status()
-        return response.json() if response.content else {"message": "Alert deleted successfully"}
+        self._invalidate("alerts")
+        if self.alias_index is not None:
+            self.alias_index.forget(alert_id)
+        return self._decode(response) if response.content else {"message": "Alert deleted successfully"}
 
     def acknowledge_alert(self, alert_id: str) -> Dict[str, Any]:
         """Acknowledge an alert in PagerTree."""
-        response = self.session.post(f"{self.base_url}/alerts/{alert_id}/acknowledge")
+        response = self._request("POST", f"/alerts/{alert_id}/acknowledge")
         response.raise_for_status()
-        return response.json()
+        self._invalidate("alerts")
+        result = self._decode(response)
+        self._index_alerts([result])
+        return result
 
     def reject_alert(self, alert_id: str) -> Dict[str, Any]:
         """Reject an alert in PagerTree."""
-        response = self.session.post(f"{self.base_url}/alerts/{alert_id}/reject")
+        response = self._request("POST", f"/alerts/{alert_id}/reject")
         response.raise_for_status()
-        return response.json()
+        self._invalidate("alerts")
+        result = self._decode(response)
+        self._index_alerts([result])
+        return result
 
     def resolve_alert(self, alert_id: str) -> Dict[str, Any]:
         """Resolve an alert in PagerTree."""
-        response = self.session.post(f"{self.base_url}/alerts/{alert_id}/resolve")
+        response = self._request("POST", f"/alerts/{alert_id}/resolve")
         response.raise_for_status()
-        return response.json()
+        self._invalidate("alerts")
+        result = self._decode(response)
+        self._index_alerts([result])
+        return result
 
     def create_alert_comment(self, alert_id: str, comment: str) -> Dict[str, Any]:
         """Create a comment on an alert in PagerTree."""
         payload = {"body": comment}
-        response = self.session.post(f"{self.base_url}/alerts/{alert_id}/comments", json=payload)
+        response = self._request("POST", f"/alerts/{alert_id}/comments", json=payload)
         response.raise_for_status()
-        return response.json()
+        self._invalidate("alerts")
+        return self._decode(response)
 
     def list_alert_comments(self, alert_id: str, limit: int = 10, 
                           offset: int = 0) -> Dict[str, Any]:
         """List all comments for a specific alert in PagerTree."""
         params = {k: v for k, v in {"limit": limit, "offset": offset}.items() if v is not None}
-        response = self.session.get(f"{self.base_url}/alerts/{alert_id}/comments", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get(f"/alerts/{alert_id}/comments", params=params)
         return {
             "data": data.get("data", []),
             "total": data.get("total_count", 0),
@@ -144,16 +425,15 @@ class PagerTreeClient:
             "destination_team_ids": destination_team_ids or []
         }
         payload = {k: v for k, v in payload.items() if v is not None}
-        response = self.session.post(f"{self.base_url}/broadcasts", json=payload)
+        response = self._request("POST", "/broadcasts", json=payload)
         response.raise_for_status()
-        return response.json()
+        self._invalidate("broadcasts")
+        return self._decode(response)
 
     def list_broadcasts(self, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
         """List all broadcasts in PagerTree."""
         params = {k: v for k, v in {"limit": limit, "offset": offset}.items() if v is not None}
-        response = self.session.get(f"{self.base_url}/broadcasts", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get("/broadcasts", params=params)
         return {
             "data": data.get("data", []),
             "total": data.get("total_count", 0),
@@ -164,9 +444,7 @@ class PagerTreeClient:
 
     def show_broadcast(self, broadcast_id: str) -> Dict[str, Any]:
         """Fetch a single broadcast by ID from PagerTree."""
-        response = self.session.get(f"{self.base_url}/broadcasts/{broadcast_id}")
-        response.raise_for_status()
-        return response.json()
+        return self._get(f"/broadcasts/{broadcast_id}")
 
     def update_broadcast(
         self,
@@ -206,24 +484,24 @@ class PagerTreeClient:
         payload = {k: v for k, v in payload.items() if v is not None}
         if "meta" in payload:
             payload["meta"] = {k: v for k, v in payload["meta"].items() if v is not None}
-        response = self.session.put(f"{self.base_url}/broadcasts/{broadcast_id}", json=payload)
+        response = self._request("PUT", f"/broadcasts/{broadcast_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        self._invalidate("broadcasts")
+        return self._decode(response)
 
     def delete_broadcast(self, broadcast_id: str) -> Dict[str, Any]:
         """Delete a broadcast in PagerTree."""
-        response = self.session.delete(f"{self.base_url}/broadcasts/{broadcast_id}")
+        response = self._request("DELETE", f"/broadcasts/{broadcast_id}")
         response.raise_for_status()
-        return response.json() if response.content else {"message": "Broadcast deleted successfully"}
+        self._invalidate("broadcasts")
+        return self._decode(response) if response.content else {"message": "Broadcast deleted successfully"}
 
     # INTEGRATIONS
     # ============
     def list_integrations(self, limit: int = 10, offset: int = 0, search: Optional[str] = None, enabled: Optional[bool] = None) -> Dict[str, Any]:
         """List all integrations in PagerTree."""
         params = {k: v for k, v in {"limit": limit, "offset": offset, "q": search, "enabled": enabled}.items() if v is not None}
-        response = self.session.get(f"{self.base_url}/integrations", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get("/integrations", params=params)
         return {
             "data": data.get("data", []),
             "total": data.get("total_count", 0),
@@ -234,17 +512,16 @@ class PagerTreeClient:
 
     def show_integration(self, integration_id: str) -> Dict[str, Any]:
         """Fetch a single integration by ID from PagerTree."""
-        response = self.session.get(f"{self.base_url}/integrations/{integration_id}")
-        response.raise_for_status()
-        return response.json()
+        return self._get(f"/integrations/{integration_id}")
 
     def update_integration(self, integration_id: str, enabled: Optional[bool] = None) -> Dict[str, Any]:
         """Enable an integration in PagerTree."""
         payload = {"enabled": enabled}
         payload = {k: v for k, v in payload.items() if v is not None}
-        response = self.session.put(f"{self.base_url}/integrations/{integration_id}", json=payload)
+        response = self._request("PUT", f"/integrations/{integration_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        self._invalidate("integrations")
+        return self._decode(response)
         
     # TEAMS
     # ======
@@ -264,16 +541,15 @@ class PagerTreeClient:
             "admin_account_user_ids": admin_account_user_ids or []
         }
         payload = {k: v for k, v in payload.items() if v is not None}
-        response = self.session.post(f"{self.base_url}/teams", json=payload)
+        response = self._request("POST", "/teams", json=payload)
         response.raise_for_status()
-        return response.json()
+        self._invalidate("teams")
+        return self._decode(response)
 
     def list_teams(self, limit: int = 10, offset: int = 0, search: Optional[str] = None) -> Dict[str, Any]:
         """List all teams in PagerTree."""
         params = {k: v for k, v in {"limit": limit, "offset": offset, "q": search}.items() if v is not None}
-        response = self.session.get(f"{self.base_url}/teams", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get("/teams", params=params)
         return {
             "data": data.get("data", []),
             "total": data.get("total_count", 0),
@@ -284,9 +560,7 @@ class PagerTreeClient:
 
     def show_team(self, team_id: str) -> Dict[str, Any]:
         """Fetch a single team by ID from PagerTree."""
-        response = self.session.get(f"{self.base_url}/teams/{team_id}")
-        response.raise_for_status()
-        return response.json()
+        return self._get(f"/teams/{team_id}")
 
     def update_team(
         self,
@@ -304,28 +578,27 @@ class PagerTreeClient:
             "admin_account_user_ids": admin_account_user_ids
         }
         payload = {k: v for k, v in payload.items() if v is not None}
-        response = self.session.put(f"{self.base_url}/teams/{team_id}", json=payload)
+        response = self._request("PUT", f"/teams/{team_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        self._invalidate("teams")
+        return self._decode(response)
 
     def delete_team(self, team_id: str) -> Dict[str, Any]:
         """Delete a team in PagerTree."""
-        response = self.session.delete(f"{self.base_url}/teams/{team_id}")
+        response = self._request("DELETE", f"/teams/{team_id}")
         response.raise_for_status()
-        return response.json() if response.content else {"message": "Team deleted successfully"}
+        self._invalidate("teams")
+        return self._decode(response) if response.content else {"message": "Team deleted successfully"}
 
     def get_team_current_oncall(self, team_id: str) -> Dict[str, Any]:
         """Fetch current on-call users for a team in PagerTree."""
-        response = self.session.get(f"{self.base_url}/teams/{team_id}/current_oncall")
-        response.raise_for_status()
-        return response.json()
+        return self._get(f"/teams/{team_id}/current_oncall")
 
     def get_team_alerts(self, team_id: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
         """Fetch alerts for a specific team in PagerTree."""
         params = {k: v for k, v in {"limit": limit, "offset": offset}.items() if v is not None}
-        response = self.session.get(f"{self.base_url}/teams/{team_id}/alerts", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get(f"/teams/{team_id}/alerts", params=params)
+        self._index_alerts(data.get("data", []))
         return {
             "data": data.get("data", []),
             "total": data.get("total_count", 0),
@@ -347,16 +620,15 @@ class PagerTreeClient:
             "roles": roles or {},
             "team_ids": team_ids or []
         }
-        response = self.session.post(f"{self.base_url}/account_users", json=payload)
+        response = self._request("POST", "/account_users", json=payload)
         response.raise_for_status()
-        return response.json()
+        self._invalidate("account_users", "teams")
+        return self._decode(response)
 
     def list_users(self, limit: int = 10, offset: int = 0, search: Optional[str] = None) -> Dict[str, Any]:
         """List all users in PagerTree."""
         params = {k: v for k, v in {"limit": limit, "offset": offset, "q": search}.items() if v is not None}
-        response = self.session.get(f"{self.base_url}/account_users", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get("/account_users", params=params)
         return {
             "data": data.get("data", []),
             "total": data.get("total_count", 0),
@@ -367,9 +639,49 @@ class PagerTreeClient:
 
     def show_user(self, user_id: str) -> Dict[str, Any]:
         """Fetch a single user by ID from PagerTree."""
-        response = self.session.get(f"{self.base_url}/account_users/{user_id}")
-        response.raise_for_status()
-        return response.json()
+        return self._get(f"/account_users/{user_id}")
+
+    def resolve_users(self, user_ids: List[str], concurrency: int = 8,
+                      scan_threshold: int = 20) -> Dict[str, Dict[str, Any]]:
+        """Fetch many account users by ID, returning a mapping of ID to user.
+
+        IDs are deduplicated and memoized for the life of the client. Small sets
+        are fetched concurrently with show_user; larger sets probe the first
+        list_users page and switch to a paged scan joined locally when that needs
+        fewer requests. Users that could not be fetched are left out of the result
+        and their errors kept in user_errors, which is reset on every call;
+        authentication errors are raised.
+        """
+        self.user_errors = {}
+        wanted = list(dict.fromkeys(user_id for user_id in user_ids if user_id))
+        missing = [user_id for user_id in wanted if user_id not in self._user_memo]
+
+        if len(missing) > scan_threshold:
+            page_size = 100
+            first_page = self.list_users(limit=page_size, offset=0)
+            for user in first_page["data"]:
+                self._user_memo[user.get("id")] = user
+            missing = [user_id for user_id in missing if user_id not in self._user_memo]
+            remaining_pages = math.ceil(first_page["total"] / page_size) - 1
+            if missing and remaining_pages < len(missing):
+                for user in self.iter_records(self.list_users, page_size=page_size, offset=page_size,
+                                              concurrency=concurrency):
+                    self._user_memo[user.get("id")] = user
+                missing = [user_id for user_id in missing if user_id not in self._user_memo]
+
+        def fetch(user_id: str) -> None:
+            try:
+                self._user_memo[user_id] = self.show_user(user_id)
+            except requests.exceptions.RequestException as e:
+                response = getattr(e, "response", None)
+                if response is not None and response.status_code in (401, 403):
+                    raise
+                self.user_errors[user_id] = e
+
+        for _ in bounded_map(fetch, missing, workers=concurrency):
+            pass
+
+        return {user_id: self._user_memo[user_id] for user_id in wanted if user_id in self._user_memo}
 
     def update_user(self, user_id: str, name: Optional[str] = None) -> Dict[str, Any]:
         """Update an account user in PagerTree."""
@@ -378,12 +690,16 @@ class PagerTreeClient:
             payload["user_attributes"] = {}
             payload["user_attributes"]["name"] = name
         payload = {k: v for k, v in payload.items() if v}
-        response = self.session.put(f"{self.base_url}/account_users/{user_id}", json=payload)
+        response = self._request("PUT", f"/account_users/{user_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        self._invalidate("account_users", "teams")
+        self._user_memo.pop(user_id, None)
+        return self._decode(response)
 
     def delete_user(self, user_id: str) -> Dict[str, Any]:
         """Delete a user in PagerTree."""
-        response = self.session.delete(f"{self.base_url}/account_users/{user_id}")
+        response = self._request("DELETE", f"/account_users/{user_id}")
         response.raise_for_status()
-        return response.json() if response.content else {"message": "User deleted successfully"}
\ No newline at end of file
+        self._invalidate("account_users", "teams")
+        self._user_memo.pop(user_id, None)
+        return self._decode(response) if response.content else {"message": "User deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,562 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+import click
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable
+import jsoncodec
+from api import PagerTreeClient, IDEMPOTENT_METHODS, RETRY_STATUS_CODES, DUPLICATE_ACTIONS, DEDUPE_WINDOW
+from alias_index import AliasIndex, TERMINAL_STATUSES
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+def _page(data: Dict[str, Any], limit: int, offset: int) -> Dict[str, Any]:
+    """Normalize a list response the same way PagerTreeClient does."""
+    return {
+        "data": data.get("data", []),
+        "total": data.get("total_count", 0),
+        "has_more": data.get("has_more", False),
+        "limit": limit,
+        "offset": offset
+    }
+
+class AsyncPagerTreeClient:
+    """Asyncio counterpart of PagerTreeClient backed by a pooled httpx.AsyncClient.
+
+    Methods mirror api.PagerTreeClient and return the same structures. At most
+    max_concurrency requests are in flight at once; use the client as an async
+    context manager (or await aclose()) to release its connections.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None, max_concurrency: Optional[int] = None,
+                 alias_index: Optional[AliasIndex] = None):
+        """Initialize the async PagerTree client with configuration."""
+        if httpx is None:
+            raise ImportError("AsyncPagerTreeClient requires the optional httpx package; install it with 'pip install httpx'")
+
+        # Set up base URL and API key
+        self.base_url = os.getenv('PAGERTREE_BASE_URL', 'https://api.pagertree.com/api/v4')
+        self.api_key = os.getenv('PAGERTREE_API_KEY')
+        self.user_agent = "PagerTree-Python-CLI-Client/1.0"
+
+        if not self.api_key:
+            raise click.UsageError("PAGERTREE_API_KEY must be provided via environment variable or .env config file")
+
+        self.default_headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "User-Agent": self.user_agent
+        }
+
+        # One pooled client shared by every coroutine
+        self.pool_size = max_connections or int(os.getenv('PAGERTREE_POOL_SIZE', '10'))
+        self.client = httpx.AsyncClient(
+            headers=self.default_headers,
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            timeout=httpx.Timeout(30.0)
+        )
+        # asyncio primitives are created on first use so they bind to the loop that runs the client
+        self.max_concurrency = max_concurrency or self.pool_size
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._alias_locks: Dict[int, asyncio.Lock] = {}
+
+        # Retry and rate-limit settings, shared in meaning with PagerTreeClient
+        self.max_retries = int(os.getenv('PAGERTREE_MAX_RETRIES', '3'))
+        self.backoff_base = float(os.getenv('PAGERTREE_BACKOFF_BASE', '0.5'))
+        self.backoff_max = 30.0
+        self._rate_limit_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+        self.alias_index = alias_index
+        self._user_memo: Dict[str, Dict[str, Any]] = {}
+        # Errors from the last resolve_users call, keyed by user ID
+        self.user_errors: Dict[str, Exception] = {}
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Semaphore capping in-flight requests, created inside the running loop."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def __aenter__(self) -> "AsyncPagerTreeClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self.client.aclose()
+
+    # REQUESTS
+    # ========
+
+    # The backoff and rate-limit bookkeeping only reads headers, so it is shared with the sync client
+    _backoff_delay = PagerTreeClient._backoff_delay
+    _retry_after_delay = PagerTreeClient._retry_after_delay
+    _observe_rate_limit = PagerTreeClient._observe_rate_limit
+
+    async def _request(self, method: str, path: str, **kwargs) -> "httpx.Response":
+        """Send a request with the same retry policy as PagerTreeClient._request."""
+        url = f"{self.base_url}{path}"
+        idempotent = method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            await self._wait_for_rate_limit()
+            try:
+                async with self.semaphore:
+                    response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                # A connect failure means the request never reached the server
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+            else:
+                self._observe_rate_limit(response)
+                retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUS_CODES)
+                if not retryable or attempt >= self.max_retries:
+                    return response
+                delay = self._retry_after_delay(response)
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Sleep until the pacing set by _observe_rate_limit allows another request."""
+        delay = self._next_request_at - time.time()
+        if delay > 0:
+            await asyncio.sleep(min(delay, self.backoff_max * 2))
+
+    @staticmethod
+    def _decode(response: "httpx.Response") -> Any:
+        """Decode a JSON response body with the JSON codec (orjson when installed)."""
+        return jsoncodec.loads(response.content)
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Issue a GET request and decode the JSON body."""
+        response = await self._request("GET", path, params=params)
+        response.raise_for_status()
+        return self._decode(response)
+
+    async def _send(self, method: str, path: str, json: Optional[Dict[str, Any]] = None) -> "httpx.Response":
+        """Issue a mutating request and raise for error statuses."""
+        response = await self._request(method, path, json=json)
+        response.raise_for_status()
+        return response
+
+    async def _index_call(self, method: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking AliasIndex (sqlite) call in the default executor, off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(method, *args, **kwargs))
+
+    async def _index_alerts(self, alerts: List[Dict[str, Any]]) -> None:
+        """Feed alerts seen in responses into the alias index."""
+        if self.alias_index is not None:
+            await self._index_call(self.alias_index.record, alerts)
+
+    # PAGINATION
+    # ==========
+
+    async def iter_pages(self, list_method: Callable[..., Awaitable[Dict[str, Any]]], *args,
+                         page_size: int = 100, offset: int = 0, concurrency: int = 1,
+                         **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Yield successive pages from an async list method until the result set is exhausted.
+
+        With concurrency > 1 the remaining offsets are fetched in windows of
+        concurrent requests once the first page reports the total; pages are
+        still yielded in order.
+        """
+        fetch = lambda page_offset: list_method(*args, limit=page_size, offset=page_offset, **kwargs)
+        page = await fetch(offset)
+        yield page
+        offset += len(page["data"])
+        if concurrency > 1 and page["data"] and offset < page["total"]:
+            offsets = list(range(offset, page["total"], page_size))
+            for start in range(0, len(offsets), concurrency):
+                window = [asyncio.ensure_future(fetch(page_offset)) for page_offset in offsets[start:start + concurrency]]
+                try:
+                    for task in window:
+                        page = await task
+                        yield page
+                        if not page["data"]:
+                            return
+                        offset = page["offset"] + len(page["data"])
+                finally:
+                    for task in window:
+                        task.cancel()
+        # Continue sequentially for anything the prefetch did not cover (e.g. newly created records)
+        while page["data"] and (page["has_more"] or offset < page["total"]):
+            page = await fetch(offset)
+            yield page
+            offset += len(page["data"])
+
+    async def iter_records(self, list_method: Callable[..., Awaitable[Dict[str, Any]]], *args,
+                           **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Yield individual records from every page of an async list method."""
+        async for page in self.iter_pages(list_method, *args, **kwargs):
+            for record in page["data"]:
+                yield record
+
+    # ALERTS
+    # =======
+
+    async def create_alert(self, title: str, description: Optional[str] = None,
+                           team_ids: Optional[List[str]] = None,
+                           destination_router_ids: Optional[List[str]] = None,
+                           destination_account_user_ids: Optional[List[str]] = None,
+                           urgency: str = "medium", tags: Optional[List[str]] = None,
+                           alias: Optional[str] = None, incident: bool = False,
+                           incident_severity: Optional[str] = None,
+                           incident_message: Optional[str] = None,
+                           on_duplicate: str = "create", dedupe_window: float = DEDUPE_WINDOW) -> Dict[str, Any]:
+        """Create a new alert in PagerTree; on_duplicate works as in PagerTreeClient.create_alert."""
+        payload = {
+            "title": title,
+            "description": description,
+            "destination_team_ids": team_ids,
+            "destination_route_ids": destination_router_ids,
+            "destination_account_user_ids": destination_account_user_ids,
+            "urgency": urgency,
+            "tags": tags,
+            "thirdparty_id": alias,
+            "meta": {
+                "incident": incident,
+                "incident_severity": incident_severity,
+                "incident_message": incident_message
+            }
+        }
+        payload = {k: v for k, v in payload.items() if v is not None}
+        if on_duplicate not in DUPLICATE_ACTIONS:
+            raise ValueError(f"on_duplicate must be one of {', '.join(DUPLICATE_ACTIONS)}")
+        if not alias or on_duplicate == "create" or self.alias_index is None:
+            return await self._post_alert(payload)
+
+        async with self._alias_locks.setdefault(hash(alias) % 64, asyncio.Lock()):
+            alert_id = await self._live_duplicate(alias, dedupe_window)
+            if alert_id is None:
+                return await self._post_alert(payload)
+        if on_duplicate == "comment":
+            try:
+                await self.create_alert_comment(alert_id, f"Alert fired again: {title}")
+            except httpx.HTTPStatusError as e:
+                # The indexed alert was deleted; forget it and create a fresh one
+                if e.response.status_code not in (404, 410):
+                    raise
+                await self._index_call(self.alias_index.forget, alert_id)
+                return await self._post_alert(payload)
+        return {"id": alert_id, "thirdparty_id": alias, "deduplicated": on_duplicate}
+
+    async def _live_duplicate(self, alias: str, dedupe_window: float) -> Optional[str]:
+        """ID of the indexed alert for alias if the server still reports it live, else None."""
+        alert_id = await self._index_call(self.alias_index.lookup, alias, max_age=dedupe_window)
+        if alert_id is None:
+            return None
+        try:
+            alert = await self.show_alert(alert_id)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in (404, 410):
+                raise
+            await self._index_call(self.alias_index.forget, alert_id)
+            return None
+        return None if alert.get("status") in TERMINAL_STATUSES else alert_id
+
+    async def _post_alert(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST an alert payload and index the created alert."""
+        result = self._decode(await self._send("POST", "/alerts", json=payload))
+        await self._index_alerts([result])
+        return result
+
+    async def list_alerts(self, limit: int = 10, offset: int = 0,
+                          status: Optional[str] = None, search: Optional[str] = None,
+                          alias: Optional[str] = None) -> Dict[str, Any]:
+        """List all alerts in PagerTree."""
+        params = {k: v for k, v in {"limit": limit, "offset": offset, "status": status, "q": search, "thirdparty_id": alias}.items()
+                  if v is not None}
+        data = await self._get("/alerts", params=params)
+        await self._index_alerts(data.get("data", []))
+        return _page(data, limit, offset)
+
+    async def find_alert_id(self, alias: str, status: Optional[str] = None, use_index: bool = True) -> Optional[str]:
+        """Resolve an alert alias to an alert ID, consulting the local alias index before the API."""
+        if use_index and self.alias_index is not None:
+            alert_id = await self._index_call(self.alias_index.lookup, alias, status=status)
+            if alert_id:
+                return alert_id
+        result = await self.list_alerts(alias=alias, limit=1, offset=0, status=status)
+        if result["total"] == 0 or not result["data"]:
+            return None
+        return result["data"][0]["id"]
+
+    async def show_alert(self, alert_id: str) -> Dict[str, Any]:
+        """Fetch a single alert by ID from PagerTree."""
+        alert = await self._get(f"/alerts/{alert_id}")
+        await self._index_alerts([alert])
+        return alert
+
+    async def delete_alert(self, alert_id: str) -> Dict[str, Any]:
+        """Delete an alert in PagerTree."""
+        response = await self._send("DELETE", f"/alerts/{alert_id}")
+        if self.alias_index is not None:
+            await self._index_call(self.alias_index.forget, alert_id)
+        return self._decode(response) if response.content else {"message": "Alert deleted successfully"}
+
+    async def acknowledge_alert(self, alert_id: str) -> Dict[str, Any]:
+        """Acknowledge an alert in PagerTree."""
+        result = self._decode(await self._send("POST", f"/alerts/{alert_id}/acknowledge"))
+        await self._index_alerts([result])
+        return result
+
+    async def reject_alert(self, alert_id: str) -> Dict[str, Any]:
+        """Reject an alert in PagerTree."""
+        result = self._decode(await self._send("POST", f"/alerts/{alert_id}/reject"))
+        await self._index_alerts([result])
+        return result
+
+    async def resolve_alert(self, alert_id: str) -> Dict[str, Any]:
+        """Resolve an alert in PagerTree."""
+        result = self._decode(await self._send("POST", f"/alerts/{alert_id}/resolve"))
+        await self._index_alerts([result])
+        return result
+
+    async def create_alert_comment(self, alert_id: str, comment: str) -> Dict[str, Any]:
+        """Create a comment on an alert in PagerTree."""
+        payload = {"body": comment}
+        return self._decode(await self._send("POST", f"/alerts/{alert_id}/comments", json=payload))
+
+    async def list_alert_comments(self, alert_id: str, limit: int = 10,
+                                  offset: int = 0) -> Dict[str, Any]:
+        """List all comments for a specific alert in PagerTree."""
+        params = {k: v for k, v in {"limit": limit, "offset": offset}.items() if v is not None}
+        data = await self._get(f"/alerts/{alert_id}/comments", params=params)
+        return _page(data, limit, offset)
+
+    # BROADCASTS
+    # =========
+
+    async def create_broadcast(
+        self,
+        title: str,
+        description: Optional[str] = None,
+        destination_account_user_ids: Optional[List[str]] = None,
+        destination_team_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Create a new broadcast in PagerTree."""
+        payload = {
+            "title": title,
+            "description": description,
+            "destination_account_user_ids": destination_account_user_ids or [],
+            "destination_team_ids": destination_team_ids or []
+        }
+        payload = {k: v for k, v in payload.items() if v is not None}
+        return self._decode(await self._send("POST", "/broadcasts", json=payload))
+
+    async def list_broadcasts(self, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """List all broadcasts in PagerTree."""
+        params = {k: v for k, v in {"limit": limit, "offset": offset}.items() if v is not None}
+        data = await self._get("/broadcasts", params=params)
+        return _page(data, limit, offset)
+
+    async def show_broadcast(self, broadcast_id: str) -> Dict[str, Any]:
+        """Fetch a single broadcast by ID from PagerTree."""
+        return await self._get(f"/broadcasts/{broadcast_id}")
+
+    async def update_broadcast(
+        self,
+        broadcast_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        destination_account_user_ids: Optional[List[str]] = None,
+        destination_team_ids: Optional[List[str]] = None,
+        response_requested: Optional[bool] = None,
+        response_requested_by: Optional[str] = None,
+        status: Optional[str] = None,
+        notify_sms: Optional[bool] = None,
+        notify_push: Optional[bool] = None,
+        notify_email: Optional[bool] = None,
+        notify_slack: Optional[bool] = None,
+        notify_voice: Optional[bool] = None,
+        notify_whatsapp: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Update a broadcast in PagerTree."""
+        payload = {
+            "title": title,
+            "description": description,
+            "destination_account_user_ids": destination_account_user_ids,
+            "destination_team_ids": destination_team_ids,
+            "response_requested": response_requested,
+            "response_requested_by": response_requested_by,
+            "status": status,
+            "meta": {
+                "notify_sms": notify_sms,
+                "notify_push": notify_push,
+                "notify_email": notify_email,
+                "notify_slack": notify_slack,
+                "notify_voice": notify_voice,
+                "notify_whatsapp": notify_whatsapp
+            }
+        }
+        payload = {k: v for k, v in payload.items() if v is not None}
+        if "meta" in payload:
+            payload["meta"] = {k: v for k, v in payload["meta"].items() if v is not None}
+        return self._decode(await self._send("PUT", f"/broadcasts/{broadcast_id}", json=payload))
+
+    async def delete_broadcast(self, broadcast_id: str) -> Dict[str, Any]:
+        """Delete a broadcast in PagerTree."""
+        response = await self._send("DELETE", f"/broadcasts/{broadcast_id}")
+        return self._decode(response) if response.content else {"message": "Broadcast deleted successfully"}
+
+    # INTEGRATIONS
+    # ============
+
+    async def list_integrations(self, limit: int = 10, offset: int = 0, search: Optional[str] = None,
+                                enabled: Optional[bool] = None) -> Dict[str, Any]:
+        """List all integrations in PagerTree."""
+        params = {k: v for k, v in {"limit": limit, "offset": offset, "q": search, "enabled": enabled}.items() if v is not None}
+        data = await self._get("/integrations", params=params)
+        return _page(data, limit, offset)
+
+    async def show_integration(self, integration_id: str) -> Dict[str, Any]:
+        """Fetch a single integration by ID from PagerTree."""
+        return await self._get(f"/integrations/{integration_id}")
+
+    async def update_integration(self, integration_id: str, enabled: Optional[bool] = None) -> Dict[str, Any]:
+        """Enable an integration in PagerTree."""
+        payload = {"enabled": enabled}
+        payload = {k: v for k, v in payload.items() if v is not None}
+        return self._decode(await self._send("PUT", f"/integrations/{integration_id}", json=payload))
+
+    # TEAMS
+    # ======
+
+    async def create_team(
+        self,
+        name: str,
+        notes: Optional[str] = None,
+        member_account_user_ids: Optional[List[str]] = None,
+        admin_account_user_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Create a new team in PagerTree."""
+        payload = {
+            "name": name,
+            "notes": notes,
+            "member_account_user_ids": member_account_user_ids or [],
+            "admin_account_user_ids": admin_account_user_ids or []
+        }
+        payload = {k: v for k, v in payload.items() if v is not None}
+        return self._decode(await self._send("POST", "/teams", json=payload))
+
+    async def list_teams(self, limit: int = 10, offset: int = 0, search: Optional[str] = None) -> Dict[str, Any]:
+        """List all teams in PagerTree."""
+        params = {k: v for k, v in {"limit": limit, "offset": offset, "q": search}.items() if v is not None}
+        data = await self._get("/teams", params=params)
+        return _page(data, limit, offset)
+
+    async def show_team(self, team_id: str) -> Dict[str, Any]:
+        """Fetch a single team by ID from PagerTree."""
+        return await self._get(f"/teams/{team_id}")
+
+    async def update_team(
+        self,
+        team_id: str,
+        name: Optional[str] = None,
+        notes: Optional[str] = None,
+        member_account_user_ids: Optional[List[str]] = None,
+        admin_account_user_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Update a team in PagerTree."""
+        payload = {
+            "name": name,
+            "notes": notes,
+            "member_account_user_ids": member_account_user_ids,
+            "admin_account_user_ids": admin_account_user_ids
+        }
+        payload = {k: v for k, v in payload.items() if v is not None}
+        return self._decode(await self._send("PUT", f"/teams/{team_id}", json=payload))
+
+    async def delete_team(self, team_id: str) -> Dict[str, Any]:
+        """Delete a team in PagerTree."""
+        response = await self._send("DELETE", f"/teams/{team_id}")
+        return self._decode(response) if response.content else {"message": "Team deleted successfully"}
+
+    async def get_team_current_oncall(self, team_id: str) -> Dict[str, Any]:
+        """Fetch current on-call users for a team in PagerTree."""
+        return await self._get(f"/teams/{team_id}/current_oncall")
+
+    async def get_team_alerts(self, team_id: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """Fetch alerts for a specific team in PagerTree."""
+        params = {k: v for k, v in {"limit": limit, "offset": offset}.items() if v is not None}
+        data = await self._get(f"/teams/{team_id}/alerts", params=params)
+        await self._index_alerts(data.get("data", []))
+        return _page(data, limit, offset)
+
+    # USERS
+    # ======
+
+    async def create_user(self, name: str, email: str, roles: Optional[Dict[str, bool]] = None,
+                          team_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Create a new account user in PagerTree."""
+        payload = {
+            "user_attributes": {
+                "name": name,
+                "emails_attributes": [{"email": email}]
+            },
+            "roles": roles or {},
+            "team_ids": team_ids or []
+        }
+        return self._decode(await self._send("POST", "/account_users", json=payload))
+
+    async def list_users(self, limit: int = 10, offset: int = 0, search: Optional[str] = None) -> Dict[str, Any]:
+        """List all users in PagerTree."""
+        params = {k: v for k, v in {"limit": limit, "offset": offset, "q": search}.items() if v is not None}
+        data = await self._get("/account_users", params=params)
+        return _page(data, limit, offset)
+
+    async def show_user(self, user_id: str) -> Dict[str, Any]:
+        """Fetch a single user by ID from PagerTree."""
+        return await self._get(f"/account_users/{user_id}")
+
+    async def resolve_users(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch many account users by ID concurrently, deduplicating and memoizing lookups.
+
+        Users that could not be fetched are left out of the result and their
+        errors kept in user_errors, which is reset on every call; authentication
+        errors are raised.
+        """
+        self.user_errors = {}
+        wanted = list(dict.fromkeys(user_id for user_id in user_ids if user_id))
+
+        async def fetch(user_id: str) -> None:
+            try:
+                self._user_memo[user_id] = await self.show_user(user_id)
+            except httpx.HTTPError as e:
+                response = getattr(e, "response", None)
+                if response is not None and response.status_code in (401, 403):
+                    raise
+                self.user_errors[user_id] = e
+
+        await asyncio.gather(*(fetch(user_id) for user_id in wanted if user_id not in self._user_memo))
+        return {user_id: self._user_memo[user_id] for user_id in wanted if user_id in self._user_memo}
+
+    async def update_user(self, user_id: str, name: Optional[str] = None) -> Dict[str, Any]:
+        """Update an account user in PagerTree."""
+        payload = {}
+        if name:
+            payload["user_attributes"] = {}
+            payload["user_attributes"]["name"] = name
+        payload = {k: v for k, v in payload.items() if v}
+        result = self._decode(await self._send("PUT", f"/account_users/{user_id}", json=payload))
+        self._user_memo.pop(user_id, None)
+        return result
+
+    async def delete_user(self, user_id: str) -> Dict[str, Any]:
+        """Delete a user in PagerTree."""
+        response = await self._send("DELETE", f"/account_users/{user_id}")
+        self._user_memo.pop(user_id, None)
+        return self._decode(response) if response.content else {"message": "User deleted successfully"}
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+def default_cache_dir() -> str:
+    """Return the directory used for PagerTree CLI caches and local state."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pagertree")
+
+class ResponseCache:
+    """Persistent cache of GET responses with TTL, conditional revalidation and LRU eviction."""
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = 60, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory or default_cache_dir()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        # One connection shared by all threads of the client; access is serialized by the lock
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(self.directory, "responses.db"),
+                                    check_same_thread=False, isolation_level=None, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+            "stored_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL, body BLOB NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Build a cache configured by PAGERTREE_CACHE_DIR, PAGERTREE_CACHE_TTL and PAGERTREE_CACHE_MAX_MB."""
+        return cls(
+            directory=os.getenv("PAGERTREE_CACHE_DIR") or None,
+            ttl=float(os.getenv("PAGERTREE_CACHE_TTL", "60")),
+            max_bytes=int(float(os.getenv("PAGERTREE_CACHE_MAX_MB", "50")) * 1024 * 1024),
+        )
+
+    @staticmethod
+    def make_key(api_key: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Derive a cache key from the API key, URL and query parameters."""
+        material = json.dumps([api_key, url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for key, flagged fresh if it is still within the TTL."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        body, etag, last_modified, stored_at = row
+        return {"body": body, "etag": etag, "last_modified": last_modified, "fresh": now - stored_at < self.ttl}
+
+    def store(self, key: str, url: str, body: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        """Store a response body and its validators, evicting least recently used entries if needed."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, etag, last_modified, stored_at, accessed_at, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, now, now, len(body), body),
+            )
+            self._evict()
+
+    def refresh(self, key: str) -> None:
+        """Restart the TTL of an entry after the server confirmed it is unchanged (304)."""
+        with self.lock:
+            self.conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+
+    def invalidate(self, collection: str) -> None:
+        """Drop every entry whose URL touches the given collection (e.g. "alerts").
+
+        The collection must be a whole path segment, so "teams" does not match
+        "/teams_archive"; GLOB is used because "_" is a wildcard for LIKE.
+        """
+        with self.lock:
+            self.conn.execute("DELETE FROM responses WHERE url GLOB ? OR url GLOB ? OR url GLOB ?",
+                              (f"*/{collection}", f"*/{collection}/*", f"*/{collection}[?]*"))
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+
+    def _evict(self) -> None:
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -0,0 +1,83 @@
+import click
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from agent import Agent, default_socket_path, request
+
+@click.group()
+def agent():
+    """Run a background agent that serves CLI commands over a Unix socket."""
+    pass
+
+def _socket_option(command):
+    return click.option("--socket", "socket_path", default=default_socket_path, show_default="~/.cache/pagertree/agent.sock",
+                        help="Unix socket path (or PAGERTREE_AGENT_SOCKET)")(command)
+
+def _cli_argv():
+    """Return the argv prefix that re-runs this CLI (script or frozen binary)."""
+    if getattr(sys, "frozen", False):
+        return [sys.executable]
+    return [sys.executable, os.path.abspath(sys.argv[0])]
+
+@agent.command(name="start")
+@_socket_option
+@click.option("--detach", is_flag=True, help="Start the agent in the background and return once it is listening")
+@click.pass_context
+def start_agent_cmd(ctx, socket_path, detach):
+    """Start the agent in the foreground (or in the background with --detach)."""
+    if not hasattr(socket, "AF_UNIX"):
+        click.echo("Error starting agent: Unix sockets are not supported on this platform", err=True)
+        return
+    if detach:
+        process = subprocess.Popen(_cli_argv() + ["agent", "start", "--socket", socket_path],
+                                   stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                   start_new_session=True)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and process.poll() is None:
+            try:
+                status = request("status", socket_path, timeout=1)
+            except (OSError, ValueError):
+                time.sleep(0.05)
+                continue
+            click.echo(f"Agent started (pid {status['pid']}) on {socket_path}")
+            return
+        click.echo("Error starting agent: it did not start listening; run `pagertree agent start` to see why", err=True)
+        return
+
+    # Build the client up front so the first command does not pay for it
+    session = ctx.obj
+    session.client
+    server = Agent(ctx.find_root().command, session, socket_path)
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+    click.echo(f"Agent listening on {socket_path} (pid {os.getpid()}); press Ctrl-C to stop", err=True)
+    try:
+        server.serve_forever()
+    except RuntimeError as e:
+        click.echo(f"Error starting agent: {e}", err=True)
+    except KeyboardInterrupt:
+        pass
+
+@agent.command(name="stop")
+@_socket_option
+def stop_agent_cmd(socket_path):
+    """Stop a running agent."""
+    try:
+        status = request("stop", socket_path)
+        click.echo(f"Stopped agent (pid {status['pid']}) after {status['requests']} requests")
+    except (OSError, ValueError):
+        click.echo(f"No agent is listening on {socket_path}")
+
+@agent.command(name="status")
+@_socket_option
+def status_agent_cmd(socket_path):
+    """Show whether an agent is running and how many requests it has served."""
+    try:
+        status = request("status", socket_path)
+    except (OSError, ValueError):
+        click.echo(f"No agent is listening on {socket_path}")
+        return
+    click.echo(f"Agent running (pid {status['pid']}) on {status['socket']}: "
+               f"up {status['uptime']}s, {status['requests']} requests, {status['active']} active")
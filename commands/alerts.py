@@ -1,6 +1,107 @@
 import click
-import json
-from utils import display_paginated_results, handle_api_error, format_item_details
+import csv
+import itertools
+import logging
+import threading
+import time
+import jsoncodec
+from utils import display_paginated_results, display_streamed_results, handle_api_error, format_item_details, format_api_error, row_builder
+
+def _run_alert_action(client, alert_id, alias, action, status=None):
+    """Run action on alert_id, or on the alert an alias resolves to.
+
+    Aliases are resolved through the local alias index first. If the indexed alert
+    rejects the action, the entry is dropped and the alias is looked up remotely once.
+    Returns (alert_id, result), or (None, None) after reporting why nothing ran.
+    """
+    import requests
+    from alias_index import STALE_ALIAS_STATUS_CODES
+    if not alert_id and not alias:
+        click.echo("Error: Either alert_id or alias must be provided.")
+        return None, None
+    if not alias:
+        return alert_id, action(alert_id)
+
+    alert_id = client.find_alert_id(alias, status=status)
+    if not alert_id:
+        click.echo(f"No alert found with alias: {alias}")
+        return None, None
+    try:
+        return alert_id, action(alert_id)
+    except requests.exceptions.HTTPError as e:
+        if client.alias_index is None or e.response is None or e.response.status_code not in STALE_ALIAS_STATUS_CODES:
+            raise
+        client.alias_index.forget(alert_id)
+        fresh_id = client.find_alert_id(alias, status=status, use_index=False)
+        if not fresh_id or fresh_id == alert_id:
+            raise
+        return fresh_id, action(fresh_id)
+
+def _bulk_filter_options(command):
+    """Add the filter options shared by the bulk lifecycle commands."""
+    options = [
+        click.option("--status", type=click.Choice(["open", "acknowledged", "resolved", "dropped"]), help="Act on every alert with this status"),
+        click.option("--search", help="Act on every alert matching this search"),
+        click.option("--alias-prefix", help="Act on every alert whose alias starts with this prefix"),
+        click.option("--dry-run", is_flag=True, help="Only count the alerts a filter matches"),
+        click.option("--parallel", default=8, type=click.IntRange(1, 64), help="Number of alerts acted on in parallel"),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+def _check_single_target(ctx, alert_id, alias=None):
+    """Reject bulk filter options combined with an alert_id or --alias, which would otherwise be ignored."""
+    if not (alert_id or alias):
+        return
+    bulk = [f"--{name.replace('_', '-')}" for name in ("status", "search", "alias_prefix", "dry_run", "parallel")
+            if ctx.get_parameter_source(name) != click.core.ParameterSource.DEFAULT]
+    if bulk:
+        target = "an alert_id" if alert_id else "--alias"
+        raise click.UsageError(f"{', '.join(bulk)} cannot be combined with {target}; they only apply to bulk actions.")
+
+def _run_bulk_alert_action(client, action, verb, status, search, alias_prefix, dry_run, parallel, confirm=False):
+    """Apply action to every alert matching the filters and print a summary.
+
+    Matching IDs are collected before any action runs: acting while paging would
+    shift offsets of a status-filtered listing and skip alerts.
+    """
+    from concurrency import bounded_map
+    alert_ids = [
+        alert["id"]
+        for alert in client.iter_records(client.list_alerts, status=status, search=search, concurrency=4)
+        if not alias_prefix or (alert.get("thirdparty_id") or "").startswith(alias_prefix)
+    ]
+    if dry_run:
+        click.echo(f"Would {verb} {len(alert_ids)} alerts")
+        return
+    if not alert_ids:
+        click.echo("No alerts matched the given filters")
+        return
+    if confirm and not click.confirm(f"Are you sure you want to {verb} {len(alert_ids)} alerts?"):
+        click.echo("Bulk action cancelled.")
+        return
+
+    def apply(alert_id):
+        try:
+            action(alert_id)
+            return alert_id, None
+        except Exception as e:
+            return alert_id, format_api_error(e)
+
+    succeeded = failed = 0
+    for alert_id, error in bounded_map(apply, alert_ids, workers=parallel, ordered=False):
+        if error:
+            failed += 1
+            click.echo(f"Error: could not {verb} alert {alert_id}: {error}", err=True)
+        else:
+            succeeded += 1
+    click.echo(f"{verb.capitalize()}: {succeeded} succeeded, {failed} failed (of {len(alert_ids)} matched)")
+
+def _prefetched(pages):
+    """Fetch the first page of a page iterator immediately and return an equivalent iterator."""
+    first_page = next(pages)
+    return itertools.chain([first_page], pages)
 
 @click.group()
 def alerts():
@@ -8,15 +109,29 @@ def alerts():
     pass
 
 @alerts.command(name="create")
-@click.option("--title", required=True, help="Title of the alert")
+@click.option("--title", help="Title of the alert (required unless --from-file is used)")
 @click.option("--description", help="Description of the alert")
 @click.option("--team-id", "team_ids", multiple=True, help="Team IDs to route the alert to")
 @click.option("--urgency", type=click.Choice(["silent", "low", "medium", "high", "critical"]), default="medium", help="Priority of the alert")
 @click.option("--tags", multiple=True, help="Tags for the alert")
 @click.option("--alias", help="Alias for the alert")
+@click.option("--on-duplicate", type=click.Choice(["create", "skip", "comment"]), default="create", envvar="PAGERTREE_ON_DUPLICATE",
+              help="What to do when the alias was seen on a live alert within --dedupe-window: create anyway, skip, or comment on it")
+@click.option("--dedupe-window", default=600.0, type=click.FloatRange(0), help="Seconds an alias seen on a live alert counts as a duplicate")
+@click.option("--from-file", type=click.File("r"), help="Create one alert per record of an NDJSON or CSV file ('-' for stdin)")
+@click.option("--file-format", type=click.Choice(["ndjson", "csv"]), help="Format of --from-file (default: detected from the file extension)")
+@click.option("--workers", default=8, type=click.IntRange(1, 64), help="Number of alerts created in parallel with --from-file")
+@click.option("--results", type=click.File("w"), default="-", help="Where to write per-record NDJSON results with --from-file")
 @click.pass_context
-def create_alert_cmd(ctx, title, description, team_ids, urgency, tags, alias):
+def create_alert_cmd(ctx, title, description, team_ids, urgency, tags, alias, on_duplicate, dedupe_window,
+                     from_file, file_format, workers, results):
     """Create a new alert in PagerTree."""
+    dedupe = {"on_duplicate": on_duplicate, "dedupe_window": dedupe_window}
+    if from_file:
+        _create_alerts_from_file(ctx.obj.client, from_file, file_format, workers, results, dedupe)
+        return
+    if not title:
+        raise click.UsageError("Missing option '--title'.")
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
         result = client.create_alert(
@@ -25,36 +140,314 @@ def create_alert_cmd(ctx, title, description, team_ids, urgency, tags, alias):
             team_ids=list(team_ids),
             urgency=urgency,
             tags=list(tags),
-            alias=alias
+            alias=alias,
+            **dedupe
         )
-        click.echo(f"Alert created successfully: {result.get('id')}")
+        if result.get("deduplicated") == "skip":
+            click.echo(f"Alert already open for alias {alias}: {result.get('id')} (skipped)")
+        elif result.get("deduplicated") == "comment":
+            click.echo(f"Alert already open for alias {alias}: {result.get('id')} (comment added)")
+        else:
+            click.echo(f"Alert created successfully: {result.get('id')}")
     except Exception as e:
         handle_api_error(e, action="creating alert")
 
+# Record keys accepted by alerts create --from-file, mapped to create_alert arguments
+ALERT_RECORD_FIELDS = {
+    "title": "title",
+    "description": "description",
+    "team_ids": "team_ids",
+    "destination_team_ids": "team_ids",
+    "destination_router_ids": "destination_router_ids",
+    "destination_account_user_ids": "destination_account_user_ids",
+    "urgency": "urgency",
+    "tags": "tags",
+    "alias": "alias",
+    "thirdparty_id": "alias",
+    "incident": "incident",
+    "incident_severity": "incident_severity",
+    "incident_message": "incident_message"
+}
+ALERT_LIST_FIELDS = ("team_ids", "destination_router_ids", "destination_account_user_ids", "tags")
+
+def _read_alert_records(source, file_format):
+    """Yield (line_number, record) pairs; records that fail to parse are yielded as exceptions."""
+    if file_format == "csv":
+        reader = csv.DictReader(source)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, ValueError("row has more cells than the header")
+            else:
+                yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, jsoncodec.loads(line)
+            except ValueError as e:
+                yield line_number, e
+
+def _alert_kwargs(record):
+    """Translate a bulk-create record into create_alert keyword arguments."""
+    if not isinstance(record, dict):
+        raise ValueError("record must be a JSON object")
+    kwargs = {}
+    for key, value in record.items():
+        if key not in ALERT_RECORD_FIELDS:
+            raise ValueError(f"unknown field: {key}")
+        if value is None or value == "":
+            continue
+        name = ALERT_RECORD_FIELDS[key]
+        if name in ALERT_LIST_FIELDS and isinstance(value, str):
+            # CSV cells carry lists as semicolon-separated values
+            value = [item.strip() for item in value.split(";") if item.strip()]
+        elif name == "incident" and isinstance(value, str):
+            value = value.lower() in ("true", "1", "t", "yes")
+        kwargs[name] = value
+    if not kwargs.get("title"):
+        raise ValueError("missing field: title")
+    return kwargs
+
+def _create_alerts_from_file(client, source, file_format, workers, results, dedupe):
+    """Create alerts for every record of source on a bounded worker pool, writing NDJSON results."""
+    from concurrency import bounded_map
+    file_format = file_format or ("csv" if getattr(source, "name", "").lower().endswith(".csv") else "ndjson")
+
+    def create(entry):
+        line_number, record = entry
+        try:
+            if isinstance(record, Exception):
+                raise record
+            kwargs = _alert_kwargs(record)
+            result = client.create_alert(**kwargs, **dedupe)
+            outcome = {"line": line_number, "id": result.get("id"), "alias": kwargs.get("alias")}
+            if result.get("deduplicated"):
+                outcome["deduplicated"] = result["deduplicated"]
+            return outcome
+        except Exception as e:
+            return {"line": line_number, "error": format_api_error(e)}
+
+    created = deduplicated = failed = 0
+    started = time.monotonic()
+    for outcome in bounded_map(create, _read_alert_records(source, file_format), workers=workers, ordered=False):
+        if "error" in outcome:
+            failed += 1
+        elif "deduplicated" in outcome:
+            deduplicated += 1
+        else:
+            created += 1
+        results.write(jsoncodec.dumps(outcome) + "\n")
+        results.flush()
+    elapsed = time.monotonic() - started
+    rate = (created + deduplicated + failed) / elapsed if elapsed > 0 else 0.0
+    click.echo(f"Created {created} alerts, {deduplicated} duplicates, {failed} failed in {elapsed:.2f}s ({rate:.1f} records/s)", err=True)
+
+@alerts.command(name="emit")
+@click.option("--from-file", type=click.File("r"), default="-", help="NDJSON or CSV file of events, one alert record per line (default: stdin)")
+@click.option("--file-format", type=click.Choice(["ndjson", "csv"]), help="Format of --from-file (default: detected from the file extension)")
+@click.option("--window", default=1.0, type=click.FloatRange(0.01), help="Seconds events are buffered and merged before a flush")
+@click.option("--max-events", default=10000, type=click.IntRange(1), help="Flush early once this many events are buffered")
+@click.option("--workers", default=8, type=click.IntRange(1, 64), help="Number of merged alerts created in parallel")
+@click.option("--on-duplicate", type=click.Choice(["create", "skip", "comment"]), default="skip",
+              help="What to do when an alias is still open from an earlier window")
+@click.option("--dedupe-window", default=600.0, type=click.FloatRange(0), help="Seconds an alias seen on a live alert counts as a duplicate")
+@click.option("--results", type=click.File("w"), default="-", help="Where to write per-alert NDJSON results")
+@click.pass_context
+def emit_alerts_cmd(ctx, from_file, file_format, window, max_events, workers, on_duplicate, dedupe_window, results):
+    """Coalesce a stream of alert events into one alert per alias or title."""
+    from emitter import AlertEmitter
+    client = ctx.obj.client  # Get PagerTreeClient from context
+    file_format = file_format or ("csv" if getattr(from_file, "name", "").lower().endswith(".csv") else "ndjson")
+    write_lock = threading.Lock()
+
+    def write(outcomes):
+        with write_lock:
+            for outcome in outcomes:
+                results.write(jsoncodec.dumps(outcome) + "\n")
+            results.flush()
+
+    started = time.monotonic()
+    emitter = AlertEmitter(client, window=window, max_events=max_events, workers=workers, on_duplicate=on_duplicate,
+                           dedupe_window=dedupe_window, on_flush=write)
+    invalid = 0
+    with emitter:
+        for line_number, record in _read_alert_records(from_file, file_format):
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                emitter.emit(**_alert_kwargs(record))
+            except Exception as e:
+                invalid += 1
+                write([{"line": line_number, "error": format_api_error(e)}])
+    stats = emitter.stats
+    elapsed = time.monotonic() - started
+    click.echo(f"Received {stats['events']} events ({invalid} invalid) in {elapsed:.2f}s; {stats['flushes']} flushes sent "
+               f"{stats['alerts']} alerts: {stats['created']} created, {stats['deduplicated']} duplicates, "
+               f"{stats['failed']} failed", err=True)
+
 @alerts.command(name="list")
 @click.option("--limit", default=10, type=click.IntRange(1, 100), help="Number of alerts per page")
 @click.option("--offset", default=0, type=click.IntRange(0), help="Starting point for pagination")
 @click.option("--status", type=click.Choice(["open", "acknowledged", "resolved", "dropped"]), help="Filter alerts by status")
 @click.option("--search", help="Search for alerts by title, tags, source, or destinations")
+@click.option("--all", "fetch_all", is_flag=True, help="Stream every page of alerts starting at --offset")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel with --all")
 @click.pass_context
-def list_alerts_cmd(ctx, limit, offset, status, search):
+def list_alerts_cmd(ctx, limit, offset, status, search, fetch_all, concurrency):
     """List alerts in PagerTree with pagination."""
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
         logger = ctx.obj.logger  # Get logger from context
-        logger.debug(f"Listing alerts with limit={limit}, offset={offset}, status={status}, search={search}")
+        headers = ["ID", "Title", "Status"]
+        alert_row = row_builder(["id", "title", "status"])
+        if fetch_all:
+            logger.debug("Streaming all alerts from offset=%s, status=%s, search=%s", offset, status, search)
+            pages = client.iter_pages(client.list_alerts, offset=offset, concurrency=concurrency, status=status, search=search)
+            display_streamed_results(pages, "alert", headers, alert_row, output=ctx.obj.output)
+            return
+        logger.debug("Listing alerts with limit=%s, offset=%s, status=%s, search=%s", limit, offset, status, search)
         result = client.list_alerts(limit=limit, offset=offset, status=status, search=search)
-        logger.debug(f"Full response: {json.dumps(result, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Only serialize the response when verbose output will show it
+            logger.debug("Full response: %s", jsoncodec.dumps(result, indent=True))
         alerts_list = result["data"]
         total = result["total"]
         # Prepare table data
-        headers = ["ID", "Title", "Status"]
-        table_data = [[alert.get("id"), alert.get("title"), alert.get("status")] for alert in alerts_list]
-        display_paginated_results(alerts_list, total, limit, offset, "alert", headers, table_data)
+        table_data = [alert_row(alert) for alert in alerts_list]
+        display_paginated_results(alerts_list, total, limit, offset, "alert", headers, table_data, output=ctx.obj.output)
     except Exception as e:
         logger.error(f"Error listing alerts: {str(e)}")
         handle_api_error(e, action="listing alerts")
 
+@alerts.command(name="watch")
+@click.option("--status", type=click.Choice(["open", "acknowledged", "resolved", "dropped"]), help="Filter alerts by status")
+@click.option("--search", help="Search for alerts by title, tags, source, or destinations")
+@click.option("--interval", default=5.0, type=click.FloatRange(0.5), help="Shortest time between polls in seconds")
+@click.option("--max-interval", default=60.0, type=click.FloatRange(0.5), help="Longest time between polls when nothing changes")
+@click.option("--depth", default=1, type=click.IntRange(1, 50), help="Number of 100-alert pages checked on each poll")
+@click.option("--existing", is_flag=True, help="Print the alerts that already match before watching for changes")
+@click.option("--max-polls", default=0, type=click.IntRange(0), help="Stop after this many polls (0 watches until interrupted)")
+@click.pass_context
+def watch_alerts_cmd(ctx, status, search, interval, max_interval, depth, existing, max_polls):
+    """Stream new and changed alerts as they happen."""
+    from watch import AlertWatcher
+    client = ctx.obj.client  # Get PagerTreeClient from context
+    logger = ctx.obj.logger  # Get logger from context
+    headers = ["Change", "ID", "Title", "Status", "Updated At"]
+    alert_row = row_builder(["id", "title", "status", "updated_at"])
+    writer = None
+    if ctx.obj.output != "table":
+        from output import RecordWriter
+        writer = RecordWriter(ctx.obj.output, headers)
+    else:
+        from tabulate import tabulate
+
+    watcher = AlertWatcher(client, status=status, search=search, min_interval=interval,
+                           max_interval=max_interval, depth=depth)
+    logger.debug("Watching alerts with status=%s, search=%s, interval=%s-%ss, depth=%s", status, search, interval, max_interval, depth)
+    emitted = 0
+    try:
+        for changes in watcher.watch(include_existing=existing, max_polls=max_polls,
+                                     on_error=lambda e: handle_api_error(e, "watching alerts")):
+            if changes:
+                rows = [[change] + alert_row(alert) for change, alert in changes]
+                if writer is not None:
+                    writer.write_many([dict(alert, change=change) for change, alert in changes], rows)
+                else:
+                    # Header once, then rows as each poll finds them
+                    click.echo(tabulate(rows, headers=headers if emitted == 0 else (), tablefmt="simple" if emitted == 0 else "plain"))
+                emitted += len(changes)
+            logger.debug("Poll %d: %d changes, next poll in %.1fs", watcher.polls, len(changes), watcher.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if writer is not None:
+            writer.close()
+    click.echo(f"Watched {watcher.polls} polls, {emitted} alerts changed", err=True)
+
+@alerts.command(name="stats")
+@click.option("--status", type=click.Choice(["open", "acknowledged", "resolved", "dropped"]), help="Filter alerts by status")
+@click.option("--search", help="Search for alerts by title, tags, source, or destinations")
+@click.option("--team-id", help="Only include alerts for this team")
+@click.option("--since", type=click.DateTime(), help="Only include alerts created at or after this time (UTC)")
+@click.option("--until", type=click.DateTime(), help="Only include alerts created before this time (UTC)")
+@click.option("--bucket", default="day", type=click.Choice(["hour", "day", "week"]), help="Histogram bucket width")
+@click.option("--group-by", default="urgency", type=click.Choice(["urgency", "status", "team"]), help="Break MTTA/MTTR down by this field")
+@click.option("--acknowledged-field", default="acknowledged_at", show_default=True, help="Alert field holding the acknowledgement time")
+@click.option("--resolved-field", default="resolved_at", show_default=True, help="Alert field holding the resolution time")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel")
+@click.pass_context
+def stats_alerts_cmd(ctx, status, search, team_id, since, until, bucket, group_by, acknowledged_field, resolved_field, concurrency):
+    """Show MTTA, MTTR, alert volume by urgency/status/team and a histogram over time."""
+    from datetime import timezone
+    from stats import AlertStats, DIMENSIONS, PERCENTILES, format_duration
+    if team_id and search:
+        raise click.UsageError("--search cannot be combined with --team-id; team alerts can only be filtered by --status.")
+    client = ctx.obj.client  # Get PagerTreeClient from context
+    logger = ctx.obj.logger  # Get logger from context
+    stats = AlertStats(bucket=bucket, acknowledged_field=acknowledged_field, resolved_field=resolved_field,
+                       since=since.replace(tzinfo=timezone.utc).timestamp() if since else None,
+                       until=until.replace(tzinfo=timezone.utc).timestamp() if until else None)
+    try:
+        if team_id:
+            logger.debug("Collecting stats for team %s with status=%s", team_id, status)
+            pages = client.iter_pages(client.get_team_alerts, team_id, concurrency=concurrency)
+        else:
+            logger.debug("Collecting stats with status=%s, search=%s", status, search)
+            pages = client.iter_pages(client.list_alerts, concurrency=concurrency, status=status, search=search)
+        for page in pages:
+            # The team alerts endpoint takes no filters, so the status is applied here
+            stats.add([alert for alert in page["data"] if alert.get("status") == status] if team_id and status else page["data"])
+    except Exception as e:
+        handle_api_error(e, "collecting alert stats")
+        return
+
+    summary = stats.summary(group_by)
+    output = ctx.obj.output
+    if output != "table":
+        from output import RecordWriter
+        if output == "json":
+            writer = RecordWriter(output, single=True)
+            writer.write(summary)
+            writer.close()
+            return
+        headers = ["Section", "Key", "Count", "Mean", "P50", "P90", "P99"]
+        writer = RecordWriter(output, headers)
+        for metric in ("mtta", "mttr"):
+            for row in summary[metric]:
+                item = {"section": metric, "key": row["group"], "count": row["count"],
+                        **{name: row.get(name) for name in ["mean"] + [f"p{pct}" for pct in PERCENTILES]}}
+                writer.write(item, list(item.values()))
+        for dimension in DIMENSIONS:
+            for key, count in summary["counts"][dimension].items():
+                item = {"section": dimension, "key": key, "count": count}
+                writer.write(item, list(item.values()) + [None] * 4)
+        for key, count in summary["histogram"]["counts"].items():
+            item = {"section": bucket, "key": key, "count": count}
+            writer.write(item, list(item.values()) + [None] * 4)
+        writer.close()
+        return
+
+    from tabulate import tabulate
+    if not len(stats):
+        click.echo("No alerts matched.")
+        return
+    click.echo(f"{summary['alerts']} alerts created {summary['first_created_at']} to {summary['last_created_at']}")
+    duration_rows = [[metric.upper(), row["group"], row["count"]]
+                     + [format_duration(row.get(name)) for name in ["mean"] + [f"p{pct}" for pct in PERCENTILES]]
+                     for metric in ("mtta", "mttr") for row in summary[metric]]
+    click.echo()
+    click.echo(tabulate(duration_rows, headers=["Metric", group_by.capitalize(), "Alerts", "Mean", "P50", "P90", "P99"], tablefmt="simple"))
+    for dimension in DIMENSIONS:
+        click.echo()
+        click.echo(tabulate(list(summary["counts"][dimension].items()), headers=[dimension.capitalize(), "Alerts"], tablefmt="simple"))
+    peak = max(summary["histogram"]["counts"].values())
+    histogram_rows = [[key, count, "#" * max(1 if count else 0, round(40 * count / peak))]
+                      for key, count in summary["histogram"]["counts"].items()]
+    click.echo()
+    click.echo(tabulate(histogram_rows, headers=[f"{bucket.capitalize()} (UTC)", "Alerts", ""], tablefmt="simple"))
+
 @alerts.command(name="show")
 @click.argument("alert_id", required=True)
 @click.pass_context
@@ -76,16 +469,27 @@ def show_alert_cmd(ctx, alert_id):
             "description": "Description",
             "created_at": "Created At"
         }
-        format_item_details(alert, fields)
+        format_item_details(alert, fields, output=ctx.obj.output)
     except Exception as e:
         handle_api_error(e, "showing alert")
 
 @alerts.command(name="delete")
-@click.argument("alert_id", required=True)
+@click.argument("alert_id", required=False)
 @click.option("--force", is_flag=True, help="Delete the alert without confirmation")
+@_bulk_filter_options
 @click.pass_context
-def delete_alert_cmd(ctx, alert_id, force):
-    """Delete an alert in PagerTree."""
+def delete_alert_cmd(ctx, alert_id, force, status, search, alias_prefix, dry_run, parallel):
+    """Delete an alert, or every alert matching a filter, in PagerTree."""
+    _check_single_target(ctx, alert_id)
+    if not alert_id:
+        if not (status or search or alias_prefix):
+            raise click.UsageError("Provide an alert_id or at least one of --status, --search or --alias-prefix.")
+        try:
+            client = ctx.obj.client  # Get PagerTreeClient from context
+            _run_bulk_alert_action(client, client.delete_alert, "delete", status, search, alias_prefix, dry_run, parallel, confirm=not force)
+        except Exception as e:
+            handle_api_error(e, action="deleting alerts")
+        return
     if not force and not click.confirm(f"Are you sure you want to delete alert {alert_id}?"):
         click.echo("Deletion cancelled.")
         return
@@ -99,96 +503,63 @@ def delete_alert_cmd(ctx, alert_id, force):
 @alerts.command(name="acknowledge")
 @click.argument("alert_id", required=False)  # Make alert_id optional
 @click.option("--alias", help="Alias for the alert")
+@_bulk_filter_options
 @click.pass_context
-def acknowledge_alert_cmd(ctx, alert_id, alias):
-    """Acknowledge an alert in PagerTree."""
+def acknowledge_alert_cmd(ctx, alert_id, alias, status, search, alias_prefix, dry_run, parallel):
+    """Acknowledge an alert, or every alert matching a filter, in PagerTree."""
+    _check_single_target(ctx, alert_id, alias)
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
 
-        # Ensure at least one of alert_id or alias is provided
-        if not alert_id and not alias:
-            click.echo("Error: Either alert_id or alias must be provided.")
+        if not alert_id and not alias and (status or search or alias_prefix):
+            _run_bulk_alert_action(client, client.acknowledge_alert, "acknowledge", status, search, alias_prefix, dry_run, parallel)
             return
 
-        # If alias is provided, resolve it to alert_id
-        if alias:
-            alias_result = client.list_alerts(alias=alias, limit=1, offset=0)
-            if alias_result["total"] == 0:
-                click.echo(f"No alert found with alias: {alias}")
-                return
-            alert_id = alias_result["data"][0]["id"]
-
-        # If alert_id is still not set, raise an error
-        if not alert_id:
-            click.echo("Error: Could not resolve alert_id.")
-            return
-
-        result = client.acknowledge_alert(alert_id)
-        click.echo(f"Alert acknowledged successfully: {result.get('id')}")
+        alert_id, result = _run_alert_action(client, alert_id, alias, client.acknowledge_alert)
+        if alert_id:
+            click.echo(f"Alert acknowledged successfully: {result.get('id')}")
     except Exception as e:
         handle_api_error(e, action="acknowledging alert")
 
 @alerts.command(name="reject")
 @click.argument("alert_id", required=False)  # Make alert_id optional
 @click.option("--alias", help="Alias for the alert")
+@_bulk_filter_options
 @click.pass_context
-def reject_alert_cmd(ctx, alert_id, alias):
-    """Reject an alert in PagerTree."""
+def reject_alert_cmd(ctx, alert_id, alias, status, search, alias_prefix, dry_run, parallel):
+    """Reject an alert, or every alert matching a filter, in PagerTree."""
+    _check_single_target(ctx, alert_id, alias)
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
 
-        # Ensure at least one of alert_id or alias is provided
-        if not alert_id and not alias:
-            click.echo("Error: Either alert_id or alias must be provided.")
+        if not alert_id and not alias and (status or search or alias_prefix):
+            _run_bulk_alert_action(client, client.reject_alert, "reject", status, search, alias_prefix, dry_run, parallel)
             return
 
-        # If alias is provided, resolve it to alert_id
-        if alias:
-            alias_result = client.list_alerts(alias=alias, limit=1, offset=0, status="open")
-            if alias_result["total"] == 0:
-                click.echo(f"No alert found with alias: {alias}")
-                return
-            alert_id = alias_result["data"][0]["id"]
-
-        # If alert_id is still not set, raise an error
-        if not alert_id:
-            click.echo("Error: Could not resolve alert_id.")
-            return
-
-        result = client.reject_alert(alert_id)
-        click.echo(f"Alert rejected successfully: {result.get('id')}")
+        alert_id, result = _run_alert_action(client, alert_id, alias, client.reject_alert, status="open")
+        if alert_id:
+            click.echo(f"Alert rejected successfully: {result.get('id')}")
     except Exception as e:
         handle_api_error(e, action="rejecting alert")
 
 @alerts.command(name="resolve")
 @click.argument("alert_id", required=False)  # Make alert_id optional
 @click.option("--alias", help="Alias for the alert")
+@_bulk_filter_options
 @click.pass_context
-def resolve_alert_cmd(ctx, alert_id, alias):
-    """Resolve an alert in PagerTree."""
+def resolve_alert_cmd(ctx, alert_id, alias, status, search, alias_prefix, dry_run, parallel):
+    """Resolve an alert, or every alert matching a filter, in PagerTree."""
+    _check_single_target(ctx, alert_id, alias)
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
 
-        # Ensure at least one of alert_id or alias is provided
-        if not alert_id and not alias:
-            click.echo("Error: Either alert_id or alias must be provided.")
+        if not alert_id and not alias and (status or search or alias_prefix):
+            _run_bulk_alert_action(client, client.resolve_alert, "resolve", status, search, alias_prefix, dry_run, parallel)
             return
 
-        # If alias is provided, resolve it to alert_id
-        if alias:
-            alias_result = client.list_alerts(alias=alias, limit=1, offset=0)
-            if alias_result["total"] == 0:
-                click.echo(f"No alert found with alias: {alias}")
-                return
-            alert_id = alias_result["data"][0]["id"]
-
-        # If alert_id is still not set, raise an error
-        if not alert_id:
-            click.echo("Error: Could not resolve alert_id.")
-            return
-
-        result = client.resolve_alert(alert_id)
-        click.echo(f"Alert resolved successfully: {result.get('id')}")
+        alert_id, result = _run_alert_action(client, alert_id, alias, client.resolve_alert)
+        if alert_id:
+            click.echo(f"Alert resolved successfully: {result.get('id')}")
     except Exception as e:
         handle_api_error(e, action="resolving alert")
 
@@ -197,37 +568,32 @@ def resolve_alert_cmd(ctx, alert_id, alias):
 @click.option("--alias", help="Alias for the alert")
 @click.option("--limit", default=10, type=click.IntRange(1, 100), help="Number of alerts per page")
 @click.option("--offset", default=0, type=click.IntRange(0), help="Starting point for pagination")
+@click.option("--all", "fetch_all", is_flag=True, help="Stream every page of comments starting at --offset")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel with --all")
 @click.pass_context
-def list_alert_comment_cmd(ctx, alert_id, alias, limit, offset):
+def list_alert_comment_cmd(ctx, alert_id, alias, limit, offset, fetch_all, concurrency):
     """List an alert's comments in PagerTree."""
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
 
-        # Ensure at least one of alert_id or alias is provided
-        if not alert_id and not alias:
-            click.echo("Error: Either alert_id or alias must be provided.")
+        headers = ["Created At", "Commentor", "Comment"]
+        comment_row = row_builder(["created_at", "created_by_name", "body"])
+        if fetch_all:
+            # Fetch the first page eagerly so a stale alias surfaces before streaming starts
+            alert_id, pages = _run_alert_action(client, alert_id, alias, lambda target_id: _prefetched(
+                client.iter_pages(client.list_alert_comments, target_id, offset=offset, concurrency=concurrency)))
+            if alert_id:
+                display_streamed_results(pages, "comment", headers, comment_row, output=ctx.obj.output)
             return
 
-        # If alias is provided, resolve it to alert_id
-        if alias:
-            alias_result = client.list_alerts(alias=alias, limit=1, offset=0)
-            if alias_result["total"] == 0:
-                click.echo(f"No alert found with alias: {alias}")
-                return
-            alert_id = alias_result["data"][0]["id"]
-
-        # If alert_id is still not set, raise an error
+        alert_id, result = _run_alert_action(client, alert_id, alias, lambda target_id: client.list_alert_comments(target_id, limit=limit, offset=offset))
         if not alert_id:
-            click.echo("Error: Could not resolve alert_id.")
             return
-
-        result = client.list_alert_comments(alert_id, limit=limit, offset=offset)
         comments_list = result["data"]
         total = result["total"]
         # Prepare table data
-        headers = ["Created At", "Commentor", "Comment"]
-        table_data = [[comment.get("created_at"), comment.get("created_by_name"), comment.get("body")] for comment in comments_list]
-        display_paginated_results(comments_list, total, limit, offset, "comment", headers, table_data)
+        table_data = [comment_row(comment) for comment in comments_list]
+        display_paginated_results(comments_list, total, limit, offset, "comment", headers, table_data, output=ctx.obj.output)
     except Exception as e:
         handle_api_error(e, action="listing alert comments")
 
@@ -241,26 +607,9 @@ def create_alert_comment_cmd(ctx, alert_id, alias, comment):
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
 
-        # Ensure at least one of alert_id or alias is provided
-        if not alert_id and not alias:
-            click.echo("Error: Either alert_id or alias must be provided.")
-            return
-
-        # If alias is provided, resolve it to alert_id
-        if alias:
-            alias_result = client.list_alerts(alias=alias, limit=1, offset=0)
-            if alias_result["total"] == 0:
-                click.echo(f"No alert found with alias: {alias}")
-                return
-            alert_id = alias_result["data"][0]["id"]
-
-        # If alert_id is still not set, raise an error
-        if not alert_id:
-            click.echo("Error: Could not resolve alert_id.")
-            return
-
-        result = client.create_alert_comment(alert_id, comment)
-        click.echo(f"Comment added successfully to alert {alert_id}")
+        alert_id, result = _run_alert_action(client, alert_id, alias, lambda target_id: client.create_alert_comment(target_id, comment))
+        if alert_id:
+            click.echo(f"Comment added successfully to alert {alert_id}")
     except Exception as e:
         handle_api_error(e, action="adding comment to alert")
 
@@ -1,5 +1,5 @@
 import click
-from utils import display_paginated_results, handle_api_error, format_item_details
+from utils import display_paginated_results, display_streamed_results, handle_api_error, format_item_details, row_builder
 from datetime import datetime
 
 @click.group()
@@ -32,26 +32,25 @@ def create_broadcast_cmd(
 @broadcasts.command(name="list")
 @click.option("--limit", default=10, type=click.IntRange(1, 100), help="Number of broadcasts per page")
 @click.option("--offset", default=0, type=click.IntRange(0), help="Starting point for pagination")
+@click.option("--all", "fetch_all", is_flag=True, help="Stream every page of broadcasts starting at --offset")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel with --all")
 @click.pass_context
-def list_broadcasts_cmd(ctx, limit, offset):
+def list_broadcasts_cmd(ctx, limit, offset, fetch_all, concurrency):
     """List broadcasts in PagerTree with pagination."""
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
+        headers = ["ID", "Title", "Status", "Created At"]
+        broadcast_row = row_builder(["id", "title", "status", "created_at"], default="N/A")
+        if fetch_all:
+            pages = client.iter_pages(client.list_broadcasts, offset=offset, concurrency=concurrency)
+            display_streamed_results(pages, "broadcast", headers, broadcast_row, output=ctx.obj.output)
+            return
         result = client.list_broadcasts(limit=limit, offset=offset)
         broadcasts_list = result["data"]
         total = result["total"]
         # Prepare table data
-        headers = ["ID", "Title", "Status", "Created At"]
-        table_data = [
-            [
-                broadcast.get("id", "N/A"),
-                broadcast.get("title", "N/A"),
-                broadcast.get("status", "N/A"),
-                broadcast.get("created_at", "N/A")
-            ]
-            for broadcast in broadcasts_list
-        ]
-        display_paginated_results(broadcasts_list, total, limit, offset, "broadcast", headers, table_data)
+        table_data = [broadcast_row(broadcast) for broadcast in broadcasts_list]
+        display_paginated_results(broadcasts_list, total, limit, offset, "broadcast", headers, table_data, output=ctx.obj.output)
     except Exception as e:
         handle_api_error(e, action="listing broadcasts")
 
@@ -75,7 +74,7 @@ def show_broadcast_cmd(ctx, broadcast_id):
             "description": broadcast.get("description", "N/A"),
             "status": broadcast.get("status", "N/A")
         }
-        format_item_details(formatted_broadcast, fields)
+        format_item_details(formatted_broadcast, fields, output=ctx.obj.output, raw=broadcast)
     except Exception as e:
         handle_api_error(e, action="showing broadcast")
 
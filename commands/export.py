@@ -0,0 +1,58 @@
+import click
+import sys
+from utils import handle_api_error
+
+RESOURCE_NAMES = ("alerts", "comments", "users", "teams", "integrations", "broadcasts")
+
+def _megabytes(size):
+    return size / (1024 * 1024)
+
+@click.command()
+@click.argument("directory", type=click.Path(file_okay=False))
+@click.option("--resource", "resources", multiple=True, type=click.Choice(RESOURCE_NAMES),
+              help="Resource to export (repeatable; default alerts and comments)")
+@click.option("--format", "file_format", default="ndjson", type=click.Choice(["ndjson", "csv", "tsv"]), help="File format")
+@click.option("--no-compress", is_flag=True, help="Write plain files instead of gzip")
+@click.option("--chunk-size", default=50000, type=click.IntRange(1), help="Records per file before starting a new chunk")
+@click.option("--status", type=click.Choice(["open", "acknowledged", "resolved", "dropped"]), help="Only export alerts (and their comments) with this status")
+@click.option("--search", help="Only export alerts (and their comments) matching this search")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel")
+@click.option("--restart", is_flag=True, help="Ignore any saved progress and start over")
+@click.pass_context
+def export(ctx, directory, resources, file_format, no_compress, chunk_size, status, search, concurrency, restart):
+    """Export resources to chunked, compressed files that can resume after a failure."""
+    from export import Exporter, ExportStateMismatch
+    client = ctx.obj.client  # Get PagerTreeClient from context
+
+    def report(resource, progress):
+        if not sys.stderr.isatty():
+            return
+        click.echo(f"\r{resource}: {progress['records']} records, {_megabytes(progress['bytes']):.1f} MB written",
+                   nl=False, err=True)
+
+    try:
+        exporter = Exporter(client, directory, file_format=file_format, compress=not no_compress,
+                            chunk_records=chunk_size, concurrency=concurrency,
+                            filters={"status": status, "search": search}, restart=restart, progress=report)
+    except ExportStateMismatch as e:
+        click.echo(f"Error: {e}", err=True)
+        return
+
+    for resource in resources or ("alerts", "comments"):
+        progress = exporter.state["resources"].get(resource)
+        if progress and not progress["done"]:
+            click.echo(f"Resuming {resource} at offset {progress['offset']}", err=True)
+        try:
+            progress = exporter.export(resource)
+        except Exception as e:
+            click.echo(err=True)
+            handle_api_error(e, f"exporting {resource}")
+            click.echo(f"Progress saved; run the same command again to resume {resource}.", err=True)
+            return
+        seconds = progress["seconds"]
+        rate = progress["records"] / seconds if seconds > 0 else 0.0
+        ratio = progress["raw_bytes"] / progress["bytes"] if progress["bytes"] else 1.0
+        click.echo(err=True)
+        click.echo(f"{resource}: {progress['records']} records in {progress['chunk'] + (1 if progress['chunk_records'] else 0)} file(s), "
+                   f"{_megabytes(progress['bytes']):.2f} MB written ({ratio:.1f}x compression) "
+                   f"in {seconds:.1f}s ({rate:.0f} records/s, {_megabytes(progress['bytes']) / seconds if seconds > 0 else 0:.2f} MB/s)")
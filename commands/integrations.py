@@ -1,6 +1,7 @@
 import click
-import json
-from utils import display_paginated_results, handle_api_error, format_item_details
+import logging
+import jsoncodec
+from utils import display_paginated_results, display_streamed_results, handle_api_error, format_item_details, row_builder
 
 @click.group()
 def integrations():
@@ -23,7 +24,7 @@ def show_integration_cmd(ctx, integration_id):
             "created_at": "Created At",
             "updated_at": "Updated At"
         }
-        format_item_details(integration, fields)
+        format_item_details(integration, fields, output=ctx.obj.output)
     except Exception as e:
         handle_api_error(e, "showing integration")
 
@@ -33,8 +34,10 @@ def show_integration_cmd(ctx, integration_id):
 @click.option("--search", help="Search for integrations by name or type")
 @click.option("--enabled", is_flag=True, help="Filter for enabled integrations", default=None)
 @click.option("--disabled", is_flag=True, help="Filter for disabled integrations")
+@click.option("--all", "fetch_all", is_flag=True, help="Stream every page of integrations starting at --offset")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel with --all")
 @click.pass_context
-def list_integrations_cmd(ctx, limit, offset, search, enabled, disabled):
+def list_integrations_cmd(ctx, limit, offset, search, enabled, disabled, fetch_all, concurrency):
     """List integrations in PagerTree with pagination."""
     try:
         # Ensure --enabled and --disabled are mutually exclusive
@@ -47,15 +50,22 @@ def list_integrations_cmd(ctx, limit, offset, search, enabled, disabled):
 
         client = ctx.obj.client  # Get PagerTreeClient from context
         logger = ctx.obj.logger  # Get logger from context
-        logger.debug(f"Listing integrations with limit={limit}, offset={offset}, search={search}, enabled={enabled_param}")
+        headers = ["ID", "Name", "Type", "Enabled"]
+        integration_row = row_builder(["id", "name", "integration_type.name", "enabled"])
+        if fetch_all:
+            logger.debug("Streaming all integrations from offset=%s, search=%s, enabled=%s", offset, search, enabled_param)
+            pages = client.iter_pages(client.list_integrations, offset=offset, concurrency=concurrency, search=search, enabled=enabled_param)
+            display_streamed_results(pages, "integration", headers, integration_row, output=ctx.obj.output)
+            return
+        logger.debug("Listing integrations with limit=%s, offset=%s, search=%s, enabled=%s", limit, offset, search, enabled_param)
         result = client.list_integrations(limit=limit, offset=offset, search=search, enabled=enabled_param)
-        logger.debug(f"Full response: {json.dumps(result, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Full response: %s", jsoncodec.dumps(result, indent=True))
         integrations_list = result["data"]
         total = result["total"]
         # Prepare table data
-        headers = ["ID", "Name", "Type", "Enabled"]
-        table_data = [[integration.get("id"), integration.get("name"), integration.get("integration_type").get("name"), integration.get("enabled")] for integration in integrations_list]
-        display_paginated_results(integrations_list, total, limit, offset, "integration", headers, table_data)
+        table_data = [integration_row(integration) for integration in integrations_list]
+        display_paginated_results(integrations_list, total, limit, offset, "integration", headers, table_data, output=ctx.obj.output)
     except Exception as e:
         logger.error(f"Error listing integrations: {str(e)}")
         handle_api_error(e, action="listing integrations")
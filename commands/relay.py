@@ -0,0 +1,109 @@
+import click
+import os
+import signal
+import stat
+import sys
+import threading
+import time
+
+COUNTERS = ("created", "deduplicated", "acknowledged", "resolved", "no_alert", "unmatched", "failed", "dropped")
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def _report_errors(pipeline):
+    while not pipeline.errors.empty():
+        rule, error = pipeline.errors.get_nowait()
+        click.echo(f"Error applying {rule}: {error}", err=True)
+
+def _report(pipeline, previous):
+    """Print one line of live counters and return the snapshot it was built from."""
+    stats = pipeline.snapshot()
+    interval = stats["seconds"] - previous.get("seconds", 0.0)
+    rate = (stats.get("processed", 0) - previous.get("processed", 0)) / interval if interval > 0 else 0.0
+    counters = ", ".join(f"{name.replace('_', ' ')} {stats.get(name, 0)}" for name in COUNTERS if stats.get(name))
+    click.echo(f"{stats.get('received', 0)} received, {stats.get('processed', 0)} processed ({rate:.1f}/s), "
+               f"queue {stats['queue']}/{stats['queue_size']}" + (f"; {counters}" if counters else ""), err=True)
+    _report_errors(pipeline)
+    return stats
+
+@click.command()
+@click.option("--rules", "rules_path", required=True, type=click.Path(exists=True, dir_okay=False),
+              help="JSON rule file mapping events to alert actions")
+@click.option("--stdin", "use_stdin", is_flag=True, help="Read events from stdin (the default when no socket is given)")
+@click.option("--unix", "unix_path", help="Accept newline-delimited events on this Unix socket")
+@click.option("--udp", "udp_address", help="Receive syslog datagrams on HOST:PORT (e.g. 0.0.0.0:5514)")
+@click.option("--workers", default=8, type=click.IntRange(1, 64), help="Number of events applied in parallel")
+@click.option("--queue-size", default=1000, type=click.IntRange(1), help="Events buffered before sources are slowed down (or UDP events dropped)")
+@click.option("--stats-interval", default=10.0, type=click.FloatRange(0), help="Seconds between live counter lines on stderr (0 disables)")
+@click.pass_context
+def relay(ctx, rules_path, use_stdin, unix_path, udp_address, workers, queue_size, stats_interval):
+    """Turn events from stdin, a Unix socket or syslog into alert actions."""
+    from relay import Relay, SyslogServer, load_rules, parse_event
+    try:
+        rules = load_rules(rules_path)
+    except (OSError, ValueError) as e:
+        click.echo(f"Error loading rules: {e}", err=True)
+        return
+
+    client = ctx.obj.client  # Get PagerTreeClient from context
+    pool_size = getattr(client, "pool_size", None)
+    if pool_size and workers > pool_size:
+        click.echo(f"Warning: {workers} workers share {pool_size} pooled connections; raise PAGERTREE_POOL_SIZE to match",
+                   err=True)
+
+    pipeline = Relay(client, rules, workers=workers, queue_size=queue_size).start()
+    servers = []
+    try:
+        if unix_path:
+            from relay import UnixLineServer
+            if os.path.exists(unix_path) and stat.S_ISSOCK(os.stat(unix_path).st_mode):
+                os.remove(unix_path)  # Stale socket left by an earlier relay
+            servers.append(UnixLineServer(unix_path, pipeline))
+        if udp_address:
+            host, _, port = udp_address.rpartition(":")
+            servers.append(SyslogServer((host.strip("[]") or "0.0.0.0", int(port)), pipeline))
+    except (OSError, ValueError, ImportError) as e:
+        click.echo(f"Error opening event source: {e}", err=True)
+        for server in servers:
+            server.server_close()
+        pipeline.close()
+        return
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    stopped = threading.Event()
+
+    def report_periodically():
+        previous = {}
+        while not stopped.wait(stats_interval):
+            previous = _report(pipeline, previous)
+
+    if stats_interval:
+        threading.Thread(target=report_periodically, daemon=True).start()
+    signal.signal(signal.SIGTERM, _interrupt)
+    sources = (["stdin"] if use_stdin or not servers else []) + ([f"unix:{unix_path}"] if unix_path else []) \
+        + ([f"udp:{udp_address}"] if udp_address else [])
+    click.echo(f"Relaying events from {', '.join(sources)} with {len(rules)} rules; press Ctrl-C to stop", err=True)
+    try:
+        if use_stdin or not servers:
+            for line in sys.stdin:
+                if line.strip():
+                    pipeline.submit(parse_event(line))
+        if servers:
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        if unix_path and os.path.exists(unix_path):
+            os.remove(unix_path)
+        # Queued events are still applied before exiting
+        pipeline.close()
+        stopped.set()
+
+    stats = _report(pipeline, {})
+    click.echo(f"Relay stopped after {stats['seconds']:.1f}s ({stats['rate']:.1f} events/s)", err=True)
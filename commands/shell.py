@@ -0,0 +1,108 @@
+import click
+import os
+import shlex
+
+# Words handled by the shell itself rather than dispatched to the CLI
+EXIT_WORDS = ("exit", "quit")
+
+def _complete(root, ctx, line, text):
+    """Return completion candidates for the word being typed at the end of line."""
+    try:
+        tokens = shlex.split(line)
+    except ValueError:
+        tokens = line.split()
+    if text and tokens:
+        tokens = tokens[:-1]
+
+    command = root
+    for token in tokens:
+        if isinstance(command, click.Group) and not token.startswith("-"):
+            subcommand = command.get_command(ctx, token)
+            if subcommand is None:
+                break
+            command = subcommand
+
+    candidates = ["--help"]
+    if isinstance(command, click.Group):
+        candidates += [name for name in command.list_commands(ctx) if name != "shell"]
+        if command is root:
+            candidates += list(EXIT_WORDS)
+    for param in command.params:
+        if isinstance(param, click.Option):
+            candidates += param.opts
+    return sorted(candidate + " " for candidate in set(candidates) if candidate.startswith(text))
+
+def _setup_readline(root, ctx):
+    """Enable history and tab completion when readline is available."""
+    try:
+        import readline
+    except ImportError:
+        return None
+    from cache import default_cache_dir
+    history_path = os.path.join(default_cache_dir(), "shell_history")
+    try:
+        os.makedirs(os.path.dirname(history_path), exist_ok=True)
+        if os.path.exists(history_path):
+            readline.read_history_file(history_path)
+    except OSError:
+        history_path = None
+    readline.set_history_length(1000)
+
+    matches = []
+    def completer(text, state):
+        if state == 0:
+            line = readline.get_line_buffer()[:readline.get_endidx()]
+            matches[:] = _complete(root, ctx, line, text)
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(completer)
+    readline.set_completer_delims(" \t\n")
+    readline.parse_and_bind("tab: complete")
+    return lambda: history_path and readline.write_history_file(history_path)
+
+@click.command()
+@click.pass_context
+def shell(ctx):
+    """Interactive shell that keeps one warm client between commands."""
+    root = ctx.find_root().command
+    session = ctx.obj
+    defaults = {"output": session.output, "verbose": session.verbose}
+    save_history = _setup_readline(root, ctx)
+    click.echo("PagerTree shell. Type 'help' for commands, 'exit' or Ctrl-D to quit.")
+    try:
+        while True:
+            try:
+                line = input("pagertree> ").strip()
+            except EOFError:
+                click.echo()
+                break
+            except KeyboardInterrupt:
+                click.echo()
+                continue
+            if not line:
+                continue
+            if line in EXIT_WORDS:
+                break
+            try:
+                args = shlex.split(line)
+            except ValueError as e:
+                click.echo(f"Error: {e}", err=True)
+                continue
+            if args[0] == "help":
+                args = args[1:] + ["--help"]
+            if args[0] == "shell":
+                click.echo("Error: already in the shell.", err=True)
+                continue
+            try:
+                # Dispatch through the root group; cli() reuses this session's client, and the
+                # global options the shell was started with stay in effect unless overridden
+                root.main(args, prog_name="pagertree", obj=session, standalone_mode=False, default_map=defaults)
+            except click.ClickException as e:
+                e.show()
+            except (click.Abort, KeyboardInterrupt):
+                click.echo("Aborted!", err=True)
+            except SystemExit:
+                pass
+    finally:
+        if save_history:
+            save_history()
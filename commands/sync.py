@@ -0,0 +1,27 @@
+import click
+from utils import handle_api_error
+
+RESOURCE_NAMES = ("alerts", "users", "teams", "integrations")
+
+@click.command()
+@click.option("--resource", "resources", multiple=True, type=click.Choice(RESOURCE_NAMES),
+              help="Resource to mirror (repeatable; default all)")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel")
+@click.pass_context
+def sync(ctx, resources, concurrency):
+    """Mirror alerts, users, teams and integrations into a local SQLite database."""
+    from mirror import Mirror, MirrorClient
+    client = ctx.obj.client  # Get PagerTreeClient from context
+    if isinstance(client, MirrorClient):
+        click.echo("Error: sync reads from the API and cannot be combined with --local.", err=True)
+        return
+    mirror = Mirror.from_env()
+    for resource in resources or RESOURCE_NAMES:
+        try:
+            result = mirror.sync(client, resource, concurrency=concurrency)
+        except Exception as e:
+            handle_api_error(e, f"syncing {resource}")
+            continue
+        click.echo(f"{resource}: {result['records']} records, {result['changed']} changed, "
+                   f"{result['removed']} removed in {result['seconds']:.2f}s "
+                   f"(watermark {result['watermark'] or 'none'})")
@@ -1,6 +1,29 @@
 import click
-from tabulate import tabulate
-from utils import display_paginated_results, handle_api_error, format_item_details
+from utils import display_paginated_results, display_streamed_results, handle_api_error, format_api_error, format_item_details, row_builder
+
+def _user_errors(client):
+    """Return the client's resolve_users errors, or None for clients that do not record them."""
+    errors = getattr(client, "user_errors", None)
+    return errors if isinstance(errors, dict) else None
+
+def _user_rows(user_ids, users, role, errors=None):
+    """Build user table rows for the given IDs from a resolve_users mapping (and its user_errors)."""
+    rows = []
+    for user_id in user_ids:
+        user = users.get(user_id)
+        if user is None:
+            error = (errors or {}).get(user_id)
+            reason = f": {format_api_error(error)}" if error is not None else ""
+            click.echo(f"Warning: Could not fetch details for {role} {user_id}{reason}", err=True)
+            continue
+        user_data = user.get("user", {})
+        rows.append([
+            user.get("id", "N/A"),
+            user_data.get("name", "N/A"),
+            next((email.get("email") for email in user_data.get("emails", []) if email.get("primary")), "N/A"),
+            next((phone.get("phone") for phone in user_data.get("phones", []) if phone.get("primary")), "N/A")
+        ])
+    return rows
 
 @click.group()
 def teams():
@@ -31,24 +54,25 @@ def create_team_cmd(ctx, name, notes, member_ids, admin_ids):
 @click.option("--limit", default=10, type=click.IntRange(1, 100), help="Number of teams per page")
 @click.option("--offset", default=0, type=click.IntRange(0), help="Starting point for pagination")
 @click.option("--search", help="Search for teams by name")
+@click.option("--all", "fetch_all", is_flag=True, help="Stream every page of teams starting at --offset")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel with --all")
 @click.pass_context
-def list_teams_cmd(ctx, limit, offset, search):
+def list_teams_cmd(ctx, limit, offset, search, fetch_all, concurrency):
     """List teams in PagerTree with pagination."""
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
+        headers = ["ID", "Name"]
+        team_row = row_builder(["id", "name"], default="N/A")
+        if fetch_all:
+            pages = client.iter_pages(client.list_teams, offset=offset, concurrency=concurrency, search=search)
+            display_streamed_results(pages, "team", headers, team_row, output=ctx.obj.output)
+            return
         result = client.list_teams(limit=limit, offset=offset, search=search)
         teams_list = result["data"]
         total = result["total"]
         # Prepare table data
-        headers = ["ID", "Name"]
-        table_data = [
-            [
-                team.get("id", "N/A"),
-                team.get("name", "N/A")
-            ]
-            for team in teams_list
-        ]
-        display_paginated_results(teams_list, total, limit, offset, "team", headers, table_data)
+        table_data = [team_row(team) for team in teams_list]
+        display_paginated_results(teams_list, total, limit, offset, "team", headers, table_data, output=ctx.obj.output)
     except Exception as e:
         handle_api_error(e, action="listing teams")
 
@@ -57,6 +81,7 @@ def list_teams_cmd(ctx, limit, offset, search):
 @click.pass_context
 def show_team_cmd(ctx, team_id):
     """Show details of a specific team in PagerTree."""
+    from tabulate import tabulate
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
         team = client.show_team(team_id)
@@ -76,80 +101,44 @@ def show_team_cmd(ctx, team_id):
             "created_at": team.get("created_at", "N/A"),
             "updated_at": team.get("updated_at", "N/A")
         }
+        # Resolve members and admins together so shared users are fetched once
+        members = team.get("member_account_user_ids", [])
+        admins = team.get("admin_account_user_ids", [])
+        users = client.resolve_users(members + admins)
+        headers = ["User ID", "Name", "Primary Email", "Primary Phone"]
+        member_rows = _user_rows(members, users, "member", _user_errors(client))
+        admin_rows = _user_rows(admins, users, "admin", _user_errors(client))
+
+        if ctx.obj.output != "table":
+            from output import RecordWriter
+            if ctx.obj.output in ("csv", "tsv"):
+                writer = RecordWriter(ctx.obj.output, ["Role"] + headers)
+                writer.write_many([{}] * len(member_rows), [["member"] + row for row in member_rows])
+                writer.write_many([{}] * len(admin_rows), [["admin"] + row for row in admin_rows])
+            else:
+                writer = RecordWriter(ctx.obj.output, single=True)
+                writer.write(dict(team,
+                                  members=[users[user_id] for user_id in members if user_id in users],
+                                  admins=[users[user_id] for user_id in admins if user_id in users]))
+            writer.close()
+            return
+
         click.echo("Team Details:")
         format_item_details(formatted_team, fields)
-        
-        # Fetch and display team members
-        members = team.get("member_account_user_ids", [])
-        if not members:
+
+        # Display team members
+        if not member_rows:
             click.echo("\nTeam Members: None")
         else:
-            member_details = []
-            for member_id in members:
-                try:
-                    user = client.show_user(member_id)
-                    user_data = user.get("user", {})
-                    member_details.append({
-                        "id": user.get("id", "N/A"),
-                        "name": user_data.get("name", "N/A"),
-                        "emails": user_data.get("emails", []),
-                        "phones": user_data.get("phones", [])
-                    })
-                except Exception as e:
-                    click.echo(f"Warning: Could not fetch details for member {member_id}: {str(e)}", err=True)
-            
-            if not member_details:
-                click.echo("\nTeam Members: None")
-            else:
-                # Prepare members table
-                headers = ["User ID", "Name", "Primary Email", "Primary Phone"]
-                table_data = [
-                    [
-                        member["id"],
-                        member["name"],
-                        next((email.get("email") for email in member["emails"] if email.get("primary")), "N/A"),
-                        next((phone.get("phone") for phone in member["phones"] if phone.get("primary")), "N/A")
-                    ]
-                    for member in member_details
-                ]
-                click.echo("\nTeam Members:")
-                click.echo(tabulate(table_data, headers=headers, tablefmt="simple"))
-        
-        # Fetch and display team admins
-        admins = team.get("admin_account_user_ids", [])
-        if not admins:
+            click.echo("\nTeam Members:")
+            click.echo(tabulate(member_rows, headers=headers, tablefmt="simple"))
+
+        # Display team admins
+        if not admin_rows:
             click.echo("\nTeam Admins: None")
         else:
-            admin_details = []
-            for admin_id in admins:
-                try:
-                    user = client.show_user(admin_id)
-                    user_data = user.get("user", {})
-                    admin_details.append({
-                        "id": user.get("id", "N/A"),
-                        "name": user_data.get("name", "N/A"),
-                        "emails": user_data.get("emails", []),
-                        "phones": user_data.get("phones", [])
-                    })
-                except Exception as e:
-                    click.echo(f"Warning: Could not fetch details for admin {admin_id}: {str(e)}", err=True)
-            
-            if not admin_details:
-                click.echo("\nTeam Admins: None")
-            else:
-                # Prepare admins table
-                headers = ["User ID", "Name", "Primary Email", "Primary Phone"]
-                table_data = [
-                    [
-                        admin["id"],
-                        admin["name"],
-                        next((email.get("email") for email in admin["emails"] if email.get("primary")), "N/A"),
-                        next((phone.get("phone") for phone in admin["phones"] if phone.get("primary")), "N/A")
-                    ]
-                    for admin in admin_details
-                ]
-                click.echo("\nTeam Admins:")
-                click.echo(tabulate(table_data, headers=headers, tablefmt="simple"))
+            click.echo("\nTeam Admins:")
+            click.echo(tabulate(admin_rows, headers=headers, tablefmt="simple"))
         
     except Exception as e:
         handle_api_error(e, action="showing team")
@@ -197,6 +186,7 @@ def delete_team_cmd(ctx, team_id, force):
 @click.pass_context
 def current_oncall_cmd(ctx, team_id):
     """Show current on-call users for a specific team in PagerTree."""
+    from tabulate import tabulate
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
         result = client.get_team_current_oncall(team_id)
@@ -204,44 +194,42 @@ def current_oncall_cmd(ctx, team_id):
             click.echo(f"No one schedule oncall for team {team_id}")
             return
         
+        # Resolve every attendee across all layers in one batch
+        attendee_ids = [
+            attendee.get("attendee_id")
+            for schedule in result
+            for attendee in schedule.get("attendees", [])
+            if attendee.get("attendee_id")
+        ]
+        users = client.resolve_users(attendee_ids)
+        headers = ["User ID", "Name", "Primary Email", "Primary Phone"]
+
+        if ctx.obj.output != "table":
+            from output import RecordWriter
+            writer = RecordWriter(ctx.obj.output, ["Layer", "Start Time", "End Time"] + headers)
+            for schedule in result:
+                layer_ids = [attendee.get("attendee_id") for attendee in schedule.get("attendees", []) if attendee.get("attendee_id")]
+                if ctx.obj.output in ("csv", "tsv"):
+                    rows = [[schedule.get("layer"), schedule.get("start_time"), schedule.get("end_time")] + row
+                            for row in _user_rows(layer_ids, users, "user", _user_errors(client))]
+                    writer.write_many([{}] * len(rows), rows)
+                else:
+                    writer.write_many([dict(schedule, users=[users[user_id] for user_id in layer_ids if user_id in users])])
+            writer.close()
+            return
+
         # Process each schedule
         for schedule in result:
             layer = schedule.get("layer", "N/A")
             start_time = schedule.get("start_time", "N/A")
             end_time = schedule.get("end_time", "N/A")
-            attendees = []
+            layer_ids = [attendee.get("attendee_id") for attendee in schedule.get("attendees", []) if attendee.get("attendee_id")]
+            table_data = _user_rows(layer_ids, users, "user", _user_errors(client))
             
-            # Fetch user details for each attendee
-            for attendee in schedule.get("attendees", []):
-                attendee_id = attendee.get("attendee_id")
-                if attendee_id:
-                    try:
-                        user = client.show_user(attendee_id)
-                        user_data = user.get("user", {})
-                        attendees.append({
-                            "id": user.get("id", "N/A"),
-                            "name": user_data.get("name", "N/A"),
-                            "emails": user_data.get("emails", []),
-                            "phones": user_data.get("phones", [])
-                        })
-                    except Exception as e:
-                        click.echo(f"Warning: Could not fetch details for user {attendee_id}: {str(e)}", err=True)
-            
-            if not attendees:
+            if not table_data:
                 click.echo(f"*** LAYER {layer} ({start_time} to {end_time}): No users on-call ***")
                 continue
             
-            # Prepare table data
-            headers = ["User ID", "Name", "Primary Email", "Primary Phone"]
-            table_data = [
-                [
-                    attendee["id"],
-                    attendee["name"],
-                    next((email.get("email") for email in attendee["emails"] if email.get("primary")), "N/A"),
-                    next((phone.get("phone") for phone in attendee["phones"] if phone.get("primary")), "N/A")
-                ]
-                for attendee in attendees
-            ]
             click.echo(f"*** LAYER {layer} ({start_time} to {end_time}): ***")
             click.echo(tabulate(table_data, headers=headers, tablefmt="simple"))
             click.echo(f"*** End of layer {layer} ***")
@@ -254,20 +242,24 @@ def current_oncall_cmd(ctx, team_id):
 @click.argument("team_id", required=True)
 @click.option("--limit", default=10, type=click.IntRange(1, 100), help="Number of alerts per page")
 @click.option("--offset", default=0, type=click.IntRange(0), help="Starting point for pagination")
+@click.option("--all", "fetch_all", is_flag=True, help="Stream every page of alerts starting at --offset")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel with --all")
 @click.pass_context
-def team_alerts_cmd(ctx, team_id, limit, offset):
+def team_alerts_cmd(ctx, team_id, limit, offset, fetch_all, concurrency):
     """List alerts for a specific team in PagerTree."""
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
+        headers = ["ID", "Title", "Status"]
+        alert_row = row_builder(["id", "title", "status"], default="N/A")
+        if fetch_all:
+            pages = client.iter_pages(client.get_team_alerts, team_id, offset=offset, concurrency=concurrency)
+            display_streamed_results(pages, "alert", headers, alert_row, output=ctx.obj.output)
+            return
         result = client.get_team_alerts(team_id, limit=limit, offset=offset)
         alerts_list = result["data"]
         total = result["total"]
         # Prepare table data
-        headers = ["ID", "Title", "Status"]
-        table_data = [
-            [alert.get("id"), alert.get("title", "N/A"), alert.get("status", "N/A")]
-            for alert in alerts_list
-        ]
-        display_paginated_results(alerts_list, total, limit, offset, "alert", headers, table_data)
+        table_data = [alert_row(alert) for alert in alerts_list]
+        display_paginated_results(alerts_list, total, limit, offset, "alert", headers, table_data, output=ctx.obj.output)
     except Exception as e:
         handle_api_error(e, action="listing team alerts")
\ No newline at end of file
@@ -1,5 +1,5 @@
 import click
-from utils import display_paginated_results, handle_api_error, format_item_details
+from utils import display_paginated_results, display_streamed_results, handle_api_error, format_item_details
 
 @click.group()
 def users():
@@ -26,29 +26,33 @@ def create_user_cmd(ctx, name, email, role, team_ids):
 @click.option("--limit", default=10, type=click.IntRange(1, 100), help="Number of users per page")
 @click.option("--offset", default=0, type=click.IntRange(0), help="Starting point for pagination")
 @click.option("--search", help="Search for users by name, email, phone, or roles")
+@click.option("--all", "fetch_all", is_flag=True, help="Stream every page of users starting at --offset")
+@click.option("--concurrency", default=4, type=click.IntRange(1, 32), help="Number of pages to fetch in parallel with --all")
 @click.pass_context
-def list_users_cmd(ctx, limit, offset, search):
+def list_users_cmd(ctx, limit, offset, search, fetch_all, concurrency):
     """List users in PagerTree with pagination."""
     try:
         client = ctx.obj.client  # Get PagerTreeClient from context
+        headers = ["ID", "Name", "Primary Email", "Primary Phone", "Roles"]
+        user_row = lambda user: [
+            user.get("id"),
+            user.get("user", {}).get("name", "N/A"),
+            next((email.get("email") for email in user.get("user", {}).get("emails", []) if email.get("primary")), "N/A"),
+            next((phone.get("phone") for phone in user.get("user", {}).get("phones", []) if phone.get("primary")), "N/A"),
+            ", ".join(
+                role for role, enabled in user.get("roles", {}).items() if enabled
+            ) or "None"
+        ]
+        if fetch_all:
+            pages = client.iter_pages(client.list_users, offset=offset, concurrency=concurrency, search=search)
+            display_streamed_results(pages, "user", headers, user_row, output=ctx.obj.output)
+            return
         result = client.list_users(limit=limit, offset=offset, search=search)
         users_list = result["data"]
         total = result["total"]
         # Prepare table data
-        headers = ["ID", "Name", "Primary Email", "Primary Phone", "Roles"]
-        table_data = [
-            [
-                user.get("id"),
-                user.get("user", {}).get("name", "N/A"),
-                next((email.get("email") for email in user.get("user", {}).get("emails", []) if email.get("primary")), "N/A"),
-                next((phone.get("phone") for phone in user.get("user", {}).get("phones", []) if phone.get("primary")), "N/A"),
-                ", ".join(
-                    role for role, enabled in user.get("roles", {}).items() if enabled
-                ) or "None"
-            ]
-            for user in users_list
-        ]
-        display_paginated_results(users_list, total, limit, offset, "user", headers, table_data)
+        table_data = [user_row(user) for user in users_list]
+        display_paginated_results(users_list, total, limit, offset, "user", headers, table_data, output=ctx.obj.output)
     except Exception as e:
         handle_api_error(e, action="listing users")
 
@@ -84,7 +88,7 @@ def show_user_cmd(ctx, user_id):
             ) or "None",
             "created_at": user.get("created_at", "N/A")
         }
-        format_item_details(formatted_user, fields)
+        format_item_details(formatted_user, fields, output=ctx.obj.output, raw=user)
     except Exception as e:
         handle_api_error(e, action="showing user")
 
@@ -0,0 +1,43 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def bounded_map(fn: Callable[[T], R], items: Iterable[T], workers: int = 4, ordered: bool = True) -> Iterator[R]:
+    """Apply fn to items on a thread pool, keeping at most 2 * workers calls in flight.
+
+    Items are pulled from the iterable lazily, so arbitrarily long inputs never
+    queue up in memory. Results are yielded in input order unless ordered is False,
+    and an exception raised by fn is re-raised when its result is reached.
+    """
+    window = max(1, workers) * 2
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    pending = deque() if ordered else set()
+    try:
+        for item in items:
+            future = executor.submit(fn, item)
+            if ordered:
+                pending.append(future)
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            else:
+                pending.add(future)
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        yield finished.result()
+        if ordered:
+            while pending:
+                yield pending.popleft().result()
+        else:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for finished in done:
+                    yield finished.result()
+    finally:
+        # Drop queued work if the consumer stops early or a call failed
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
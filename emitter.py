@@ -0,0 +1,156 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrency import bounded_map
+
+# Urgencies from lowest to highest; a merged alert keeps the highest urgency it saw
+URGENCY_ORDER = ("silent", "low", "medium", "high", "critical")
+
+def _timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def title_alias(title: str) -> str:
+    """Stable alias for events without one, so the same title is deduplicated across windows."""
+    return "title-" + hashlib.sha1(title.encode("utf-8")).hexdigest()[:16]
+
+class AlertEmitter:
+    """Buffer alert events and create one alert per distinct problem in each window.
+
+    Events are merged by alias, or by title when they have no alias. A merged
+    alert keeps the first event's fields, the highest urgency and the union of
+    tags, and its description notes how many events it stands for. The buffer is
+    flushed every `window` seconds by a background thread, or as soon as
+    `max_events` raw events are waiting, and merged alerts are created through
+    bounded_map with `workers` in flight. Memory grows with the number of
+    distinct problems in a window, not with the event rate.
+
+    Merged alerts are created with create_alert's on_duplicate mode, and unless
+    it is "create" events without an alias get title_alias(title), so with
+    "skip" (the default) a problem still open from an earlier window costs a
+    single GET instead of a new alert.
+    """
+
+    def __init__(self, client, window: float = 1.0, max_events: int = 10000, workers: int = 8,
+                 on_duplicate: str = "skip", dedupe_window: Optional[float] = None,
+                 on_flush: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        self.client = client
+        self.window = window
+        self.max_events = max_events
+        self.workers = workers
+        self.on_duplicate = on_duplicate
+        self.dedupe_window = dedupe_window
+        self.on_flush = on_flush
+        self.stats = Counter()
+        self._buffer: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "AlertEmitter":
+        """Start the background flusher; emit() also works without it if flush() is called."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="alert-emitter", daemon=True)
+            self._thread.start()
+        return self
+
+    def __enter__(self) -> "AlertEmitter":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def emit(self, title: str, alias: Optional[str] = None, **kwargs) -> None:
+        """Buffer one event; kwargs are create_alert arguments (urgency, tags, team_ids, ...).
+
+        Raises ValueError, without buffering anything, for an unknown urgency.
+        """
+        if kwargs.get("urgency") is None:
+            kwargs.pop("urgency", None)
+        elif kwargs["urgency"] not in URGENCY_ORDER:
+            raise ValueError(f"urgency must be one of {', '.join(URGENCY_ORDER)}")
+        now = time.time()
+        key = ("alias", alias) if alias else ("title", title)
+        with self._lock:
+            merged = self._buffer.get(key)
+            if merged is None:
+                self._buffer[key] = {"title": title, "alias": alias, "kwargs": dict(kwargs),
+                                     "count": 1, "first_seen": now, "last_seen": now}
+            else:
+                merged["count"] += 1
+                merged["last_seen"] = now
+                self._merge(merged["kwargs"], kwargs)
+            self._pending += 1
+            self.stats["events"] += 1
+            full = self._pending >= self.max_events
+        if full:
+            self._wake.set()
+
+    @staticmethod
+    def _merge(kwargs: Dict[str, Any], event: Dict[str, Any]) -> None:
+        """Fold a duplicate event into the buffered alert's arguments."""
+        urgency = event.get("urgency")
+        if urgency in URGENCY_ORDER and URGENCY_ORDER.index(urgency) > URGENCY_ORDER.index(kwargs.get("urgency", "medium")):
+            kwargs["urgency"] = urgency
+        if event.get("tags"):
+            kwargs["tags"] = list(dict.fromkeys((kwargs.get("tags") or []) + list(event["tags"])))
+
+    def _create(self, merged: Dict[str, Any]) -> Dict[str, Any]:
+        kwargs = dict(merged["kwargs"])
+        if merged["count"] > 1:
+            note = (f"Coalesced {merged['count']} events between {_timestamp(merged['first_seen'])} "
+                    f"and {_timestamp(merged['last_seen'])}.")
+            kwargs["description"] = f"{kwargs['description']}\n\n{note}" if kwargs.get("description") else note
+        if self.dedupe_window is not None:
+            kwargs["dedupe_window"] = self.dedupe_window
+        alias = merged["alias"]
+        if alias is None and self.on_duplicate != "create":
+            alias = title_alias(merged["title"])
+        outcome = {"title": merged["title"], "alias": alias, "count": merged["count"]}
+        try:
+            result = self.client.create_alert(title=merged["title"], alias=alias,
+                                              on_duplicate=self.on_duplicate, **kwargs)
+            outcome["id"] = result.get("id")
+            if result.get("deduplicated"):
+                outcome["deduplicated"] = result["deduplicated"]
+        except Exception as e:
+            from utils import format_api_error
+            outcome["error"] = format_api_error(e)
+        return outcome
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Create the buffered alerts now and return one outcome per merged alert."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer, self._pending = list(self._buffer.values()), {}, 0
+            if not batch:
+                return []
+            outcomes = list(bounded_map(self._create, batch, workers=self.workers, ordered=False))
+            self.stats["flushes"] += 1
+            self.stats["alerts"] += len(outcomes)
+            for outcome in outcomes:
+                self.stats["failed" if "error" in outcome else "deduplicated" if "deduplicated" in outcome else "created"] += 1
+        if self.on_flush is not None:
+            self.on_flush(outcomes)
+        return outcomes
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.window)
+            self._wake.clear()
+            if not self._closed.is_set():
+                self.flush()
+
+    def close(self) -> None:
+        """Stop the background flusher and flush whatever is still buffered."""
+        self._closed.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
@@ -0,0 +1,173 @@
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from concurrency import bounded_map
+import jsoncodec
+from output import _cell
+
+# Exportable resources and the client list method that pages through them; comments are
+# gathered per alert by Exporter itself.
+RESOURCES = {
+    "alerts": "list_alerts",
+    "comments": None,
+    "users": "list_users",
+    "teams": "list_teams",
+    "integrations": "list_integrations",
+    "broadcasts": "list_broadcasts",
+}
+
+STATE_FILE = "export-state.json"
+
+# Chunk file names written by Exporter.chunk_path, e.g. alerts-00003.ndjson.gz
+CHUNK_NAME = re.compile(r"^(?P<resource>[a-z]+)-\d{5}\.(?:ndjson|csv|tsv)(?:\.gz)?$")
+
+class ExportStateMismatch(Exception):
+    """The directory holds an export made with different settings."""
+
+class Exporter:
+    """Write resources to chunked NDJSON or CSV files, checkpointing after every page.
+
+    Every page is appended to the current chunk as its own gzip member (or as
+    plain text without compression), so the size of a chunk after a page is a
+    safe resume point. After each page the state file records the next offset
+    and that size; a resumed export truncates the chunk back to it and carries
+    on from the offset, so a page is never written twice.
+    """
+
+    def __init__(self, client, directory: str, file_format: str = "ndjson", compress: bool = True,
+                 chunk_records: int = 50000, page_size: int = 100, concurrency: int = 4,
+                 filters: Optional[Dict[str, Any]] = None, restart: bool = False,
+                 progress: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        self.client = client
+        self.directory = directory
+        self.file_format = file_format
+        self.compress = compress
+        self.chunk_records = chunk_records
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.filters = {key: value for key, value in (filters or {}).items() if value is not None}
+        self.progress = progress
+        os.makedirs(directory, exist_ok=True)
+        self.state_path = os.path.join(directory, STATE_FILE)
+        settings = {"format": file_format, "compress": compress, "chunk_records": chunk_records,
+                    "page_size": page_size, "filters": self.filters}
+        self.state = {"settings": settings, "resources": {}}
+        if os.path.exists(self.state_path) and not restart:
+            with open(self.state_path) as f:
+                saved = json.load(f)
+            if saved.get("settings") != settings:
+                raise ExportStateMismatch(
+                    f"{directory} holds an export with different settings; pass --restart to start over"
+                )
+            self.state = saved
+
+    def _save_state(self) -> None:
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.state_path)
+
+    def chunk_path(self, resource: str, chunk: int) -> str:
+        extension = "ndjson" if self.file_format == "ndjson" else self.file_format
+        return os.path.join(self.directory, f"{resource}-{chunk:05d}.{extension}" + (".gz" if self.compress else ""))
+
+    def _encode(self, progress: Dict[str, Any], records: List[Dict[str, Any]]) -> bytes:
+        buffer = io.StringIO()
+        if self.file_format == "ndjson":
+            for record in records:
+                buffer.write(jsoncodec.dumps(record) + "\n")
+        else:
+            writer = csv.writer(buffer, delimiter="," if self.file_format == "csv" else "\t", lineterminator="\n")
+            if progress["columns"] is None:
+                progress["columns"] = list(dict.fromkeys(key for record in records for key in record))
+            if progress["chunk_records"] == 0:
+                writer.writerow(progress["columns"])
+            for record in records:
+                writer.writerow([_cell(record.get(column)) for column in progress["columns"]])
+        data = buffer.getvalue().encode("utf-8")
+        progress["raw_bytes"] += len(data)
+        return gzip.compress(data, compresslevel=6) if self.compress else data
+
+    def _write_page(self, resource: str, progress: Dict[str, Any], records: List[Dict[str, Any]], next_offset: int) -> None:
+        """Append one page to the current chunk, then checkpoint."""
+        if records:
+            data = self._encode(progress, records)
+            with open(self.chunk_path(resource, progress["chunk"]), "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            progress["records"] += len(records)
+            progress["chunk_records"] += len(records)
+            progress["chunk_bytes"] += len(data)
+            progress["bytes"] += len(data)
+            if progress["chunk_records"] >= self.chunk_records:
+                progress["chunk"] += 1
+                progress["chunk_records"] = progress["chunk_bytes"] = 0
+        progress["offset"] = next_offset
+        self._save_state()
+        if self.progress is not None:
+            self.progress(resource, progress)
+
+    def _resume(self, resource: str) -> Dict[str, Any]:
+        """Return the checkpoint for resource, truncating its current chunk to the last completed page."""
+        progress = self.state["resources"].get(resource)
+        if progress is None:
+            progress = self.state["resources"][resource] = {
+                "offset": 0, "chunk": 0, "chunk_records": 0, "chunk_bytes": 0, "records": 0,
+                "bytes": 0, "raw_bytes": 0, "columns": None, "done": False, "seconds": 0.0,
+            }
+            for name in os.listdir(self.directory):
+                # A restarted export must not append to chunks left by an earlier run;
+                # anything else in the directory is left alone
+                match = CHUNK_NAME.match(name)
+                if match and match.group("resource") == resource:
+                    os.remove(os.path.join(self.directory, name))
+            return progress
+        path = self.chunk_path(resource, progress["chunk"])
+        if os.path.exists(path):
+            with open(path, "r+b") as f:
+                f.truncate(progress["chunk_bytes"])
+        return progress
+
+    def export(self, resource: str) -> Dict[str, Any]:
+        """Export one resource, resuming from its checkpoint; return its progress record."""
+        progress = self._resume(resource)
+        if progress["done"]:
+            return progress
+        started = time.monotonic()
+        try:
+            if resource == "comments":
+                self._export_comments(progress)
+            else:
+                list_method = getattr(self.client, RESOURCES[resource])
+                kwargs = self.filters if resource == "alerts" else {}
+                for page in self.client.iter_pages(list_method, page_size=self.page_size, offset=progress["offset"],
+                                                   concurrency=self.concurrency, **kwargs):
+                    self._write_page(resource, progress, page["data"], page["offset"] + len(page["data"]))
+            progress["done"] = True
+        finally:
+            progress["seconds"] += time.monotonic() - started
+            self._save_state()
+        return progress
+
+    def _export_comments(self, progress: Dict[str, Any]) -> None:
+        """Export the comments of every alert, one page of alerts per checkpoint."""
+        def comments_for(alert: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return [dict(comment, alert_id=alert["id"])
+                    for comment in self.client.iter_records(self.client.list_alert_comments, alert["id"],
+                                                            page_size=self.page_size)]
+
+        pages: Iterator[Dict[str, Any]] = self.client.iter_pages(
+            self.client.list_alerts, page_size=self.page_size, offset=progress["offset"],
+            concurrency=self.concurrency, **self.filters)
+        for page in pages:
+            records = [comment for comments in bounded_map(comments_for, page["data"], workers=self.concurrency)
+                       for comment in comments]
+            self._write_page("comments", progress, records, page["offset"] + len(page["data"]))
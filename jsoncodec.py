@@ -0,0 +1,50 @@
+import json
+from typing import Any, Union
+
+# orjson is optional: it decodes and encodes several times faster than the
+# standard library, which matters when scanning or exporting large result sets.
+# It is imported on first use so `--help` does not pay for it.
+_orjson = None
+_loaded = False
+
+def _backend():
+    """Return the orjson module, or None when it is not installed."""
+    global _orjson, _loaded
+    if not _loaded:
+        try:
+            import orjson as _orjson
+        except ImportError:
+            _orjson = None
+        _loaded = True
+    return _orjson
+
+def backend_name() -> str:
+    """Name of the JSON library in use ("orjson" or "json")."""
+    return "orjson" if _backend() is not None else "json"
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document from bytes or str."""
+    orjson = _backend()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumpb(value: Any, indent: bool = False) -> bytes:
+    """Encode value as UTF-8 JSON bytes (compact, or indented by two spaces).
+
+    Values JSON has no type for are converted with str(). Inputs orjson rejects
+    (non-string keys, integers beyond 64 bits) fall back to the standard library.
+    """
+    orjson = _backend()
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass
+    if indent:
+        return json.dumps(value, indent=2, default=str, ensure_ascii=False).encode("utf-8")
+    return json.dumps(value, separators=(",", ":"), default=str, ensure_ascii=False).encode("utf-8")
+
+def dumps(value: Any, indent: bool = False) -> str:
+    """Encode value as a JSON string; see dumpb."""
+    return dumpb(value, indent).decode("utf-8")
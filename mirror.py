@@ -0,0 +1,287 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from cache import default_cache_dir
+import jsoncodec
+from utils import compile_path
+
+# Mirrored resources: table -> (client list method, {column: field path}, indexed columns).
+# Every table also has id (primary key) and body (the full API record as JSON).
+RESOURCES = {
+    "alerts": ("list_alerts", {
+        "status": "status", "urgency": "urgency", "alias": "thirdparty_id", "title": "title",
+        "created_at": "created_at", "updated_at": "updated_at",
+    }, ("status", "urgency", "alias", "created_at", "updated_at")),
+    "users": ("list_users", {
+        "name": "user.name", "created_at": "created_at", "updated_at": "updated_at",
+    }, ("name", "updated_at")),
+    "teams": ("list_teams", {
+        "name": "name", "created_at": "created_at", "updated_at": "updated_at",
+    }, ("name", "updated_at")),
+    "integrations": ("list_integrations", {
+        "name": "name", "type": "integration_type.name", "enabled": "enabled",
+        "created_at": "created_at", "updated_at": "updated_at",
+    }, ("name", "enabled", "updated_at")),
+}
+
+class Mirror:
+    """Local SQLite copy of alerts, users, teams and integrations for offline queries."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or default_cache_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        # One connection shared by all threads; access is serialized by the lock
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(self.directory, "mirror.db"),
+                                    check_same_thread=False, isolation_level=None, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        for table, (_, columns, indexed) in RESOURCES.items():
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, "
+                + "".join(f"{column}, " for column in columns) + "body TEXT NOT NULL)"
+            )
+            for column in indexed:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ({column})")
+        # Alerts can target several teams, so team membership lives in its own table
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS alert_teams (alert_id TEXT NOT NULL, team_id TEXT NOT NULL, "
+            "PRIMARY KEY (alert_id, team_id)) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS alert_teams_team_id ON alert_teams (team_id)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            "resource TEXT PRIMARY KEY, watermark TEXT, synced_at REAL NOT NULL, records INTEGER NOT NULL)"
+        )
+        self._extractors = {table: [(column, compile_path(path)) for column, path in columns.items()]
+                            for table, (_, columns, _) in RESOURCES.items()}
+
+    @classmethod
+    def from_env(cls) -> "Mirror":
+        """Open the mirror in PAGERTREE_CACHE_DIR (or the default cache directory)."""
+        return cls(directory=os.getenv("PAGERTREE_CACHE_DIR") or None)
+
+    def state(self, resource: str) -> Optional[Dict[str, Any]]:
+        """Return the watermark, time and record count of the last sync of resource."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT watermark, synced_at, records FROM sync_state WHERE resource = ?", (resource,)
+            ).fetchone()
+        return None if row is None else {"watermark": row[0], "synced_at": row[1], "records": row[2]}
+
+    def sync(self, client, resource: str, concurrency: int = 4) -> Dict[str, Any]:
+        """Pull one resource from the API and apply the differences to the mirror.
+
+        Pages are fetched concurrently and each page is written in one transaction.
+        Only records that are new or whose updated_at moved past the mirrored copy
+        are rewritten; records the API no longer returns are removed once the scan
+        completes. The highest updated_at seen becomes the resource's watermark.
+        """
+        list_method = RESOURCES[resource][0]
+        started = time.monotonic()
+        previous = self.state(resource)
+        watermark = previous["watermark"] if previous else None
+        seen = changed = 0
+        with self.lock:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen_ids (id TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM temp.seen_ids")
+        for page in client.iter_pages(getattr(client, list_method), concurrency=concurrency):
+            seen += len(page["data"])
+            changed += self._apply(resource, page["data"])
+            for record in page["data"]:
+                if record.get("updated_at") and (watermark is None or record["updated_at"] > watermark):
+                    watermark = record["updated_at"]
+
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                removed = self.conn.execute(
+                    f"DELETE FROM {resource} WHERE id NOT IN (SELECT id FROM temp.seen_ids)"
+                ).rowcount
+                if resource == "alerts":
+                    self.conn.execute("DELETE FROM alert_teams WHERE alert_id NOT IN (SELECT id FROM alerts)")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (resource, watermark, synced_at, records) VALUES (?, ?, ?, ?)",
+                    (resource, watermark, time.time(), seen),
+                )
+                self.conn.execute("COMMIT")
+            except sqlite3.Error:
+                self.conn.execute("ROLLBACK")
+                raise
+        return {"resource": resource, "records": seen, "changed": changed, "removed": removed,
+                "watermark": watermark, "previous_watermark": previous["watermark"] if previous else None,
+                "seconds": time.monotonic() - started}
+
+    def _apply(self, resource: str, records: List[Dict[str, Any]]) -> int:
+        """Upsert the new or changed records of one page in a single transaction; return how many changed."""
+        records = [record for record in records if record.get("id")]
+        if not records:
+            return 0
+        extractors = self._extractors[resource]
+        ids = [record["id"] for record in records]
+        with self.lock:
+            self.conn.executemany("INSERT OR IGNORE INTO temp.seen_ids (id) VALUES (?)", [(i,) for i in ids])
+            placeholders = ",".join("?" * len(ids))
+            current = dict(self.conn.execute(
+                f"SELECT id, coalesce(updated_at, body) FROM {resource} WHERE id IN ({placeholders})", ids
+            ).fetchall())
+            rows, team_rows = [], []
+            for record in records:
+                body = jsoncodec.dumps(record)
+                if record["id"] in current and current[record["id"]] == (record.get("updated_at") or body):
+                    continue
+                rows.append([record["id"]] + [_column_value(extract(record, None)) for _, extract in extractors] + [body])
+                if resource == "alerts":
+                    team_rows.extend((record["id"], team_id) for team_id in record.get("destination_team_ids") or [])
+            if not rows:
+                return 0
+            names = ["id"] + [column for column, _ in extractors] + ["body"]
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO {resource} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})", rows
+                )
+                if resource == "alerts":
+                    self.conn.executemany("DELETE FROM alert_teams WHERE alert_id = ?", [(row[0],) for row in rows])
+                    self.conn.executemany("INSERT OR IGNORE INTO alert_teams (alert_id, team_id) VALUES (?, ?)", team_rows)
+                self.conn.execute("COMMIT")
+            except sqlite3.Error:
+                self.conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def query(self, resource: str, where: str = "", params: tuple = (), limit: int = 10, offset: int = 0,
+              order: str = "created_at DESC, id") -> Dict[str, Any]:
+        """Return a page of mirrored records in the shape of the client's list methods."""
+        with self.lock:
+            total = self.conn.execute(f"SELECT count(*) FROM {resource} {where}", params).fetchone()[0]
+            rows = self.conn.execute(
+                f"SELECT body FROM {resource} {where} ORDER BY {order} LIMIT ? OFFSET ?", params + (limit, offset)
+            ).fetchall()
+        return {"data": [jsoncodec.loads(body) for body, in rows], "total": total,
+                "has_more": offset + len(rows) < total, "limit": limit, "offset": offset}
+
+    def get(self, resource: str, record_id: str) -> Optional[Dict[str, Any]]:
+        """Return one mirrored record by ID."""
+        with self.lock:
+            row = self.conn.execute(f"SELECT body FROM {resource} WHERE id = ?", (record_id,)).fetchone()
+        return None if row is None else jsoncodec.loads(row[0])
+
+def _column_value(value: Any) -> Any:
+    """Store booleans as integers and nested values as JSON so every column is queryable."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (dict, list)):
+        return jsoncodec.dumps(value)
+    return value
+
+def _filters(**conditions) -> tuple:
+    """Build a WHERE clause from (clause, value) conditions, skipping those whose value is None.
+
+    A tuple value supplies one parameter per placeholder in its clause.
+    """
+    clauses, params = [], []
+    for clause, value in conditions.values():
+        if value is not None:
+            clauses.append(clause)
+            params.extend(value if isinstance(value, tuple) else (value,))
+    return ("WHERE " + " AND ".join(clauses) if clauses else ""), tuple(params)
+
+# PagerTreeClient methods that need the API (creates, updates, comments, on-call);
+# MirrorClient answers them with an error instead of an AttributeError
+API_ONLY_METHODS = frozenset({
+    "acknowledge_alert", "create_alert", "create_alert_comment", "create_broadcast", "create_team",
+    "create_user", "delete_alert", "delete_broadcast", "delete_team", "delete_user",
+    "get_team_current_oncall", "list_alert_comments", "list_broadcasts", "reject_alert", "resolve_alert",
+    "show_broadcast", "update_broadcast", "update_integration", "update_team", "update_user",
+})
+
+class MirrorClient:
+    """Read-only stand-in for PagerTreeClient that answers list and show calls from the mirror."""
+
+    def __init__(self, mirror: Mirror):
+        self.mirror = mirror
+        # PagerTreeClient attributes commands probe for; the mirror has no session, index or fetch errors
+        self.user_errors: Dict[str, Exception] = {}
+        self.alias_index = None
+        self.session = None
+
+    def _record(self, resource: str, record_id: str, label: str) -> Dict[str, Any]:
+        record = self.mirror.get(resource, record_id)
+        if record is None:
+            raise LookupError(f"{label} {record_id} is not in the local mirror; run `pagertree sync`")
+        return record
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name not in API_ONLY_METHODS:
+            raise AttributeError(name)
+
+        def unavailable(*args, **kwargs):
+            raise RuntimeError(f"{name} is not available with --local; run the command without it")
+        return unavailable
+
+    def iter_pages(self, list_method: Callable[..., Dict[str, Any]], *args,
+                   page_size: int = 100, offset: int = 0, concurrency: int = 1,
+                   **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield successive pages from a local list method (concurrency is ignored)."""
+        while True:
+            page = list_method(*args, limit=page_size, offset=offset, **kwargs)
+            yield page
+            offset += len(page["data"])
+            if not page["data"] or offset >= page["total"]:
+                return
+
+    def iter_records(self, list_method: Callable[..., Dict[str, Any]], *args, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield individual records from every page of a local list method."""
+        for page in self.iter_pages(list_method, *args, **kwargs):
+            yield from page["data"]
+
+    def list_alerts(self, limit: int = 10, offset: int = 0, status: Optional[str] = None,
+                    search: Optional[str] = None, alias: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """List mirrored alerts; search matches the title."""
+        where, params = _filters(status=("status = ?", status), alias=("alias = ?", alias),
+                                 search=("title LIKE ?", f"%{search}%" if search else None))
+        return self.mirror.query("alerts", where, params, limit, offset)
+
+    def show_alert(self, alert_id: str) -> Dict[str, Any]:
+        return self._record("alerts", alert_id, "Alert")
+
+    def find_alert_id(self, alias: str, status: Optional[str] = None, use_index: bool = True) -> Optional[str]:
+        result = self.list_alerts(limit=1, alias=alias, status=status)
+        return result["data"][0]["id"] if result["data"] else None
+
+    def get_team_alerts(self, team_id: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        return self.mirror.query("alerts", "WHERE id IN (SELECT alert_id FROM alert_teams WHERE team_id = ?)",
+                                 (team_id,), limit, offset)
+
+    def list_users(self, limit: int = 10, offset: int = 0, search: Optional[str] = None) -> Dict[str, Any]:
+        where, params = _filters(search=("name LIKE ?", f"%{search}%" if search else None))
+        return self.mirror.query("users", where, params, limit, offset)
+
+    def show_user(self, user_id: str) -> Dict[str, Any]:
+        return self._record("users", user_id, "User")
+
+    def resolve_users(self, user_ids: List[str], **kwargs) -> Dict[str, Dict[str, Any]]:
+        users = {}
+        for user_id in dict.fromkeys(user_id for user_id in user_ids if user_id):
+            user = self.mirror.get("users", user_id)
+            if user is not None:
+                users[user_id] = user
+        return users
+
+    def list_teams(self, limit: int = 10, offset: int = 0, search: Optional[str] = None) -> Dict[str, Any]:
+        where, params = _filters(search=("name LIKE ?", f"%{search}%" if search else None))
+        return self.mirror.query("teams", where, params, limit, offset)
+
+    def show_team(self, team_id: str) -> Dict[str, Any]:
+        return self._record("teams", team_id, "Team")
+
+    def list_integrations(self, limit: int = 10, offset: int = 0, search: Optional[str] = None,
+                          enabled: Optional[bool] = None) -> Dict[str, Any]:
+        where, params = _filters(search=("(name LIKE ? OR type LIKE ?)", (f"%{search}%",) * 2 if search else None),
+                                 enabled=("enabled = ?", int(enabled) if enabled is not None else None))
+        return self.mirror.query("integrations", where, params, limit, offset)
+
+    def show_integration(self, integration_id: str) -> Dict[str, Any]:
+        return self._record("integrations", integration_id, "Integration")
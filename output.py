@@ -0,0 +1,62 @@
+import csv
+from typing import Any, Dict, List, Optional
+import click
+import jsoncodec
+
+# Formats accepted by the global --output option; "table" is the human-readable default
+OUTPUT_FORMATS = ("table", "json", "ndjson", "csv", "tsv")
+
+def _cell(value: Any) -> Any:
+    """Flatten a value for a csv/tsv cell; lists use the same ';' separator bulk create accepts."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(str(v) for v in value)
+    if isinstance(value, dict):
+        return jsoncodec.dumps(value)
+    return value
+
+class RecordWriter:
+    """Write records to stdout in a machine-readable format as soon as they arrive.
+
+    ndjson and json emit the full API record; csv and tsv emit the table row the
+    command would display, under the table headers. json streams a single array
+    (or a bare object when writing one item with single=True), so memory stays
+    flat however many records are written.
+    """
+
+    def __init__(self, output: str, headers: Optional[List[str]] = None, single: bool = False, stream=None):
+        self.output = output
+        self.headers = headers
+        self.single = single
+        self.stream = stream or click.get_text_stream("stdout")
+        self.count = 0
+        self._csv = None
+        if output in ("csv", "tsv"):
+            self._csv = csv.writer(self.stream, delimiter="," if output == "csv" else "\t", lineterminator="\n")
+            if headers:
+                self._csv.writerow(headers)
+
+    def write(self, item: Dict[str, Any], row: Optional[List[Any]] = None) -> None:
+        """Write one record; row is required for csv and tsv."""
+        if self._csv is not None:
+            self._csv.writerow([_cell(value) for value in row])
+        elif self.output == "ndjson":
+            self.stream.write(jsoncodec.dumps(item) + "\n")
+        elif self.single:
+            self.stream.write(jsoncodec.dumps(item, indent=True) + "\n")
+        else:
+            self.stream.write(("[\n" if self.count == 0 else ",\n") + jsoncodec.dumps(item))
+        self.count += 1
+
+    def write_many(self, items: List[Dict[str, Any]], rows: Optional[List[List[Any]]] = None) -> None:
+        """Write a batch of records (e.g. one page) and flush it downstream."""
+        for index, item in enumerate(items):
+            self.write(item, rows[index] if rows is not None else None)
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Finish the output, closing the json array if one was started."""
+        if self.output == "json" and not self.single:
+            self.stream.write("[]\n" if self.count == 0 else "\n]\n")
+        self.stream.flush()
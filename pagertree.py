@@ -2,24 +2,110 @@
 
 import click
 import os
+import sys
 import importlib
-import pkgutil
 import logging
 from dotenv import load_dotenv
-from api import PagerTreeClient
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Prebuilt command manifest: group name -> (module, short help). Lets --help and
+# dispatch work without importing every command module. Keep in sync with
+# commands/; scripts/check_startup.py verifies it.
+COMMAND_MANIFEST = {
+    "agent": ("commands.agent", "Run a background agent that serves CLI commands over a Unix socket."),
+    "alerts": ("commands.alerts", "Commands for managing PagerTree alerts."),
+    "broadcasts": ("commands.broadcasts", "Commands for managing PagerTree broadcasts."),
+    "export": ("commands.export", "Export resources to chunked, compressed files that can resume after a failure."),
+    "integrations": ("commands.integrations", "Commands for managing PagerTree integrations."),
+    "relay": ("commands.relay", "Turn events from stdin, a Unix socket or syslog into alert actions."),
+    "shell": ("commands.shell", "Interactive shell that keeps one warm client between commands."),
+    "sync": ("commands.sync", "Mirror alerts, users, teams and integrations into a local SQLite database."),
+    "teams": ("commands.teams", "Commands for managing PagerTree teams."),
+    "users": ("commands.users", "Commands for managing PagerTree users."),
+}
+
+def discover_command_modules():
+    """Return command module names found in the commands/ directory."""
+    import pkgutil
+    commands_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "commands")
+    return [module_name for _, module_name, _ in pkgutil.iter_modules([commands_dir])]
+
+class LazyGroup(click.Group):
+    """Click group that imports a command module only when its command is used."""
+
+    def __init__(self, *args, manifest=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest or {}
+
+    def list_commands(self, ctx):
+        names = set(super().list_commands(ctx)) | set(self.manifest)
+        # Modules missing from the manifest are still picked up, at the cost of a directory scan
+        names.update(discover_command_modules())
+        return sorted(names)
+
+    def get_command(self, ctx, cmd_name):
+        command = super().get_command(ctx, cmd_name)
+        if command is not None:
+            return command
+        module_name = self.manifest.get(cmd_name, (f"commands.{cmd_name}", None))[0]
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+            return None
+        command = getattr(module, cmd_name, None)  # Check if the module has a group with the same name
+        if isinstance(command, click.Command):
+            self.add_command(command, cmd_name)
+            return command
+        return None
+
+    def format_commands(self, ctx, formatter):
+        # Use manifest help so listing commands does not import them
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.manifest and name not in self.commands:
+                rows.append((name, self.manifest[name][1]))
+                continue
+            command = self.get_command(ctx, name)
+            if command is not None and not command.hidden:
+                rows.append((name, command.get_short_help_str(formatter.width - 6 - len(name))))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
 class ContextObject:
     """Context object to hold client and configuration."""
-    def __init__(self, client, logger, verbose=False):
-        self.client = client
+    def __init__(self, client=None, logger=None, verbose=False, client_factory=None, output="table"):
+        self._client = client
+        self._client_factory = client_factory
         self.logger = logger
         self.verbose = verbose
+        self.output = output
+
+    @property
+    def client(self):
+        """PagerTreeClient, built on first use so commands that never call the API skip its imports."""
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client
 
-@click.group()
+def build_client(cache=False):
+    """Create a PagerTreeClient from environment configuration."""
+    from api import PagerTreeClient
+    from cache import ResponseCache
+    from alias_index import AliasIndex
+    return PagerTreeClient(cache=ResponseCache.from_env() if cache else None, alias_index=AliasIndex.from_env())
+
+def build_mirror_client():
+    """Create a read-only client backed by the local mirror."""
+    from mirror import Mirror, MirrorClient
+    return MirrorClient(Mirror.from_env())
+
+@click.group(cls=LazyGroup, manifest=COMMAND_MANIFEST)
 @click.option(
     "--config", "-c",
     type=click.Path(exists=True, dir_okay=False, readable=True),
@@ -31,14 +117,48 @@ class ContextObject:
     is_flag=True,
     help="Enable verbose output"
 )
+@click.option(
+    "--cache",
+    is_flag=True,
+    help="Cache GET responses on disk and revalidate them with the server"
+)
+@click.option(
+    "--local",
+    is_flag=True,
+    envvar="PAGERTREE_LOCAL",
+    help="Answer list and show commands from the mirror built by `pagertree sync`"
+)
+@click.option(
+    "--trace-http",
+    is_flag=True,
+    envvar="PAGERTREE_TRACE_HTTP",
+    help="Print per-endpoint request counts and latency percentiles to stderr on exit"
+)
+@click.option(
+    "--trace-http-json",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the HTTP trace summary and every request record as JSON to this file"
+)
+@click.option(
+    "--output", "-o",
+    type=click.Choice(["table", "json", "ndjson", "csv", "tsv"]),
+    default="table",
+    envvar="PAGERTREE_OUTPUT",
+    help="Output format for list and show commands"
+)
 @click.pass_context
-def cli(ctx, config, verbose):
+def cli(ctx, config, verbose, cache, local, trace_http, trace_http_json, output):
     """PagerTree CLI Tool - Manage alerts from the command line."""
 
+    # A long-lived session (e.g. `pagertree shell`) passes its context object in;
+    # its environment is already loaded and its client stays warm across commands
+    session = ctx.obj if isinstance(ctx.obj, ContextObject) else None
+
     # Load .env file if provided or check for default .env
-    config = config or ('.env' if os.path.exists('.env') else None)
-    logger.info(f"Loading .env from {config}" if config else "No .env file provided; relying on system environment variables")
-    load_dotenv(dotenv_path=config, verbose=True)
+    if session is None or config:
+        config = config or ('.env' if os.path.exists('.env') else None)
+        logger.info(f"Loading .env from {config}" if config else "No .env file provided; relying on system environment variables")
+        load_dotenv(dotenv_path=config, verbose=True)
 
     # Determine verbose setting: command-line flag takes precedence over env var
     env_verbose = os.getenv("PAGERTREE_VERBOSE", "false").lower() in ("true", "1", "t")
@@ -48,18 +168,42 @@ def cli(ctx, config, verbose):
     logger.setLevel(logging.DEBUG if verbose else logging.INFO)
     logger.debug("Verbose mode enabled")
 
-    # Initialize PagerTreeClient
-    client = PagerTreeClient()
-    
-    # Store context object
-    ctx.obj = ContextObject(client=client, logger=logger, verbose=verbose)
+    # Determine cache setting: command-line flag takes precedence over env var
+    env_cache = os.getenv("PAGERTREE_CACHE", "false").lower() in ("true", "1", "t")
+    cache = cache or env_cache
+
+    # Fail fast on missing credentials; the client itself is built on first use
+    if not os.getenv('PAGERTREE_API_KEY'):
+        raise click.UsageError("PAGERTREE_API_KEY must be provided via environment variable or .env config file")
+
+    # Choose where the client comes from: the local mirror, an enclosing session, or a new API client
+    if local:
+        client_factory = build_mirror_client
+    elif session is not None:
+        client_factory = lambda: session.client
+    else:
+        client_factory = lambda: build_client(cache=cache)
 
-# Dynamically register all command groups from the 'commands' package
-commands_dir = os.path.join(os.path.dirname(__file__), "commands")
-for _, module_name, _ in pkgutil.iter_modules([commands_dir]):
-    module = importlib.import_module(f"commands.{module_name}")
-    if hasattr(module, module_name):  # Check if the module has a group with the same name
-        cli.add_command(getattr(module, module_name))
+    # Trace every HTTP request made by the client and report when the command finishes
+    if (trace_http or trace_http_json) and local:
+        click.echo("Warning: --trace-http is ignored with --local; the mirror makes no HTTP requests", err=True)
+    elif trace_http or trace_http_json:
+        from tracing import HttpTracer
+        tracer = HttpTracer()
+        client_factory = lambda factory=client_factory: tracer.attach(factory())
+
+        def report_trace():
+            tracer.detach()
+            tracer.report(sys.stderr, json_path=trace_http_json)
+        ctx.call_on_close(report_trace)
+
+    # Store context object
+    ctx.obj = ContextObject(client_factory=client_factory, logger=logger, verbose=verbose, output=output)
 
 if __name__ == "__main__":
-    cli()
\ No newline at end of file
+    # Hand the command to a running `pagertree agent` if there is one
+    from agent import run_via_agent
+    exit_code = run_via_agent(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    cli()
@@ -0,0 +1,328 @@
+import queue
+import re
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import jsoncodec
+import requests
+from alias_index import STALE_ALIAS_STATUS_CODES, TERMINAL_STATUSES
+from api import DUPLICATE_ACTIONS
+
+# Actions a rule can take and the client method each one calls
+ACTIONS = {"create": "create_alert", "acknowledge": "acknowledge_alert", "resolve": "resolve_alert"}
+
+# Counter incremented, and alert status left behind, by each non-create action
+OUTCOMES = {"acknowledge": ("acknowledged", "acknowledged"), "resolve": ("resolved", "resolved")}
+
+# Alert fields a create rule may template; list fields take a list of templates
+ALERT_FIELDS = ("title", "description", "alias", "urgency", "tags", "team_ids",
+                "destination_router_ids", "destination_account_user_ids")
+LIST_FIELDS = ("tags", "team_ids", "destination_router_ids", "destination_account_user_ids")
+
+SYSLOG_SEVERITIES = ("emerg", "alert", "crit", "err", "warning", "notice", "info", "debug")
+# <PRI>VERSION TIMESTAMP HOST APP PROCID MSGID [SD] MSG (RFC 5424), or <PRI>Mmm dd hh:mm:ss HOST TAG: MSG (RFC 3164)
+SYSLOG_5424 = re.compile(r"^<(\d{1,3})>1 (\S+) (\S+) (\S+) (\S+) (\S+) (?:-|(?:\[.*?\])+) ?(.*)$", re.S)
+SYSLOG_3164 = re.compile(r"^<(\d{1,3})>(\w{3} [ \d]\d \d\d:\d\d:\d\d) (\S+) ([^:\[\s]+)(?:\[(\d+)\])?: ?(.*)$", re.S)
+
+class _Fields(dict):
+    """Template namespace where unknown fields render as empty strings."""
+
+    def __missing__(self, key):
+        return ""
+
+def parse_event(line: str) -> Dict[str, Any]:
+    """Turn one input line into an event: a JSON object, a syslog message, or {"message": line}."""
+    line = line.rstrip("\r\n")
+    if line.startswith("{"):
+        try:
+            event = jsoncodec.loads(line)
+            if isinstance(event, dict):
+                return event
+        except ValueError:
+            pass
+    if line.startswith("<"):
+        match = SYSLOG_5424.match(line)
+        if match:
+            pri, timestamp, host, app, procid, _, message = match.groups()
+            return _syslog_event(pri, timestamp, host, app, procid, message, line)
+        match = SYSLOG_3164.match(line)
+        if match:
+            pri, timestamp, host, app, procid, message = match.groups()
+            return _syslog_event(pri, timestamp, host, app, procid, message, line)
+    return {"message": line}
+
+def _syslog_event(pri, timestamp, host, app, procid, message, raw) -> Dict[str, Any]:
+    pri = int(pri)
+    return {"facility": pri >> 3, "severity": SYSLOG_SEVERITIES[pri & 7], "timestamp": timestamp,
+            "host": host, "app": app, "procid": procid if procid not in (None, "-") else "",
+            "message": message, "raw": raw}
+
+class Rule:
+    """One entry of a rule file: field patterns to match and the alert action to take.
+
+    `match` maps event fields to regular expressions that must all match
+    (re.search); named groups join the event fields available to templates,
+    which use str.format syntax such as "Disk full on {host}".
+    """
+
+    def __init__(self, spec: Dict[str, Any], defaults: Optional[Dict[str, Any]] = None, index: int = 0):
+        self.name = spec.get("name") or f"rule {index + 1}"
+        self.action = spec.get("action", "create")
+        if self.action not in ACTIONS:
+            raise ValueError(f"{self.name}: action must be one of {', '.join(ACTIONS)}")
+        try:
+            self.match = [(field, re.compile(pattern)) for field, pattern in (spec.get("match") or {}).items()]
+        except re.error as e:
+            raise ValueError(f"{self.name}: invalid pattern: {e}")
+        if self.action == "create":
+            alert = dict(defaults or {}, **(spec.get("alert") or {}))
+            unknown = set(alert) - set(ALERT_FIELDS)
+            if unknown:
+                raise ValueError(f"{self.name}: unknown alert field(s): {', '.join(sorted(unknown))}")
+            if not alert.get("title"):
+                raise ValueError(f"{self.name}: create rules need an alert title")
+            self.alert = alert
+        elif not spec.get("alias"):
+            raise ValueError(f"{self.name}: {self.action} rules need an alias")
+        self.alias = spec.get("alias")
+        self.on_duplicate = spec.get("on_duplicate", "skip")
+        if self.on_duplicate not in DUPLICATE_ACTIONS:
+            raise ValueError(f"{self.name}: on_duplicate must be one of {', '.join(DUPLICATE_ACTIONS)}")
+        self.dedupe_window = spec.get("dedupe_window")
+        if self.dedupe_window is not None and (isinstance(self.dedupe_window, bool)
+                                               or not isinstance(self.dedupe_window, (int, float))):
+            raise ValueError(f"{self.name}: dedupe_window must be a number of seconds")
+
+    def matches(self, event: Dict[str, Any]) -> Optional[_Fields]:
+        """Return the template fields if every pattern matches event, else None."""
+        fields = _Fields(event)
+        for field, pattern in self.match:
+            value = event.get(field)
+            if value is None:
+                return None
+            found = pattern.search(value if isinstance(value, str) else str(value))
+            if found is None:
+                return None
+            fields.update({key: group for key, group in found.groupdict().items() if group is not None})
+        return fields
+
+    def render(self, fields: _Fields) -> Dict[str, Any]:
+        """Build create_alert keyword arguments from the alert templates."""
+        kwargs = {}
+        for key, template in self.alert.items():
+            if key in LIST_FIELDS:
+                values = [str(item).format_map(fields) for item in (template if isinstance(template, list) else [template])]
+                kwargs[key] = [value for value in values if value]
+            else:
+                kwargs[key] = str(template).format_map(fields) or None
+        kwargs["on_duplicate"] = self.on_duplicate
+        if self.dedupe_window is not None:
+            kwargs["dedupe_window"] = float(self.dedupe_window)
+        return kwargs
+
+def load_rules(path: str) -> List[Rule]:
+    """Read a JSON rule file: {"defaults": {...alert fields...}, "rules": [{...}, ...]}."""
+    with open(path, "rb") as f:
+        try:
+            spec = jsoncodec.loads(f.read())
+        except ValueError as e:
+            raise ValueError(f"{path} is not valid JSON: {e}")
+    if not isinstance(spec, dict) or not isinstance(spec.get("rules"), list) or not spec["rules"]:
+        raise ValueError(f"{path} must hold an object with a non-empty \"rules\" list")
+    return [Rule(rule, spec.get("defaults"), index) for index, rule in enumerate(spec["rules"])]
+
+class Relay:
+    """Match events against rules and apply them on a worker pool sharing one client.
+
+    Sources call submit(), which picks the first matching rule and renders the
+    alias it acts on; events matching no rule are counted and discarded without
+    calling the API. Each alias is routed to one worker's bounded queue, so
+    events for the same alias (a create followed by its resolve) are applied in
+    the order they arrived. Stream sources block when that queue is full, so a
+    fast producer is slowed to the rate the API accepts, while datagram sources
+    (which cannot be paused) drop events and count them.
+    """
+
+    def __init__(self, client, rules: List[Rule], workers: int = 8, queue_size: int = 1000):
+        self.client = client
+        self.rules = rules
+        self.workers = workers
+        self.queues: "List[queue.Queue[Optional[Tuple[Rule, Any]]]]" = [
+            queue.Queue(maxsize=max(1, queue_size // workers)) for _ in range(workers)]
+        self.stats = Counter()
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self.errors: "queue.Queue[Tuple[str, str]]" = queue.Queue(maxsize=100)
+
+    def start(self) -> "Relay":
+        for number, work in enumerate(self.queues):
+            thread = threading.Thread(target=self._work, args=(work,), name=f"relay-worker-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[name] += amount
+
+    def submit(self, event: Dict[str, Any], block: bool = True) -> bool:
+        """Queue an event; without block, drop it (and return False) when its queue is full."""
+        self.count("received")
+        rule = None
+        try:
+            routed = self._route(event)
+            if routed is None:
+                self._finish("unmatched")
+                return True
+            rule, target, key = routed
+        except Exception as e:
+            self._fail(rule, e)
+            return True
+        try:
+            self.queues[hash(key) % len(self.queues)].put((rule, target), block=block)
+        except queue.Full:
+            self.count("dropped")
+            return False
+        return True
+
+    def _work(self, work: "queue.Queue[Optional[Tuple[Rule, Any]]]") -> None:
+        while True:
+            item = work.get()
+            try:
+                if item is None:
+                    return
+                self._apply(*item)
+            finally:
+                work.task_done()
+
+    def _route(self, event: Dict[str, Any]) -> Optional[Tuple[Rule, Any, str]]:
+        """Return the first matching rule, what it acts on and the key that orders it, or None."""
+        for rule in self.rules:
+            fields = rule.matches(event)
+            if fields is not None:
+                break
+        else:
+            return None
+        if rule.action == "create":
+            kwargs = rule.render(fields)
+            return rule, kwargs, kwargs.get("alias") or kwargs.get("title") or ""
+        alias = rule.alias.format_map(fields)
+        return rule, alias, alias
+
+    def handle(self, event: Dict[str, Any]) -> Optional[str]:
+        """Apply the first matching rule to event in this thread and return the counter it incremented."""
+        rule = None
+        try:
+            routed = self._route(event)
+            if routed is None:
+                return self._finish("unmatched")
+            rule, target, _ = routed
+        except Exception as e:
+            return self._fail(rule, e)
+        return self._apply(rule, target)
+
+    def _apply(self, rule: Rule, target: Any) -> str:
+        """Run rule's action with the rendered create arguments or alias; return the counter incremented."""
+        try:
+            if rule.action == "create":
+                result = self.client.create_alert(**target)
+                outcome = "deduplicated" if result.get("deduplicated") else "created"
+            else:
+                outcome = self._act(rule.action, target)
+        except Exception as e:
+            return self._fail(rule, e)
+        return self._finish(outcome)
+
+    def _fail(self, rule: Optional[Rule], error: Exception) -> str:
+        from utils import format_api_error
+        try:
+            self.errors.put_nowait((rule.name if rule is not None else "rules", format_api_error(error)))
+        except queue.Full:
+            pass
+        return self._finish("failed")
+
+    def _act(self, action: str, alias: str) -> str:
+        """Acknowledge or resolve the newest live alert with alias and return the counter to increment.
+
+        The alias index is tried first. If the indexed alert rejects the action
+        or turns out to be closed already, the entry is dropped and the alias is
+        looked up remotely once, as `alerts acknowledge/resolve --alias` do.
+        """
+        method = getattr(self.client, ACTIONS[action])
+        outcome, status = OUTCOMES[action]
+        alias_index = getattr(self.client, "alias_index", None)
+        alert_id = alias_index.lookup(alias) if alias_index is not None else None
+        if alert_id is not None:
+            try:
+                result = method(alert_id)
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code not in STALE_ALIAS_STATUS_CODES:
+                    raise
+            else:
+                if result.get("status") not in TERMINAL_STATUSES or result.get("status") == status:
+                    return outcome
+            alias_index.forget(alert_id)
+        alerts = self.client.list_alerts(alias=alias, limit=1)["data"]
+        if not alerts or alerts[0].get("status") in TERMINAL_STATUSES or alerts[0]["id"] == alert_id:
+            return "no_alert"
+        method(alerts[0]["id"])
+        return outcome
+
+    def _finish(self, outcome: str) -> str:
+        with self._lock:
+            self.stats[outcome] += 1
+            self.stats["processed"] += 1
+        return outcome
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus queue depth, uptime and the processing rate so far."""
+        with self._lock:
+            stats = dict(self.stats)
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {**stats, "queue": sum(work.qsize() for work in self.queues),
+                "queue_size": sum(work.maxsize for work in self.queues),
+                "seconds": elapsed, "rate": stats.get("processed", 0) / elapsed}
+
+    def close(self) -> None:
+        """Finish the queued events and stop the workers."""
+        for work in self.queues[:len(self._threads)]:
+            work.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+class _StreamHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            line = line.decode("utf-8", errors="replace")
+            if line.strip():
+                self.server.relay.submit(parse_event(line))
+
+class _DatagramHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        for line in self.request[0].decode("utf-8", errors="replace").splitlines():
+            if line.strip():
+                self.server.relay.submit(parse_event(line), block=False)
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class UnixLineServer(socketserver.ThreadingUnixStreamServer):
+        """Accept newline-delimited events on a Unix socket; full queues block the sender."""
+
+        daemon_threads = True
+
+        def __init__(self, path: str, relay: Relay):
+            self.relay = relay
+            super().__init__(path, _StreamHandler)
+
+class SyslogServer(socketserver.UDPServer):
+    """Receive syslog (or JSON/plain) datagrams; events are dropped when the queue is full."""
+
+    def __init__(self, address: Tuple[str, int], relay: Relay):
+        self.relay = relay
+        host = address[0]
+        self.address_family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        super().__init__(address, _DatagramHandler)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""Benchmark CLI start-up, client and command hot paths against the local mock API.
+
+Starts scripts/mock_api.py in-process on a free port, runs each benchmark a few
+times and reports the median, fastest and slowest wall time (and throughput
+where it applies). Results can be saved as JSON and compared against a saved
+baseline; a benchmark whose median is slower than the baseline by more than
+the threshold is reported as a regression and makes the run fail.
+
+Usage:
+  python scripts/benchmark.py [--runs 5] [--only list_alerts_pages] [--save results.json]
+  python scripts/benchmark.py --compare baseline.json [--threshold 0.25]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import mock_api  # noqa: E402
+
+ALERTS = 20000
+ROSTER_SIZE = 500
+WIDE_COLUMNS = 40
+BULK_ALERTS = 400
+
+class Bench:
+    """Shared fixtures: the running mock server and a scratch directory."""
+
+    def __init__(self):
+        fixtures = mock_api.generate_fixtures(alerts=ALERTS, users=ROSTER_SIZE * 2, teams=10)
+        self.roster_team = fixtures["teams"][0]
+        self.roster_team["member_account_user_ids"] = [user["id"] for user in fixtures["account_users"][:ROSTER_SIZE]]
+        self.roster_team["admin_account_user_ids"] = self.roster_team["member_account_user_ids"][:10]
+        self.state = mock_api.MockState(fixtures)
+        self.server = mock_api.serve(self.state, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.scratch = tempfile.mkdtemp(prefix="pagertree-bench-")
+        self.env = {
+            "PAGERTREE_BASE_URL": f"http://127.0.0.1:{self.server.server_address[1]}{mock_api.BASE_PATH}",
+            "PAGERTREE_API_KEY": "benchmark",
+            "PAGERTREE_CACHE_DIR": self.scratch,
+            "PAGERTREE_AGENT": "false",
+        }
+        os.environ.update(self.env)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def run_cli(args):
+    """Run `pagertree <args>` in this process with its output discarded."""
+    import pagertree
+    logging.disable(logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        try:
+            pagertree.cli.main(list(args), prog_name="pagertree", standalone_mode=False)
+        except SystemExit:
+            pass
+
+def bench_startup(bench, args):
+    """Cold start of `pagertree.py <args>` in a fresh interpreter."""
+    env = dict(os.environ, **bench.env)
+
+    def run():
+        subprocess.run([sys.executable, "pagertree.py", *args], cwd=ROOT, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return run, None, None
+
+def bench_list_alerts_pages(bench):
+    """Page through every alert with list_alerts (100 per page, 4 in parallel)."""
+    from api import PagerTreeClient
+
+    def run():
+        client = PagerTreeClient()
+        count = sum(1 for _ in client.iter_records(client.list_alerts, page_size=100, concurrency=4))
+        assert count == ALERTS, count
+    return run, ALERTS, "alerts/s"
+
+def bench_teams_show_roster(bench):
+    """`teams show` for a team with a large member roster."""
+    return (lambda: run_cli(["teams", "show", bench.roster_team["id"]])), None, None
+
+def _wide_records(count):
+    return [{f"field_{column:02d}": f"value {row}-{column} " + "x" * (column % 7) * 5 for column in range(WIDE_COLUMNS)}
+            for row in range(count)]
+
+def bench_format_item_details(bench):
+    """format_item_details on a record with many fields, rendered as a table."""
+    from utils import format_item_details
+    item = dict(_wide_records(1)[0], tags=["prod", "db"], nested={"a": 1}, enabled=True, missing=None)
+    fields = {name: name.replace("_", " ").title() for name in item}
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(50):
+                format_item_details(item, fields)
+    return run, 50, "items/s"
+
+def bench_display_paginated_results(bench, output):
+    """display_paginated_results for a page of wide rows."""
+    from utils import display_paginated_results
+    items = _wide_records(100)
+    headers = list(items[0])
+    rows = [list(item.values()) for item in items]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            display_paginated_results(items, len(items), 100, 0, item_type="record", table_headers=headers,
+                                      table_data=rows, output=output)
+    return run, len(items), "rows/s"
+
+def bench_bulk_acknowledge(bench):
+    """`alerts acknowledge --alias-prefix` acting on many alerts in parallel."""
+    alerts = bench.state.collections["alerts"]
+    prefix = "bench-ack-"
+    targets = [alerts.by_id[record["id"]] for record in alerts.records[-BULK_ALERTS:]]
+    for index, alert in enumerate(targets):
+        alert["thirdparty_id"] = f"{prefix}{index}"
+
+    def run():
+        with bench.state.lock:
+            for alert in targets:
+                alert["status"] = "open"
+            alerts.changed()
+        run_cli(["alerts", "acknowledge", "--status", "open", "--alias-prefix", prefix])
+    return run, BULK_ALERTS, "alerts/s"
+
+def bench_bulk_create(bench):
+    """`alerts create --from-file` for an NDJSON file of alerts."""
+    source = os.path.join(bench.scratch, "alerts.ndjson")
+    with open(source, "w") as f:
+        for index in range(BULK_ALERTS):
+            f.write(json.dumps({"title": f"Benchmark alert {index}", "urgency": "low"}) + "\n")
+    results = os.path.join(bench.scratch, "results.ndjson")
+    return (lambda: run_cli(["alerts", "create", "--from-file", source, "--results", results]),
+            BULK_ALERTS, "alerts/s")
+
+def benchmarks():
+    """Return (name, factory) pairs for every benchmark, in run order."""
+    import pagertree
+    suite = [("startup --help", lambda bench: bench_startup(bench, ["--help"]))]
+    suite += [(f"startup {name} --help", lambda bench, name=name: bench_startup(bench, [name, "--help"]))
+              for name in sorted(pagertree.COMMAND_MANIFEST)]
+    suite += [
+        ("list_alerts_pages", bench_list_alerts_pages),
+        ("teams_show_roster", bench_teams_show_roster),
+        ("format_item_details", bench_format_item_details),
+        ("display_paginated_results table", lambda bench: bench_display_paginated_results(bench, "table")),
+        ("display_paginated_results csv", lambda bench: bench_display_paginated_results(bench, "csv")),
+        ("bulk_acknowledge", bench_bulk_acknowledge),
+        ("bulk_create", bench_bulk_create),
+    ]
+    return suite
+
+def measure(run, runs, warmup=1):
+    """Wall times in milliseconds of runs calls of run, after warmup untimed calls."""
+    for _ in range(warmup):
+        run()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def compare(results, baseline, threshold):
+    """Return (name, baseline ms, current ms, change) for benchmarks slower than the baseline by more than threshold."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        change = result["median_ms"] / previous["median_ms"] - 1
+        if change > threshold:
+            regressions.append((name, previous["median_ms"], result["median_ms"], change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--only", action="append", help="Run only benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file written by --save")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before a regression (0.25 = 25%%)")
+    options = parser.parse_args()
+
+    bench = Bench()
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": options.runs,
+        "benchmarks": {},
+    }
+    try:
+        for name, factory in benchmarks():
+            if options.only and not any(part in name for part in options.only):
+                continue
+            run, items, unit = factory(bench)
+            timings = measure(run, options.runs)
+            median_ms = statistics.median(timings)
+            result = {"median_ms": round(median_ms, 2), "min_ms": round(min(timings), 2), "max_ms": round(max(timings), 2)}
+            if items:
+                result["throughput"] = round(items / (median_ms / 1000), 1)
+                result["unit"] = unit
+            results["benchmarks"][name] = result
+            print(f"{name:40} {median_ms:9.1f} ms  (min {min(timings):.1f}, max {max(timings):.1f})"
+                  + (f"  {result['throughput']:.0f} {unit}" if items else ""))
+    finally:
+        bench.close()
+
+    if options.save:
+        with open(options.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if not options.compare:
+        return 0
+    with open(options.compare) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, options.threshold)
+    for name, before, after, change in regressions:
+        print(f"regression: {name} {before:.1f} ms -> {after:.1f} ms (+{change:.0%})", file=sys.stderr)
+    if not regressions:
+        print(f"No regressions beyond {options.threshold:.0%} against {options.compare}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Check CLI start-up cost and the prebuilt command manifest.
+
+Runs `pagertree.py --help` and `<group> --help` for every manifest entry in fresh
+interpreters, fails if the median wall time exceeds the budget, if help output
+imports modules that should be deferred, or if COMMAND_MANIFEST has drifted
+from the modules in commands/.
+
+Usage: python scripts/check_startup.py [--budget-ms 250] [--runs 5]
+"""
+import argparse
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules that must not be loaded just to print help
+DEFERRED_MODULES = ("requests", "tabulate", "jsonpath_ng", "ply", "sqlite3")
+
+def measure(args, runs, env):
+    """Median wall time in milliseconds of `python pagertree.py <args>`."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "pagertree.py", *args], cwd=ROOT, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def loaded_deferred_modules(args, env):
+    """Return the deferred modules imported while running `pagertree.py <args>`."""
+    probe = (
+        "import sys\n"
+        "import pagertree\n"
+        f"try:\n    pagertree.cli.main({list(args)!r}, standalone_mode=False)\n"
+        "except SystemExit:\n    pass\n"
+        f"print('loaded:' + ','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env, capture_output=True,
+                            text=True, check=True).stdout
+    loaded = [line for line in output.splitlines() if line.startswith("loaded:")][-1]
+    return [name for name in loaded[len("loaded:"):].split(",") if name]
+
+def check_manifest():
+    """Return a list of differences between COMMAND_MANIFEST and commands/."""
+    sys.path.insert(0, ROOT)
+    import pagertree
+    problems = []
+    discovered = set(pagertree.discover_command_modules())
+    for name in sorted(discovered - set(pagertree.COMMAND_MANIFEST)):
+        module = importlib.import_module(f"commands.{name}")
+        if hasattr(module, name):
+            problems.append(f"commands/{name}.py is missing from COMMAND_MANIFEST")
+    for name, (module_name, short_help) in sorted(pagertree.COMMAND_MANIFEST.items()):
+        command = getattr(importlib.import_module(module_name), name, None)
+        if command is None:
+            problems.append(f"{module_name} has no command named {name}")
+        elif command.get_short_help_str(limit=1000) != short_help:
+            problems.append(f"help text for {name} differs from the manifest: {command.get_short_help_str(limit=1000)!r}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("PAGERTREE_STARTUP_BUDGET_MS", "250")))
+    parser.add_argument("--runs", type=int, default=5)
+    options = parser.parse_args()
+
+    env = dict(os.environ, PAGERTREE_API_KEY=os.getenv("PAGERTREE_API_KEY", "startup-check"))
+    failures = check_manifest()
+
+    sys.path.insert(0, ROOT)
+    import pagertree
+    for args in [["--help"]] + [[name, "--help"] for name in sorted(pagertree.COMMAND_MANIFEST)]:
+        median_ms = measure(args, options.runs, env)
+        loaded = loaded_deferred_modules(args, env)
+        status = "ok" if median_ms <= options.budget_ms and not loaded else "FAIL"
+        print(f"{status:4}  {' '.join(args):28} {median_ms:7.1f} ms" + (f"  imports {', '.join(loaded)}" if loaded else ""))
+        if status != "ok":
+            failures.append(f"`{' '.join(args)}` took {median_ms:.1f} ms (budget {options.budget_ms:.0f} ms)"
+                            + (f" and imported {', '.join(loaded)}" if loaded else ""))
+
+    for failure in failures:
+        print(f"error: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
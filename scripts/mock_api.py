@@ -0,0 +1,514 @@
+#!/usr/bin/env python
+"""Local stand-in for the PagerTree v4 API endpoints used by api.py.
+
+Serves alerts (with comments and acknowledge/reject/resolve), broadcasts,
+integrations, teams (with alerts and current_oncall) and account_users from
+generated fixtures, with limit/offset pagination, total_count/has_more, search
+filters, ETag revalidation, configurable latency and jitter, injected 429s and
+an optional fixed-window rate limit. Uses only the standard library.
+
+Usage:
+  python scripts/mock_api.py [--port 8765] [--alerts 100000] [--latency-ms 20 --jitter-ms 10] [--rate-429 0.05]
+  python scripts/mock_api.py --alerts 200000 --save fixtures.json.gz   # generate once
+  python scripts/mock_api.py --fixtures fixtures.json.gz               # serve saved fixtures
+
+  PAGERTREE_BASE_URL=http://127.0.0.1:8765/api/v4 PAGERTREE_API_KEY=test python pagertree.py alerts list
+
+GET /__mock__/stats returns request counts per endpoint; POST /__mock__/reset clears them.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+BASE_PATH = "/api/v4"
+MAX_PAGE_SIZE = 100
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+TITLES = ("High CPU on {host}", "Disk almost full on {host}", "{service} health check failing",
+          "Elevated 5xx rate on {service}", "Replication lag on {host}", "Certificate expiring for {service}",
+          "Queue backlog growing in {service}", "Memory pressure on {host}")
+SERVICES = ("api", "billing", "search", "checkout", "auth", "ingest", "reports", "web")
+SOURCES = ("Datadog", "Prometheus", "CloudWatch", "Email", "Webhook", "Grafana")
+FIRST_NAMES = ("Ada", "Grace", "Linus", "Margaret", "Ken", "Barbara", "Dennis", "Frances", "Alan", "Radia")
+LAST_NAMES = ("Lovelace", "Hopper", "Torvalds", "Hamilton", "Thompson", "Liskov", "Ritchie", "Allen", "Kay", "Perlman")
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+def make_id(rng: random.Random, moment: datetime) -> str:
+    """ULID-shaped identifier: 10 characters of millisecond time and 16 random characters."""
+    millis = int(moment.timestamp() * 1000)
+    time_part = "".join(CROCKFORD[(millis >> shift) & 31] for shift in range(45, -1, -5))
+    return time_part + "".join(rng.choice(CROCKFORD) for _ in range(16))
+
+def generate_fixtures(alerts: int = 1000, users: int = 200, teams: int = 10, integrations: int = 20,
+                      broadcasts: int = 20, seed: int = 1, days: int = 90) -> dict:
+    """Build deterministic fixture records; alerts are spread over the last `days` days, oldest first."""
+    rng = random.Random(seed)
+    start = EPOCH - timedelta(days=days)
+
+    account_users = []
+    for index in range(users):
+        created = start + timedelta(seconds=rng.uniform(0, 86400))
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        account_users.append({
+            "id": make_id(rng, created),
+            "user": {
+                "name": name,
+                "emails": [{"email": f"{name.lower().replace(' ', '.')}.{index}@example.com", "primary": True}],
+                "phones": [{"phone": f"+1555{index:07d}", "primary": True}] if rng.random() < 0.7 else [],
+            },
+            "roles": {"admin": index < max(1, users // 20), "billing": rng.random() < 0.05},
+            "created_at": _iso(created),
+            "updated_at": _iso(created),
+        })
+    user_ids = [user["id"] for user in account_users]
+
+    team_records = []
+    for index in range(teams):
+        created = start + timedelta(seconds=rng.uniform(0, 86400))
+        members = rng.sample(user_ids, min(len(user_ids), rng.randint(3, 12))) if user_ids else []
+        team_records.append({
+            "id": make_id(rng, created),
+            "name": f"{SERVICES[index % len(SERVICES)].capitalize()} Team {index}",
+            "notes": None,
+            "member_account_user_ids": members,
+            "admin_account_user_ids": members[:2],
+            "created_at": _iso(created),
+            "updated_at": _iso(created),
+        })
+    team_ids = [team["id"] for team in team_records]
+
+    integration_records = []
+    for index in range(integrations):
+        created = start + timedelta(seconds=rng.uniform(0, 86400 * days))
+        source = rng.choice(SOURCES)
+        integration_records.append({
+            "id": make_id(rng, created),
+            "name": f"{source} {index}",
+            "integration_type": {"name": source},
+            "enabled": rng.random() < 0.8,
+            "created_at": _iso(created),
+            "updated_at": _iso(created),
+        })
+
+    broadcast_records = []
+    for index in range(broadcasts):
+        created = start + timedelta(seconds=rng.uniform(0, 86400 * days))
+        broadcast_records.append({
+            "id": make_id(rng, created),
+            "title": f"Maintenance window {index}",
+            "description": "Planned maintenance; expect brief interruptions.",
+            "status": rng.choice(("draft", "sent", "completed")),
+            "destination_team_ids": rng.sample(team_ids, 1) if team_ids else [],
+            "destination_account_user_ids": [],
+            "created_at": _iso(created),
+            "updated_at": _iso(created),
+        })
+
+    alert_records = []
+    step = days * 86400 / max(alerts, 1)
+    for index in range(alerts):
+        created = start + timedelta(seconds=index * step + rng.uniform(0, step))
+        status = rng.choices(("resolved", "dropped", "acknowledged", "open"), weights=(80, 5, 8, 7))[0]
+        alert = {
+            "id": make_id(rng, created),
+            "tiny_id": index + 1,
+            "title": rng.choice(TITLES).format(host=f"host-{rng.randint(1, 400):03d}", service=rng.choice(SERVICES)),
+            "description": None,
+            "status": status,
+            "urgency": rng.choices(("low", "medium", "high", "critical"), weights=(30, 45, 20, 5))[0],
+            "thirdparty_id": f"alias-{index}",
+            "source": rng.choice(SOURCES),
+            "tags": rng.sample(("prod", "staging", "db", "network", "customer"), rng.randint(0, 2)),
+            "destination_team_ids": [rng.choice(team_ids)] if team_ids else [],
+            "destination_router_ids": [],
+            "destination_account_user_ids": [],
+            "created_at": _iso(created),
+            "updated_at": _iso(created),
+        }
+        if status in ("acknowledged", "resolved"):
+            acknowledged = created + timedelta(seconds=rng.expovariate(1 / 300))
+            alert["acknowledged_at"] = alert["updated_at"] = _iso(acknowledged)
+            if status == "resolved":
+                resolved = acknowledged + timedelta(seconds=rng.expovariate(1 / 3600))
+                alert["resolved_at"] = alert["updated_at"] = _iso(resolved)
+        elif status == "dropped":
+            alert["updated_at"] = _iso(created + timedelta(seconds=rng.uniform(10, 600)))
+        alert_records.append(alert)
+
+    return {"seed": seed, "alerts": alert_records, "account_users": account_users, "teams": team_records,
+            "integrations": integration_records, "broadcasts": broadcast_records}
+
+class Collection:
+    """Records of one resource, listed newest first, with cached filtered views."""
+
+    def __init__(self, records, search_fields=()):
+        self.records = list(records)  # Oldest first; new records are appended
+        self.by_id = {record["id"]: record for record in self.records}
+        self.search_fields = search_fields
+        self.version = 0
+        self._views = {}
+
+    def changed(self) -> None:
+        self.version += 1
+        self._views.clear()
+
+    def add(self, record) -> None:
+        self.records.append(record)
+        self.by_id[record["id"]] = record
+        self.changed()
+
+    def remove(self, record_id) -> bool:
+        record = self.by_id.pop(record_id, None)
+        if record is None:
+            return False
+        self.records.remove(record)
+        self.changed()
+        return True
+
+    def view(self, filters):
+        """Return the records matching filters (newest first), memoized until the collection changes."""
+        key = tuple(sorted(filters.items()))
+        view = self._views.get(key)
+        if view is None:
+            view = self.records[::-1]
+            for name, value in filters.items():
+                if name == "q":
+                    needle = value.lower()
+                    view = [record for record in view
+                            if any(needle in str(_field(record, field) or "").lower() for field in self.search_fields)]
+                elif name == "enabled":
+                    wanted = value.lower() in ("1", "true")
+                    view = [record for record in view if bool(record.get("enabled")) == wanted]
+                else:
+                    view = [record for record in view if str(record.get(name)) == value]
+            self._views[key] = view
+        return view
+
+def _field(record, path):
+    for key in path.split("."):
+        record = record.get(key) if isinstance(record, dict) else None
+    return record
+
+class MockState:
+    """All fixtures plus the behaviour knobs and request counters."""
+
+    def __init__(self, fixtures, latency_ms=0.0, jitter_ms=0.0, rate_429=0.0, retry_after=1.0,
+                 rate_limit=0, rate_window=60.0, comments_per_alert=2, seed=1):
+        self.lock = threading.Lock()
+        self.collections = {
+            "alerts": Collection(fixtures["alerts"], ("title", "source", "thirdparty_id", "tags")),
+            "account_users": Collection(fixtures["account_users"], ("user.name", "user.emails")),
+            "teams": Collection(fixtures["teams"], ("name",)),
+            "integrations": Collection(fixtures["integrations"], ("name", "integration_type.name")),
+            "broadcasts": Collection(fixtures["broadcasts"], ("title",)),
+        }
+        self.comments = {}
+        self.comments_per_alert = comments_per_alert
+        self.seed = seed
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.window_started = time.time()
+        self.window_count = 0
+        self.counts = Counter()
+        self.random = random.Random(seed)
+
+    def alert_comments(self, alert_id):
+        """Comments of an alert, generated deterministically the first time they are asked for."""
+        comments = self.comments.get(alert_id)
+        if comments is None:
+            rng = random.Random(f"{self.seed}:{alert_id}")
+            alert = self.collections["alerts"].by_id[alert_id]
+            created = datetime.strptime(alert["created_at"], "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+            comments = []
+            for index in range(rng.randint(0, self.comments_per_alert * 2)):
+                moment = created + timedelta(seconds=rng.uniform(30, 7200))
+                comments.append({"id": make_id(rng, moment), "body": f"Investigating ({index + 1})",
+                                 "created_by_name": rng.choice(FIRST_NAMES), "created_at": _iso(moment)})
+            comments.sort(key=lambda comment: comment["created_at"])
+            comments = self.comments[alert_id] = Collection(comments)
+        return comments
+
+    def throttle(self):
+        """Return (status, headers) for a throttled request, or (None, headers) to serve it."""
+        headers = {}
+        with self.lock:
+            if self.rate_limit:
+                now = time.time()
+                if now - self.window_started >= self.rate_window:
+                    self.window_started, self.window_count = now, 0
+                self.window_count += 1
+                reset = self.window_started + self.rate_window
+                headers["X-RateLimit-Limit"] = str(self.rate_limit)
+                headers["X-RateLimit-Remaining"] = str(max(0, self.rate_limit - self.window_count))
+                headers["X-RateLimit-Reset"] = str(int(reset))
+                if self.window_count > self.rate_limit:
+                    headers["Retry-After"] = str(max(1, int(reset - now + 1)))
+                    return 429, headers
+            if self.rate_429 and self.random.random() < self.rate_429:
+                headers["Retry-After"] = str(self.retry_after)
+                return 429, headers
+        return None, headers
+
+    def delay(self):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+
+def _page(records, query):
+    limit = min(MAX_PAGE_SIZE, max(1, int(query.get("limit", 10))))
+    offset = max(0, int(query.get("offset", 0)))
+    return {"data": records[offset:offset + limit], "total_count": len(records),
+            "has_more": offset + limit < len(records)}
+
+def _template(path):
+    return re.sub(r"/(?=[^/]*\d)[A-Za-z0-9_-]+", "/{id}", path)
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: MockState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        payload = b"" if body is None else json.dumps(body, separators=(",", ":")).encode("utf-8")
+        headers = dict(headers or {})
+        if self.command == "GET" and status == 200:
+            etag = '"' + hashlib.md5(payload).hexdigest() + '"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+        self.send_response(status)
+        if payload:
+            self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def _handle(self):
+        state = self.state
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip("/")
+
+        if path == "/__mock__/stats":
+            with state.lock:
+                return self._send(200, {"requests": sum(state.counts.values()), "endpoints": dict(state.counts)})
+        if path == "/__mock__/reset":
+            with state.lock:
+                state.counts.clear()
+            return self._send(200, {"reset": True})
+
+        body = self._body() if self.command in ("POST", "PUT") else {}
+        if not path.startswith(BASE_PATH):
+            return self._send(404, {"errors": ["Not found"]})
+        path = path[len(BASE_PATH):]
+        with state.lock:
+            state.counts[f"{self.command} {_template(path)}"] += 1
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self._send(401, {"errors": ["Missing API key"]})
+        status, headers = state.throttle()
+        if status:
+            return self._send(status, {"errors": ["Rate limit exceeded"]}, headers)
+        state.delay()
+        if body is None:
+            return self._send(400, {"errors": ["Invalid JSON"]}, headers)
+        try:
+            status, result = self._route(state, self.command, path.strip("/").split("/"), query, body)
+        except (KeyError, ValueError) as e:
+            status, result = 422, {"errors": [f"Invalid request: {e}"]}
+        self._send(status, result, headers)
+
+    def _route(self, state, method, parts, query, body):
+        collection_name = parts[0] if parts else ""
+        collection = state.collections.get(collection_name)
+        if collection is None:
+            return 404, {"errors": ["Not found"]}
+        filters = {key: value for key, value in query.items() if key in ("status", "q", "thirdparty_id", "enabled")}
+
+        with state.lock:
+            if len(parts) == 1:
+                if method == "GET":
+                    return 200, _page(collection.view(filters), query)
+                if method == "POST":
+                    return 201, self._create(state, collection_name, body)
+                return 405, {"errors": ["Method not allowed"]}
+
+            record = collection.by_id.get(parts[1])
+            if record is None:
+                return 404, {"errors": [f"{collection_name[:-1]} not found"]}
+            if len(parts) == 2:
+                if method == "GET":
+                    return 200, record
+                if method == "PUT":
+                    self._update(record, body)
+                    collection.changed()
+                    return 200, record
+                if method == "DELETE":
+                    collection.remove(record["id"])
+                    return 204, None
+                return 405, {"errors": ["Method not allowed"]}
+
+            action = parts[2]
+            if collection_name == "alerts" and action in ("acknowledge", "reject", "resolve") and method == "POST":
+                now = _now()
+                record["status"] = {"acknowledge": "acknowledged", "reject": "dropped", "resolve": "resolved"}[action]
+                record["updated_at"] = now
+                record.setdefault("acknowledged_at", now) if action == "acknowledge" else None
+                if action == "resolve":
+                    record["resolved_at"] = now
+                collection.changed()
+                return 200, record
+            if collection_name == "alerts" and action == "comments":
+                comments = state.alert_comments(record["id"])
+                if method == "POST":
+                    comment = {"id": make_id(state.random, datetime.now(timezone.utc)), "body": body["body"],
+                               "created_by_name": "API", "created_at": _now()}
+                    comments.add(comment)
+                    return 201, comment
+                return 200, _page(comments.view({}), query)
+            if collection_name == "teams" and action == "alerts" and method == "GET":
+                alerts = [alert for alert in state.collections["alerts"].view(filters)
+                          if record["id"] in alert.get("destination_team_ids", [])]
+                return 200, _page(alerts, query)
+            if collection_name == "teams" and action == "current_oncall" and method == "GET":
+                return 200, self._oncall(record)
+        return 404, {"errors": ["Not found"]}
+
+    def _create(self, state, collection_name, body):
+        now = datetime.now(timezone.utc)
+        record = {"id": make_id(state.random, now), "created_at": _iso(now), "updated_at": _iso(now)}
+        if collection_name == "alerts":
+            if not body.get("title"):
+                raise ValueError("title is required")
+            record.update({"status": "open", "urgency": "medium", "tags": [], "destination_team_ids": [],
+                           "tiny_id": len(state.collections["alerts"].records) + 1})
+        elif collection_name == "account_users":
+            attributes = body.pop("user_attributes", {})
+            record["user"] = {"name": attributes.get("name"),
+                              "emails": [dict(email, primary=True) for email in attributes.get("emails_attributes", [])],
+                              "phones": []}
+        record.update(body)
+        state.collections[collection_name].add(record)
+        return record
+
+    @staticmethod
+    def _update(record, body):
+        attributes = body.pop("user_attributes", None)
+        if attributes and "user" in record:
+            record["user"].update(attributes)
+        record.update(body)
+        record["updated_at"] = _now()
+
+    @staticmethod
+    def _oncall(team):
+        """Two schedule layers built from the team's members, rotating daily."""
+        members = team.get("member_account_user_ids") or []
+        if not members:
+            return []
+        day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        layers = []
+        for layer in (1, 2):
+            attendee = members[(day.toordinal() + layer - 1) % len(members)]
+            layers.append({"layer": layer, "start_time": _iso(day), "end_time": _iso(day + timedelta(days=1)),
+                           "attendees": [{"attendee_id": attendee, "attendee_type": "AccountUser"}]})
+        return layers
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+def load_fixtures(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_fixtures(fixtures, path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(fixtures, f, separators=(",", ":"))
+
+def serve(state, host="127.0.0.1", port=8765):
+    """Create the HTTP server for state (call serve_forever() on it)."""
+    handler = type("MockHandler", (Handler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", help="Load fixtures saved with --save instead of generating them")
+    parser.add_argument("--save", help="Write generated fixtures to this file (.json or .json.gz) and exit")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--alerts", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--integrations", type=int, default=20)
+    parser.add_argument("--broadcasts", type=int, default=20)
+    parser.add_argument("--comments-per-alert", type=int, default=2, help="Average comments per alert")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probability of answering 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on injected 429s")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests allowed per window (0 disables)")
+    parser.add_argument("--rate-window", type=float, default=60.0, help="Rate-limit window in seconds")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+    else:
+        fixtures = generate_fixtures(alerts=args.alerts, users=args.users, teams=args.teams,
+                                     integrations=args.integrations, broadcasts=args.broadcasts, seed=args.seed)
+    counts = ", ".join(f"{len(fixtures[name])} {name}" for name in
+                       ("alerts", "account_users", "teams", "integrations", "broadcasts"))
+    print(f"Fixtures ready in {time.perf_counter() - started:.1f}s: {counts}", file=sys.stderr)
+    if args.save:
+        save_fixtures(fixtures, args.save)
+        print(f"Saved fixtures to {args.save}", file=sys.stderr)
+        return
+
+    state = MockState(fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_429=args.rate_429,
+                      retry_after=args.retry_after, rate_limit=args.rate_limit, rate_window=args.rate_window,
+                      comments_per_alert=args.comments_per_alert, seed=fixtures.get("seed", args.seed))
+    server = serve(state, args.host, args.port)
+    print(f"Mock PagerTree API on http://{args.host}:{args.port}{BASE_PATH}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
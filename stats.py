@@ -0,0 +1,147 @@
+import math
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+# Histogram bucket widths in seconds
+BUCKETS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+# Categorical dimensions: name -> field read from each alert ("team" is the first destination team)
+DIMENSIONS = ("urgency", "status", "team")
+
+PERCENTILES = (50, 90, 99)
+
+def parse_timestamp(value: Optional[str]) -> float:
+    """Convert an ISO 8601 timestamp to epoch seconds, or NaN when missing or malformed."""
+    if not value:
+        return math.nan
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return math.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linearly interpolated percentile of an already sorted, non-empty list."""
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+class AlertStats:
+    """Accumulate alerts into columnar buffers and summarize them.
+
+    Each alert costs a fixed number of bytes: its created time, time to
+    acknowledge and time to resolve are doubles in array('d') buffers (NaN when
+    unknown), and each categorical dimension is an integer code into a per-
+    dimension vocabulary. Histogram buckets are counted as alerts are added, so
+    a summary needs no further pass over the alerts themselves.
+    """
+
+    def __init__(self, bucket: str = "day", acknowledged_field: str = "acknowledged_at",
+                 resolved_field: str = "resolved_at", since: Optional[float] = None, until: Optional[float] = None):
+        self.bucket = bucket
+        self.bucket_seconds = BUCKETS[bucket]
+        self.acknowledged_field = acknowledged_field
+        self.resolved_field = resolved_field
+        self.since = since
+        self.until = until
+        self.created = array("d")
+        self.tta = array("d")
+        self.ttr = array("d")
+        self.codes = {dimension: array("I") for dimension in DIMENSIONS}
+        self.vocabulary: Dict[str, Dict[str, int]] = {dimension: {} for dimension in DIMENSIONS}
+        self.histogram: Counter = Counter()
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self.created)
+
+    def _code(self, dimension: str, value: Any) -> int:
+        vocabulary = self.vocabulary[dimension]
+        key = "none" if value is None else str(value)
+        code = vocabulary.get(key)
+        if code is None:
+            code = vocabulary[key] = len(vocabulary)
+        return code
+
+    def add(self, alerts: Iterable[Dict[str, Any]]) -> None:
+        """Add a batch of alerts (e.g. one page), skipping those outside the since/until window."""
+        for alert in alerts:
+            created = parse_timestamp(alert.get("created_at"))
+            if math.isnan(created) or (self.since is not None and created < self.since) \
+                    or (self.until is not None and created >= self.until):
+                self.skipped += 1
+                continue
+            self.created.append(created)
+            self.tta.append(parse_timestamp(alert.get(self.acknowledged_field)) - created)
+            self.ttr.append(parse_timestamp(alert.get(self.resolved_field)) - created)
+            teams = alert.get("destination_team_ids") or [None]
+            self.codes["urgency"].append(self._code("urgency", alert.get("urgency")))
+            self.codes["status"].append(self._code("status", alert.get("status")))
+            self.codes["team"].append(self._code("team", teams[0]))
+            self.histogram[int(created // self.bucket_seconds)] += 1
+
+    def counts(self, dimension: str) -> List[tuple]:
+        """Return (value, count) pairs for a dimension, most common first."""
+        names = {code: name for name, code in self.vocabulary[dimension].items()}
+        return [(names[code], count) for code, count in Counter(self.codes[dimension]).most_common()]
+
+    def durations(self, column: str, group_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Summarize a duration column ("tta" or "ttr") overall and per group_by value."""
+        values = getattr(self, column)
+        groups: Dict[str, List[float]] = {"all": [value for value in values if not math.isnan(value)]}
+        if group_by:
+            names = {code: name for name, code in self.vocabulary[group_by].items()}
+            for value, code in zip(values, self.codes[group_by]):
+                if not math.isnan(value):
+                    groups.setdefault(names[code], []).append(value)
+        summaries = []
+        for group, samples in groups.items():
+            samples.sort()
+            summary = {"group": group, "count": len(samples)}
+            if samples:
+                summary["mean"] = sum(samples) / len(samples)
+                summary.update({f"p{pct}": percentile(samples, pct) for pct in PERCENTILES})
+            summaries.append(summary)
+        return summaries
+
+    def buckets(self) -> List[tuple]:
+        """Return (bucket start as ISO 8601, count) pairs in time order, including empty buckets."""
+        if not self.histogram:
+            return []
+        first, last = min(self.histogram), max(self.histogram)
+        return [(datetime.fromtimestamp(index * self.bucket_seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                 self.histogram.get(index, 0)) for index in range(first, last + 1)]
+
+    def summary(self, group_by: Optional[str] = "urgency") -> Dict[str, Any]:
+        """Return every statistic as a JSON-serializable dict (durations in seconds)."""
+        return {
+            "alerts": len(self),
+            "skipped": self.skipped,
+            "first_created_at": _iso(min(self.created)) if self.created else None,
+            "last_created_at": _iso(max(self.created)) if self.created else None,
+            "mtta": self.durations("tta", group_by),
+            "mttr": self.durations("ttr", group_by),
+            "counts": {dimension: dict(self.counts(dimension)) for dimension in DIMENSIONS},
+            "histogram": {"bucket": self.bucket, "counts": dict(self.buckets())},
+        }
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Render seconds as a short human duration such as 4m12s or 2h05m."""
+    if seconds is None or math.isnan(seconds):
+        return "-"
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    if seconds < 86400:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 86400}d{seconds % 86400 // 3600:02d}h"
@@ -0,0 +1,89 @@
+import time
+import pytest
+import requests
+from alias_index import AliasIndex
+
+@pytest.fixture
+def index(tmp_path):
+    return AliasIndex(str(tmp_path), ttl=3600)
+
+def alert(alert_id, alias="disk-full", status="open", created_at="2025-01-01T00:00:00Z"):
+    return {"id": alert_id, "thirdparty_id": alias, "status": status, "created_at": created_at}
+
+def test_live_alerts_are_indexed_by_alias(index):
+    index.record([alert("a1")])
+    assert index.lookup("disk-full") == "a1"
+    assert index.lookup("disk-full", status="open") == "a1"
+    assert index.lookup("disk-full", status="acknowledged") is None
+    assert index.lookup("other") is None
+
+def test_terminal_alerts_leave_the_index(index):
+    index.record([alert("a1")])
+    index.record([alert("a1", status="resolved")])
+    assert index.lookup("disk-full") is None
+
+def test_newest_alert_per_alias_wins(index):
+    index.record([alert("new", created_at="2025-01-02T00:00:00Z"), alert("old", created_at="2025-01-01T00:00:00Z")])
+    assert index.lookup("disk-full") == "new"
+    # An older alert seen later does not replace the newer one
+    index.record([alert("older", created_at="2024-12-31T00:00:00Z")])
+    assert index.lookup("disk-full") == "new"
+
+def test_resolving_the_newest_alert_drops_older_entries(index):
+    index.record([alert("old", created_at="2025-01-01T00:00:00Z")])
+    index.record([alert("new", status="resolved", created_at="2025-01-02T00:00:00Z")])
+    assert index.lookup("disk-full") is None
+
+def test_entries_expire_after_the_ttl_and_max_age(index, monkeypatch):
+    index.record([alert("a1")])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert index.lookup("disk-full") == "a1"
+    assert index.lookup("disk-full", max_age=60) is None
+    monkeypatch.setattr(time, "time", lambda: now + 3601)
+    assert index.lookup("disk-full") is None
+
+def test_forget_removes_the_alias(index):
+    index.record([alert("a1")])
+    index.forget("a1")
+    assert index.lookup("disk-full") is None
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+@pytest.fixture
+def client(index, monkeypatch):
+    monkeypatch.setenv("PAGERTREE_API_KEY", "test")
+    from api import PagerTreeClient
+    client = PagerTreeClient(alias_index=index)
+    client.posted = []
+    monkeypatch.setattr(client, "_post_alert", lambda payload: client.posted.append(payload) or {"id": "fresh"})
+    return client
+
+def test_create_skips_an_alias_whose_alert_is_still_live(client, index, monkeypatch):
+    index.record([alert("a1")])
+    monkeypatch.setattr(client, "show_alert", lambda alert_id, revalidate=False: alert(alert_id))
+    result = client.create_alert("Disk full", alias="disk-full", on_duplicate="skip")
+    assert result == {"id": "a1", "thirdparty_id": "disk-full", "deduplicated": "skip"}
+    assert client.posted == []
+
+def test_create_posts_again_when_the_indexed_alert_was_resolved_elsewhere(client, index, monkeypatch):
+    index.record([alert("a1")])
+
+    def show_alert(alert_id, revalidate=False):
+        resolved = alert(alert_id, status="resolved")
+        index.record([resolved])
+        return resolved
+    monkeypatch.setattr(client, "show_alert", show_alert)
+    assert client.create_alert("Disk full", alias="disk-full", on_duplicate="skip")["id"] == "fresh"
+    assert index.lookup("disk-full") is None
+
+def test_create_posts_again_when_the_indexed_alert_was_deleted(client, index, monkeypatch):
+    index.record([alert("a1")])
+
+    def show_alert(alert_id, revalidate=False):
+        raise requests.exceptions.HTTPError(response=_Response(404))
+    monkeypatch.setattr(client, "show_alert", show_alert)
+    assert client.create_alert("Disk full", alias="disk-full", on_duplicate="comment")["id"] == "fresh"
+    assert index.lookup("disk-full") is None
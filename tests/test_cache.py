@@ -0,0 +1,58 @@
+import time
+import pytest
+from cache import ResponseCache
+
+BASE_URL = "https://api.pagertree.com/api/v4"
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path), ttl=60)
+
+def store(cache, path, body=b"{}"):
+    url = f"{BASE_URL}{path}"
+    key = cache.make_key("key", url)
+    cache.store(key, url, body, etag='"v1"')
+    return key
+
+def test_entries_are_fresh_within_the_ttl(cache):
+    key = store(cache, "/alerts", b'{"data": []}')
+    entry = cache.get(key)
+    assert entry["fresh"] and entry["body"] == b'{"data": []}' and entry["etag"] == '"v1"'
+
+def test_expired_entries_are_kept_for_revalidation(cache, monkeypatch):
+    key = store(cache, "/alerts")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    entry = cache.get(key)
+    assert entry is not None and not entry["fresh"]
+    cache.refresh(key)
+    assert cache.get(key)["fresh"]
+
+def test_keys_depend_on_api_key_and_params():
+    url = f"{BASE_URL}/alerts"
+    assert ResponseCache.make_key("a", url, {"limit": 10}) != ResponseCache.make_key("b", url, {"limit": 10})
+    assert ResponseCache.make_key("a", url, {"limit": 10}) != ResponseCache.make_key("a", url, {"limit": 20})
+    assert ResponseCache.make_key("a", url, {"limit": 10, "offset": 0}) == ResponseCache.make_key("a", url, {"offset": 0, "limit": 10})
+
+def test_invalidate_matches_whole_path_segments(cache):
+    keys = {path: store(cache, path) for path in
+            ("/teams", "/teams/01T", "/teams/01T/alerts", "/teams_archive", "/account_users", "/accountXusers")}
+    cache.invalidate("teams")
+    cache.invalidate("account_users")
+    assert {path for path, key in keys.items() if cache.get(key) is not None} == {"/teams_archive", "/accountXusers"}
+
+def test_nested_collections_are_invalidated(cache):
+    team_alerts = store(cache, "/teams/01T/alerts")
+    alertsfoo = store(cache, "/alertsfoo")
+    cache.invalidate("alerts")
+    assert cache.get(team_alerts) is None
+    assert cache.get(alertsfoo) is not None
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=250)
+    old = store(cache, "/alerts/1", b"x" * 100)
+    time.sleep(0.01)
+    store(cache, "/alerts/2", b"x" * 100)
+    time.sleep(0.01)
+    store(cache, "/alerts/3", b"x" * 100)
+    assert cache.get(old) is None
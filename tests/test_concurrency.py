@@ -0,0 +1,51 @@
+import itertools
+import threading
+import time
+import pytest
+from concurrency import bounded_map
+
+def test_results_keep_input_order():
+    def slow_square(number):
+        time.sleep(0.001 * (10 - number))
+        return number * number
+    assert list(bounded_map(slow_square, range(10), workers=4)) == [number * number for number in range(10)]
+
+def test_unordered_results_cover_every_item():
+    assert sorted(bounded_map(lambda number: number + 1, range(50), workers=4, ordered=False)) == list(range(1, 51))
+
+def test_inputs_are_pulled_lazily():
+    pulled = []
+
+    def items():
+        for number in itertools.count():
+            pulled.append(number)
+            yield number
+    results = bounded_map(lambda number: number, items(), workers=2)
+    assert [next(results) for _ in range(3)] == [0, 1, 2]
+    results.close()
+    assert len(pulled) <= 3 + 2 * 2
+
+def test_in_flight_calls_are_bounded():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def work(number):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.002)
+        with lock:
+            state["active"] -= 1
+        return number
+    list(bounded_map(work, range(40), workers=3))
+    assert state["peak"] <= 3
+
+def test_errors_are_raised_when_their_result_is_reached():
+    def fail_on_three(number):
+        if number == 3:
+            raise ValueError("three")
+        return number
+    results = bounded_map(fail_on_three, range(10), workers=2)
+    assert [next(results) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(ValueError):
+        next(results)
@@ -0,0 +1,84 @@
+import gzip
+import json
+import os
+import pytest
+from export import Exporter, ExportStateMismatch, STATE_FILE
+
+class FakeClient:
+    """Serves a fixed list of alerts page by page, optionally failing after some pages."""
+
+    def __init__(self, total=25, fail_after_pages=None):
+        self.alerts = [{"id": f"a{number:03d}", "title": f"Alert {number}"} for number in range(total)]
+        self.fail_after_pages = fail_after_pages
+        self.pages_served = 0
+
+    def list_alerts(self, limit=10, offset=0, **filters):
+        if self.fail_after_pages is not None and self.pages_served >= self.fail_after_pages:
+            raise ConnectionError("connection reset")
+        self.pages_served += 1
+        data = self.alerts[offset:offset + limit]
+        return {"data": data, "total": len(self.alerts), "has_more": offset + limit < len(self.alerts),
+                "limit": limit, "offset": offset}
+
+    def iter_pages(self, list_method, page_size=100, offset=0, concurrency=1, **kwargs):
+        while True:
+            page = list_method(limit=page_size, offset=offset, **kwargs)
+            yield page
+            offset += len(page["data"])
+            if not page["data"] or offset >= page["total"]:
+                return
+
+def read_ids(directory):
+    ids = []
+    for name in sorted(os.listdir(directory)):
+        if name.startswith("alerts-") and name.endswith(".ndjson.gz"):
+            with gzip.open(os.path.join(directory, name), "rt") as f:
+                ids += [json.loads(line)["id"] for line in f]
+    return ids
+
+def test_export_writes_every_record_in_chunks(tmp_path):
+    progress = Exporter(FakeClient(total=25), str(tmp_path), page_size=10, chunk_records=10).export("alerts")
+    assert progress["done"] and progress["records"] == 25
+    assert read_ids(tmp_path) == [f"a{number:03d}" for number in range(25)]
+    assert sorted(name for name in os.listdir(tmp_path) if name != STATE_FILE) == [
+        "alerts-00000.ndjson.gz", "alerts-00001.ndjson.gz", "alerts-00002.ndjson.gz"]
+
+def test_resume_continues_from_the_checkpoint_without_duplicates(tmp_path):
+    with pytest.raises(ConnectionError):
+        Exporter(FakeClient(total=25, fail_after_pages=2), str(tmp_path), page_size=5, chunk_records=100).export("alerts")
+    with open(tmp_path / STATE_FILE) as f:
+        assert json.load(f)["resources"]["alerts"]["offset"] == 10
+
+    client = FakeClient(total=25)
+    progress = Exporter(client, str(tmp_path), page_size=5, chunk_records=100).export("alerts")
+    assert progress["done"] and progress["records"] == 25
+    assert client.pages_served == 3
+    assert read_ids(tmp_path) == [f"a{number:03d}" for number in range(25)]
+
+def test_resume_truncates_a_partially_written_page(tmp_path):
+    with pytest.raises(ConnectionError):
+        Exporter(FakeClient(total=25, fail_after_pages=1), str(tmp_path), page_size=5, chunk_records=100).export("alerts")
+    with open(tmp_path / "alerts-00000.ndjson.gz", "ab") as f:
+        f.write(b"garbage from an interrupted write")
+    Exporter(FakeClient(total=25), str(tmp_path), page_size=5, chunk_records=100).export("alerts")
+    assert read_ids(tmp_path) == [f"a{number:03d}" for number in range(25)]
+
+def test_finished_export_is_not_repeated(tmp_path):
+    Exporter(FakeClient(total=5), str(tmp_path), page_size=5).export("alerts")
+    client = FakeClient(total=5)
+    assert Exporter(client, str(tmp_path), page_size=5).export("alerts")["done"]
+    assert client.pages_served == 0
+
+def test_fresh_export_only_removes_chunk_files(tmp_path):
+    for name in ("alerts-00007.csv.gz", "alerts-my-notes.txt", "users-00000.ndjson.gz"):
+        (tmp_path / name).write_bytes(b"old")
+    Exporter(FakeClient(total=5), str(tmp_path), page_size=5).export("alerts")
+    names = set(os.listdir(tmp_path))
+    assert "alerts-00007.csv.gz" not in names
+    assert {"alerts-my-notes.txt", "users-00000.ndjson.gz", "alerts-00000.ndjson.gz"} <= names
+
+def test_changed_settings_refuse_to_resume(tmp_path):
+    Exporter(FakeClient(total=5), str(tmp_path), page_size=5).export("alerts")
+    with pytest.raises(ExportStateMismatch):
+        Exporter(FakeClient(total=5), str(tmp_path), page_size=5, file_format="csv")
+    Exporter(FakeClient(total=5), str(tmp_path), page_size=5, file_format="csv", restart=True)
@@ -0,0 +1,143 @@
+import json
+import re
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+import requests
+
+# Path segments containing a digit (ULIDs, numeric or mock IDs) are treated as identifiers
+ID_SEGMENT = re.compile(r"^(?=[^/]*\d)[A-Za-z0-9_-]+$")
+
+# Endpoints with an ID called at least this often in one run are flagged as possible N+1 patterns
+N_PLUS_ONE_THRESHOLD = 20
+
+def endpoint_template(url: str, base_path: str = "") -> str:
+    """Reduce a request URL to its endpoint, e.g. /alerts/01JT.../comments -> /alerts/{id}/comments."""
+    path = urlsplit(url).path
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    return "/".join("{id}" if ID_SEGMENT.match(segment) else segment for segment in path.split("/")) or "/"
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+class HttpTracer:
+    """Record every HTTP attempt made through a PagerTreeClient session.
+
+    A response hook on the session records the method, endpoint template,
+    status, latency (time to response headers), body size and whether the
+    connection was reused. The client tells the tracer which retry attempt is
+    in flight and about attempts that failed without a response.
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()
+        self._base_path = ""
+        self._client = None
+
+    def attach(self, client):
+        """Install the tracer on client (if it has a requests session) and return the client."""
+        session = getattr(client, "session", None)
+        if not isinstance(session, requests.Session):
+            return client
+        self._base_path = urlsplit(client.base_url).path.rstrip("/")
+        session.hooks["response"].append(self._on_response)
+        client.tracer = self
+        self._client = client
+        return client
+
+    def detach(self) -> None:
+        """Remove the tracer from the client it was attached to."""
+        if self._client is None:
+            return
+        hooks = self._client.session.hooks["response"]
+        if self._on_response in hooks:
+            hooks.remove(self._on_response)
+        if getattr(self._client, "tracer", None) is self:
+            self._client.tracer = None
+        self._client = None
+
+    def begin_attempt(self, attempt: int) -> None:
+        """Note the retry attempt (0 for the first try) about to be sent from this thread."""
+        self._local.attempt = attempt
+        self._local.sent_at = time.monotonic()
+
+    def record_failure(self, method: str, url: str, error: Exception) -> None:
+        """Record an attempt that ended without a response (connection error or timeout)."""
+        self._add(method, url, None, time.monotonic() - getattr(self._local, "sent_at", time.monotonic()),
+                  0, None, type(error).__name__)
+
+    def _on_response(self, response, *args, **kwargs):
+        connection = getattr(response.raw, "_connection", None) or getattr(response.raw, "connection", None)
+        reused = None
+        if connection is not None:
+            with self._lock:
+                reused = connection in self._connections
+                self._connections.add(connection)
+        size = len(response.content or b"")
+        self._add(response.request.method, response.url, response.status_code,
+                  response.elapsed.total_seconds(), size, reused, None)
+        return response
+
+    def _add(self, method, url, status, seconds, size, reused, error) -> None:
+        record = {"method": method, "endpoint": endpoint_template(url, self._base_path), "status": status,
+                  "ms": seconds * 1000, "bytes": size, "reused": reused,
+                  "attempt": getattr(self._local, "attempt", 0), "error": error}
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate the records per endpoint: count, retries, errors, bytes, reuse and latency percentiles."""
+        groups = defaultdict(list)
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            groups[(record["method"], record["endpoint"])].append(record)
+        endpoints = []
+        for (method, endpoint), items in sorted(groups.items(), key=lambda pair: -sum(r["ms"] for r in pair[1])):
+            latencies = sorted(item["ms"] for item in items)
+            known_reuse = [item["reused"] for item in items if item["reused"] is not None]
+            endpoints.append({
+                "method": method,
+                "endpoint": endpoint,
+                "count": len(items),
+                "retries": sum(1 for item in items if item["attempt"] > 0),
+                "errors": sum(1 for item in items if item["error"] or (item["status"] or 0) >= 400),
+                "bytes": sum(item["bytes"] for item in items),
+                "reused_pct": round(100 * sum(known_reuse) / len(known_reuse), 1) if known_reuse else None,
+                "total_ms": round(sum(latencies), 1),
+                "p50_ms": round(_percentile(latencies, 50), 1),
+                "p95_ms": round(_percentile(latencies, 95), 1),
+                "p99_ms": round(_percentile(latencies, 99), 1),
+                "possible_n_plus_one": "{id}" in endpoint and len(items) >= N_PLUS_ONE_THRESHOLD,
+            })
+        return {
+            "requests": len(records),
+            "wall_ms": round((time.monotonic() - self.started) * 1000, 1),
+            "endpoints": endpoints,
+        }
+
+    def report(self, stream, json_path: Optional[str] = None) -> None:
+        """Write the summary as JSON to json_path, or as a table to stream."""
+        summary = self.summary()
+        if json_path:
+            with open(json_path, "w") as f:
+                json.dump({**summary, "records": self.records}, f, indent=2)
+            return
+        from tabulate import tabulate
+        rows = [[e["method"], e["endpoint"] + (" (N+1?)" if e["possible_n_plus_one"] else ""), e["count"], e["retries"],
+                 e["errors"], e["bytes"], "-" if e["reused_pct"] is None else f"{e['reused_pct']:.0f}%",
+                 e["p50_ms"], e["p95_ms"], e["p99_ms"], e["total_ms"]] for e in summary["endpoints"]]
+        stream.write(f"\nHTTP trace: {summary['requests']} requests in {summary['wall_ms'] / 1000:.2f}s\n")
+        if rows:
+            stream.write(tabulate(rows, headers=["Method", "Endpoint", "Count", "Retries", "Errors", "Bytes",
+                                                 "Reused", "p50 ms", "p95 ms", "p99 ms", "Total ms"],
+                                  tablefmt="simple") + "\n")
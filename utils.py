@@ -1,44 +1,135 @@
 import click
-import requests
-from typing import Dict, Any
-from jsonpath_ng import parse
-from jsonpath_ng.exceptions import JsonPathParserError, JsonPathLexerError
-from tabulate import tabulate
+import re
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Optional
 
-def handle_api_error(e, action="performing action"):
-    """Handle API errors with consistent messaging."""
+# requests, tabulate and jsonpath_ng are imported inside the functions that use
+# them so loading a command module stays cheap (see pagertree.LazyGroup).
+
+# Field paths made only of identifiers joined by dots are walked directly instead of via jsonpath_ng
+SIMPLE_PATH = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+@lru_cache(maxsize=None)
+def compile_path(field_path: str) -> Callable[[Dict[str, Any], Any], Any]:
+    """Compile a field path into an extractor called as extract(item, default).
+
+    Compiled extractors are memoized per path. Plain dotted paths such as
+    "integration_type.name" walk nested dicts directly (a literal key containing
+    dots wins if present); other paths are parsed once as JSON paths, and paths
+    that fail to parse fall back to a literal key lookup.
+    """
+    if SIMPLE_PATH.match(field_path):
+        keys = tuple(field_path.split("."))
+
+        def extract(item, default=None):
+            if field_path in item:
+                return item[field_path]
+            value = item
+            for key in keys:
+                if not isinstance(value, dict) or key not in value:
+                    return default
+                value = value[key]
+            return value
+        return extract
+
+    from jsonpath_ng import parse
+    from jsonpath_ng.exceptions import JsonPathParserError, JsonPathLexerError
+    try:
+        jsonpath_expr = parse(field_path)
+    except (JsonPathParserError, JsonPathLexerError):
+        return lambda item, default=None: item.get(field_path, default)
+
+    def extract(item, default=None):
+        matches = jsonpath_expr.find(item)
+        return matches[0].value if matches else default
+    return extract
+
+def row_builder(field_paths: List[str], default: Optional[Any] = None) -> Callable[[Dict[str, Any]], List[Any]]:
+    """Return a function that extracts field_paths from an item as a table row."""
+    extractors = [compile_path(field_path) for field_path in field_paths]
+    return lambda item: [extract(item, default) for extract in extractors]
+
+def format_api_error(e) -> str:
+    """Describe an API error as a single line of text."""
+    import requests
     if isinstance(e, requests.exceptions.HTTPError):
         try:
             response_json = e.response.json()
             errors = response_json.get("errors", "No error details provided")
-            click.echo(f"Error {action}: {e.response.status_code} - {errors}", err=True)
+            return f"{e.response.status_code} - {errors}"
         except ValueError:
             # Handle case where response is not JSON
-            click.echo(f"Error {action}: {e.response.status_code} - Unable to parse error details", err=True)
-    else:
-        click.echo(f"Error {action}: {str(e)}", err=True)
+            return f"{e.response.status_code} - Unable to parse error details"
+    return str(e)
+
+def handle_api_error(e, action="performing action"):
+    """Handle API errors with consistent messaging."""
+    click.echo(f"Error {action}: {format_api_error(e)}", err=True)
 
-def display_paginated_results(items, total, limit, offset, item_type="item", table_headers=None, table_data=None):
+def display_paginated_results(items, total, limit, offset, item_type="item", table_headers=None, table_data=None, output="table"):
     """Display a paginated list of items with consistent formatting."""
+    if output != "table":
+        from output import RecordWriter
+        writer = RecordWriter(output, table_headers)
+        writer.write_many(items, table_data)
+        writer.close()
+        click.echo(f"Showing {len(items)} of {total} {item_type}s (offset: {offset}, limit: {limit})", err=True)
+        return
+    from tabulate import tabulate
     click.echo(f"Showing {len(items)} of {total} {item_type}s (offset: {offset}, limit: {limit})")
     if table_headers and table_data:
         click.echo(tabulate(table_data, headers=table_headers, tablefmt="simple", maxcolwidths=[None, 50]))
     if offset + limit < total:
         click.echo(f"More {item_type}s available. Use --offset {offset + limit} to see next page.")
 
-def format_item_details(item: Dict[str, Any], fields: Dict[str, str]) -> None:
-    """Format and display item details as a table using tabulate, supporting JSON path notation."""
+def display_streamed_results(pages, item_type="item", table_headers=None, row_builder=None, output="table"):
+    """Display rows from an iterable of pages as each page arrives."""
+    writer = None
+    if output != "table":
+        from output import RecordWriter
+        writer = RecordWriter(output, table_headers)
+    else:
+        from tabulate import tabulate
+    shown = 0
+    total = 0
+    for page in pages:
+        items = page["data"]
+        total = page["total"]
+        if not items:
+            continue
+        table_data = [row_builder(item) for item in items]
+        if writer is not None:
+            writer.write_many(items, table_data)
+            shown += len(items)
+            continue
+        # Only the first page carries the header; later pages continue the table
+        if shown == 0:
+            click.echo(tabulate(table_data, headers=table_headers, tablefmt="simple", maxcolwidths=[None, 50]))
+        else:
+            click.echo(tabulate(table_data, tablefmt="plain", maxcolwidths=[None, 50]))
+        shown += len(items)
+    if writer is not None:
+        writer.close()
+    click.echo(f"Showed {shown} of {total} {item_type}s", err=writer is not None)
+
+def format_item_details(item: Dict[str, Any], fields: Dict[str, str], output: str = "table",
+                        raw: Optional[Dict[str, Any]] = None) -> None:
+    """Format and display item details as a table using tabulate, supporting JSON path notation.
+
+    For machine-readable output, json and ndjson emit raw (the API object, when the
+    caller pre-formatted item) and csv/tsv emit one row of the selected fields.
+    """
+    if output != "table":
+        from output import RecordWriter
+        writer = RecordWriter(output, list(fields.values()), single=True)
+        writer.write(raw if raw is not None else item, [compile_path(field_path)(item, None) for field_path in fields])
+        writer.close()
+        return
+    from tabulate import tabulate
     # Prepare table data: each row is [Display Name, Value]
     table_data = []
     for field_path, display_name in fields.items():
-        try:
-            # Try to parse the field_path as a JSON path
-            jsonpath_expr = parse(field_path)
-            matches = jsonpath_expr.find(item)
-            value = matches[0].value if matches else "N/A"
-        except (JsonPathParserError, JsonPathLexerError, IndexError, KeyError):
-            # Fallback to direct dictionary access for simple field names
-            value = item.get(field_path, "N/A")
+        value = compile_path(field_path)(item, "N/A")
 
         # Format specific types for better readability
         if isinstance(value, bool):
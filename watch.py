@@ -0,0 +1,109 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+def _alert_version(alert: Dict[str, Any]) -> str:
+    """Timestamp that changes whenever the alert does."""
+    return alert.get("updated_at") or alert.get("created_at") or ""
+
+class AlertWatcher:
+    """Poll list_alerts and report only alerts that are new or changed since the last poll.
+
+    Each poll reads the first `depth` pages of the filtered list. An alert is
+    reported when its ID has not been seen and it is newer than the high-water
+    mark (the latest updated_at/created_at observed), or when its updated_at
+    differs from the one seen before. Seen IDs are kept in a bounded LRU map, so
+    long watches use constant memory; the high-water mark keeps evicted alerts
+    from being reported again.
+
+    The poll interval halves after a poll that found changes and grows by half
+    after a quiet one, staying between min_interval and max_interval. Polls are
+    conditional requests when the client has a response cache.
+    """
+
+    def __init__(self, client, status: Optional[str] = None, search: Optional[str] = None,
+                 min_interval: float = 5, max_interval: float = 60, depth: int = 1,
+                 page_size: int = 100, max_seen: int = 10000):
+        self.client = client
+        self.status = status
+        self.search = search
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.depth = depth
+        self.page_size = page_size
+        self.max_seen = max_seen
+        self.interval = min_interval
+        self.high_water = ""
+        self.polls = 0
+        self._seen: "OrderedDict[str, str]" = OrderedDict()
+
+    def poll(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Fetch the watched pages once and return (change, alert) pairs.
+
+        change is "new" or "updated"; on the first poll every alert is returned
+        as "existing", establishing the baseline.
+        """
+        first = self.polls == 0
+        changes = []
+        high_water = self.high_water
+        for page in range(self.depth):
+            result = self.client.list_alerts(limit=self.page_size, offset=page * self.page_size, status=self.status,
+                                             search=self.search, revalidate=True)
+            for alert in result["data"]:
+                version = _alert_version(alert)
+                previous = self._seen.get(alert["id"])
+                if first:
+                    changes.append(("existing", alert))
+                elif previous is None:
+                    if version > self.high_water:
+                        changes.append(("new", alert))
+                elif previous != version:
+                    changes.append(("updated", alert))
+                self._remember(alert["id"], version)
+                high_water = max(high_water, version)
+            if (page + 1) * self.page_size >= result["total"]:
+                break
+        self.high_water = high_water
+        self.polls += 1
+        return changes
+
+    def _remember(self, alert_id: str, version: str) -> None:
+        self._seen[alert_id] = version
+        self._seen.move_to_end(alert_id)
+        while len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+
+    def _adjust_interval(self, changed: bool) -> None:
+        if changed:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+
+    def watch(self, include_existing: bool = False, max_polls: int = 0,
+              on_error: Optional[Callable[[Exception], None]] = None) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """Yield the changes found by each poll, sleeping the adaptive interval in between.
+
+        Baseline alerts from the first poll are yielded only with include_existing.
+        max_polls of 0 watches until interrupted. A failed poll is passed to
+        on_error and retried after a longer interval; without on_error it is raised.
+        """
+        attempts = 0
+        while max_polls <= 0 or attempts < max_polls:
+            if attempts > 0:
+                time.sleep(self.interval)
+            attempts += 1
+            first = self.polls == 0
+            try:
+                changes = self.poll()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+                self._adjust_interval(False)
+                continue
+            if first:
+                if include_existing:
+                    yield changes
+                continue
+            self._adjust_interval(bool(changes))
+            yield changes